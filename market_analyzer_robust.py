@@ -20,17 +20,42 @@ import numpy as np
 import time
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque, namedtuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 import os
 import logging
 import json
 import sys
-import traceback
+from types import SimpleNamespace
 import matplotlib.pyplot as plt
 from matplotlib.dates import DateFormatter
 import matplotlib
 matplotlib.use('Agg')  # Modo não-interativo para salvar gráficos
 
+# Numba é opcional: sem ele, os kernels numéricos rodam como NumPy puro
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# numexpr é opcional: usado apenas no caminho sem Numba, para janelas grandes
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# Tamanho mínimo de janela para compensar o custo fixo de cada chamada ao numexpr
+NUMEXPR_MIN_ROWS = 1000
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +67,292 @@ logging.basicConfig(
 )
 logger = logging.getLogger("MarketAnalyzer")
 
+
+@njit(cache=True)
+def _divergence_counts(close, volume):
+    """
+    Conta divergências entre variação percentual de preço e de volume
+    
+    Args:
+        close (np.ndarray): Preços de fechamento (float64)
+        volume (np.ndarray): Volumes (float64)
+        
+    Returns:
+        tuple: (preço sobe/volume cai, preço desce/volume sobe)
+    """
+    # Variação percentual, evitando divisão por zero
+    price_change = np.diff(close) / np.where(close[:-1] == 0, 1.0, close[:-1])
+    volume_change = np.diff(volume) / np.where(volume[:-1] == 0, 1.0, volume[:-1])
+    price_up_volume_down = np.count_nonzero((price_change > 0) & (volume_change < 0))
+    price_down_volume_up = np.count_nonzero((price_change < 0) & (volume_change > 0))
+    return price_up_volume_down, price_down_volume_up
+
+
+if not NUMBA_AVAILABLE and numexpr is not None:
+    _divergence_counts_numpy = _divergence_counts
+    
+    def _divergence_counts(close, volume):
+        """
+        Versão de _divergence_counts com numexpr, que avalia cada contagem em uma única
+        passada sobre os arrays (usada apenas sem Numba e para janelas grandes)
+        """
+        if close.shape[0] < NUMEXPR_MIN_ROWS:
+            return _divergence_counts_numpy(close, volume)
+        
+        variables = {
+            "dp": np.diff(close),
+            "pp": np.where(close[:-1] == 0, 1.0, close[:-1]),
+            "dv": np.diff(volume),
+            "pv": np.where(volume[:-1] == 0, 1.0, volume[:-1])
+        }
+        price_up_volume_down = int(numexpr.evaluate("sum(where((dp / pp > 0) & (dv / pv < 0), 1, 0))", local_dict=variables))
+        price_down_volume_up = int(numexpr.evaluate("sum(where((dp / pp < 0) & (dv / pv > 0), 1, 0))", local_dict=variables))
+        return price_up_volume_down, price_down_volume_up
+
+
+@njit(cache=True)
+def _wyckoff_kernel(close, high, low, volume):
+    """
+    Núcleo numérico da análise de Wyckoff (compilável com Numba)
+    
+    Args:
+        close (np.ndarray): Preços de fechamento (float64)
+        high (np.ndarray): Preços máximos (float64)
+        low (np.ndarray): Preços mínimos (float64)
+        volume (np.ndarray): Volumes (float64)
+        
+    Returns:
+        tuple: (preço sobe/volume cai, preço desce/volume sobe, suporte, resistência,
+                posição no range, último preço) - níveis são NaN com menos de 10 períodos
+    """
+    n = close.shape[0]
+    
+    # Divergência de volume e preço
+    price_up_volume_down, price_down_volume_up = _divergence_counts(close, volume)
+    
+    support = np.nan
+    resistance = np.nan
+    position_in_range = np.nan
+    last_price = close[n - 1]
+    if n >= 10:
+        # Suporte/resistência: média dos 3 menores mínimos e 3 maiores máximos dos últimos 20 períodos
+        start = max(0, n - 20)
+        support = np.partition(low[start:], 2)[:3].mean()
+        resistance = np.partition(high[start:], n - start - 3)[-3:].mean()
+        range_width = resistance - support
+        if range_width > 0:
+            position_in_range = (last_price - support) / range_width
+    
+    return price_up_volume_down, price_down_volume_up, support, resistance, position_in_range, last_price
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _rolling_mean(values, window):
+    """
+    Média móvel simples; as posições sem janela completa ficam em 0
+    
+    Args:
+        values (np.ndarray): Série de valores (float64)
+        window (int): Tamanho da janela
+        
+    Returns:
+        np.ndarray: Médias móveis (float64)
+    """
+    n = values.shape[0]
+    out = np.zeros(n)
+    # Sem parallel=True: usada na thread de gráficos, onde o pool de threads do Numba trava a saída do interpretador
+    for i in range(window - 1, n):
+        out[i] = values[i - window + 1:i + 1].mean()
+    return out
+
+
+if not NUMBA_AVAILABLE:
+    def _rolling_mean(values, window):
+        """
+        Versão NumPy de _rolling_mean (sem Numba, o laço por janela seria Python puro)
+        """
+        out = np.zeros(values.shape[0])
+        if values.shape[0] >= window:
+            out[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+        return out
+
+
+@njit(cache=True, nogil=True)
+def _ma_at(values, period, i):
+    """
+    Média móvel simples na posição i (sem janela completa, usa o próprio valor,
+    como rolling().mean().fillna(values))
+    
+    Args:
+        values (np.ndarray): Série de valores (float64)
+        period (int): Tamanho da janela
+        i (int): Posição desejada
+        
+    Returns:
+        float: Média móvel na posição i
+    """
+    if i >= period - 1:
+        return values[i - period + 1:i + 1].mean()
+    return values[i]
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def _momentum_kernel(close, fast_period, slow_period):
+    """
+    Núcleo numérico da análise de momentum (compilável com Numba, sem reter o GIL)
+    
+    Args:
+        close (np.ndarray): Preços de fechamento (float64)
+        fast_period (int): Período da média rápida
+        slow_period (int): Período da média lenta
+        
+    Returns:
+        tuple: (média rápida atual, média lenta atual, diferença anterior entre as médias,
+                ROC de 5 períodos, ROC de 10 períodos) - a diferença anterior é NaN com um único período;
+                os ROCs são 0 sem períodos suficientes ou se indefinidos
+    """
+    n = close.shape[0]
+    
+    # Médias rápida e lenta apenas nas duas últimas posições, sem calcular as séries inteiras
+    last_ma_fast = _ma_at(close, fast_period, n - 1)
+    last_ma_slow = _ma_at(close, slow_period, n - 1)
+    prev_ma_diff = np.nan
+    if n >= 2:
+        prev_ma_diff = _ma_at(close, fast_period, n - 2) - _ma_at(close, slow_period, n - 2)
+    
+    # Taxa de variação do preço (divisão por zero segue o NumPy: inf, ou NaN tratado como 0)
+    last_roc_5 = (close[n - 1] / close[n - 6] - 1) * 100 if n > 5 else 0.0
+    last_roc_10 = (close[n - 1] / close[n - 11] - 1) * 100 if n > 10 else 0.0
+    if np.isnan(last_roc_5):
+        last_roc_5 = 0.0
+    if np.isnan(last_roc_10):
+        last_roc_10 = 0.0
+    
+    return last_ma_fast, last_ma_slow, prev_ma_diff, last_roc_5, last_roc_10
+
+
+@njit(cache=True, nogil=True)
+def _order_flow_kernel(close, buy, sell, balance):
+    """
+    Núcleo numérico da análise de fluxo de ordens (compilável com Numba, sem reter o GIL)
+    
+    Args:
+        close (np.ndarray): Preços de fechamento (float64)
+        buy (np.ndarray): Agressão compradora (float32)
+        sell (np.ndarray): Agressão vendedora (float32)
+        balance (np.ndarray): Saldo de agressão (float32)
+        
+    Returns:
+        tuple: Valores em float64 (saldo atual, média do saldo em 5 períodos, média do saldo em 20 períodos, força da agressão,
+                variação recente de preço, volume de agressão recente, saldo de agressão recente, razão de absorção,
+                agressão anterior, agressão recente, variação anterior de preço, mudança de direção da agressão,
+                mudança de direção do preço, exaustão detectada) - as médias usam o último saldo quando não há
+                janela completa; os valores de absorção exigem 5 períodos e os de exaustão 10 (NaN/False sem eles)
+    """
+    n = close.shape[0]
+    
+    # Somas das janelas finais em uma única passada pelos últimos 20 períodos (acumuladores em float64):
+    # saldo nos últimos 20, saldo/compra/venda nos últimos 5 e saldo nos 5 anteriores a eles
+    balance_sum20 = 0.0
+    balance_sum5 = 0.0
+    buy_sum5 = 0.0
+    sell_sum5 = 0.0
+    balance_prev_sum5 = 0.0
+    for i in range(max(0, n - 20), n):
+        b = float(balance[i])
+        balance_sum20 += b
+        if i >= n - 5:
+            balance_sum5 += b
+            buy_sum5 += float(buy[i])
+            sell_sum5 += float(sell[i])
+        elif i >= n - 10:
+            balance_prev_sum5 += b
+    
+    # 1. Agressão: médias móveis do saldo apenas na última janela, sem materializar a série inteira
+    last_balance = float(balance[n - 1])
+    balance_ma5 = balance_sum5 / 5 if n >= 5 else last_balance
+    balance_ma20 = balance_sum20 / 20 if n >= 20 else last_balance
+    aggression_strength = last_balance / max(1.0, abs(balance_ma20))
+    
+    # 2. Absorção: volume de agressão alto com pouca variação de preço
+    recent_price_change = np.nan
+    recent_aggression_volume = np.nan
+    recent_aggression_balance = np.nan
+    absorption_ratio = np.nan
+    if n >= 5:
+        recent_price_change = (close[n - 1] - close[n - 5]) / max(0.01, close[n - 5])
+        recent_aggression_volume = buy_sum5 + sell_sum5
+        recent_aggression_balance = balance_sum5
+        absorption_ratio = recent_aggression_volume / max(0.001, abs(recent_price_change))
+    
+    # 3. Exaustão: mudança de direção da agressão e/ou do preço
+    previous_aggression = np.nan
+    recent_aggression = np.nan
+    previous_price_change = np.nan
+    aggression_direction_change = np.nan
+    price_direction_change = np.nan
+    exhaustion_detected = False
+    if n >= 10:
+        previous_aggression = balance_prev_sum5 / 5
+        recent_aggression = balance_sum5 / 5
+        previous_price_change = (close[n - 5] - close[n - 10]) / max(0.01, close[n - 10])
+        aggression_direction_change = previous_aggression * recent_aggression
+        price_direction_change = previous_price_change * recent_price_change
+        exhaustion_detected = aggression_direction_change < 0 or price_direction_change < 0
+    
+    return (last_balance, balance_ma5, balance_ma20, aggression_strength,
+            recent_price_change, recent_aggression_volume, recent_aggression_balance, absorption_ratio,
+            previous_aggression, recent_aggression, previous_price_change,
+            aggression_direction_change, price_direction_change, exhaustion_detected)
+
+
+# Sinal individual de uma estratégia (tupla nomeada: mais leve que um dicionário por sinal)
+Signal = namedtuple("Signal", ("type", "reason", "strength", "confidence"), defaults=(None, 0.0))
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """
+    Campos comuns aos resultados das análises (atributos fixos em vez de dicionários aninhados)
+    """
+    valid: bool = True
+    message: str = None
+    signals: list = field(default_factory=list)
+    confidence: float = 0.0
+
+
+@dataclass(slots=True)
+class WyckoffResult(AnalysisResult):
+    """
+    Resultado da análise de Wyckoff
+    """
+    phase: str = None  # Acumulação, Distribuição
+    support_level: float = None
+    resistance_level: float = None
+    volume_analysis: dict = field(default_factory=dict)
+    price_analysis: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class OrderFlowResult(AnalysisResult):
+    """
+    Resultado da análise de fluxo de ordens
+    """
+    aggression_analysis: dict = field(default_factory=dict)
+    absorption_analysis: dict = field(default_factory=dict)
+    exhaustion_analysis: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class MomentumResult(AnalysisResult):
+    """
+    Resultado da análise de momentum
+    """
+    trend: str = None  # Alta, Baixa
+    momentum_strength: float = 0.0
+    indicators: dict = field(default_factory=dict)
+
+
 class MarketAnalyzer:
     """
     Classe principal para análise de mercado e geração de sinais
@@ -53,6 +364,25 @@ class MarketAnalyzer:
     - Thread de comunicação: envia sinais para o executor de ordens
     """
     
+    # Estratégias combinadas na geração de sinais
+    _strategies = ("wyckoff", "order_flow", "momentum")
+    
+    # Colunas convertidas para numérico ao carregar os dados
+    _numeric_cols = ('ultimo', 'abertura', 'maximo', 'minimo', 'variacao',
+                     'agressao_compra', 'agressao_venda', 'agressao_saldo', 'volume')
+    
+    # Colunas de agressão guardadas em float32 (metade dos bytes lidos pelas análises de fluxo de ordens);
+    # os preços continuam em float64, pois alimentam os níveis de entrada, stop e alvo dos sinais
+    _float32_cols = ('agressao_compra', 'agressao_venda', 'agressao_saldo')
+    
+    # Quantidade máxima de problemas de qualidade de dados distintos mantidos (os mais antigos são descartados)
+    _dq_max_issues = 1000
+    
+    # Chaves (seção, chave) obrigatórias para aceitar uma configuração recarregada em execução
+    _required_config_keys = (("analysis", "polling_interval"), ("analysis", "lookback_periods"),
+                             ("analysis", "chart_interval"), ("database", "table_prefix"),
+                             ("mt5_executor", "enabled"), ("mt5_executor", "signal_file"))
+    
     def __init__(self, config_file="analyzer_config.json"):
         """
         Inicializa o analisador de mercado com configurações do arquivo JSON
@@ -63,21 +393,52 @@ class MarketAnalyzer:
         logger.info(f"Inicializando Market Analyzer Robust v4.0 com arquivo de configuração: {config_file}")
         self.config_file = config_file
         self.config = self._load_config(config_file)
-        self.db_conn = None
+        self._load_validation_settings()
+        self._tls = threading.local()  # Conexão SQLite própria de cada thread
+        self._db_connected = False
+        self._known_tables = set()  # Tabelas existentes no banco, carregadas ao conectar
+        self._tables_refreshed_at = 0.0  # Última consulta ao sqlite_master (time.monotonic)
+        self._epoch_tables = set()  # Tabelas com a coluna ts_epoch (epoch em ms) já migrada
+        self._select_stmts = {}  # SQL parametrizado de leitura por tabela
+        # Janela de dados (lookback_periods) mantida em memória por ativo: (tabela, {coluna: np.ndarray}, último timestamp)
+        self._buffers = {}
         self.stop_event = threading.Event()
-        self.signal_queue = queue.Queue()
+        self.signal_queue = queue.Queue()  # Sinais aguardando gravação no arquivo do executor
+        self._signal_writer = None  # Thread que grava os sinais em lote, criada em start()
+        # Dados pré-carregados pela thread de leitura: (ativo, DataFrame)
+        self._data_queue = queue.Queue(maxsize=max(1, len(self.config.get("assets", {}))) * 2)
         self.threads = []
+        self._pool = None  # Executor das análises por ativo, criado em start()
         self.last_analyzed_timestamp = {}
         self.market_data = {}
         self.signals_history = {}  # Dicionário por perfil de estratégia
         self.charts_dir = os.path.join(os.getcwd(), "charts")
-        self.last_chart_time = {}  # Controle de tempo para limitar geração de gráficos
-        self.last_signal_time = {}  # Controle de tempo para limitar sinais
-        self.data_quality_issues = {}  # Registro de problemas de qualidade de dados
+        self.last_chart_time_ns = {}  # Último gráfico por ativo/perfil (time.monotonic_ns)
+        self.last_signal_time_ns = {}  # Último sinal por ativo/perfil (time.monotonic_ns)
+        self._signal_file_checked = False  # Formato do arquivo de sinais verificado (NDJSON)
+        self._dq_counts = Counter()  # Ocorrências de problemas de qualidade de dados
+        self._dq_meta = {}  # Metadados da primeira ocorrência de cada problema
+        self._dq_lock = threading.Lock()  # As validações rodam em paralelo nas threads do pool de análises
+        # Memoização por ativo e último registro analisado: resultados por análise + configuração do perfil
+        # e saídas dos núcleos numéricos (que não dependem do perfil e são compartilhadas entre eles)
+        self._analysis_cache = {}
+        self._kernel_cache = {}
+        self._fig_cache = {}  # Figura, eixos e formatadores de data reutilizados por ativo/perfil
+        # Renderização dos gráficos fora do loop principal (um único worker: o matplotlib não é thread-safe)
+        self._chart_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Chart")
+        
+        # Pré-calcula a configuração combinada (base + perfil) de cada perfil
+        self._profile_cache = {
+            profile: self._build_profile_config(profile)
+            for profile in self.config.get("strategy_profiles", {})
+        }
+        self._enabled_assets = self._build_enabled_assets()
+        self._config_mtime = os.path.getmtime(config_file) if os.path.exists(config_file) else None
         
         # Inicializa histórico de sinais para cada perfil
+        # (limitado a signals.history_max para manter a memória estável em sessões longas)
         for profile in self.config.get("strategy_profiles", {}).keys():
-            self.signals_history[profile] = []
+            self.signals_history[profile] = self._new_signals_history()
         
         # Cria diretório para gráficos se não existir
         if not os.path.exists(self.charts_dir):
@@ -103,6 +464,8 @@ class MarketAnalyzer:
                 "polling_interval": 10.0,  # segundos (10 segundos)
                 "lookback_periods": 100,  # número de períodos para análise
                 "chart_interval": 300,  # segundos entre geração de gráficos (5 minutos)
+                "chart_dpi": 100,  # resolução dos gráficos salvos
+                "chart_compress_level": 1,  # compressão PNG (0-9): níveis baixos gravam bem mais rápido
                 "signal_interval": 300,  # segundos entre sinais para o mesmo ativo (5 minutos)
                 "wyckoff": {
                     "enabled": True,
@@ -125,7 +488,8 @@ class MarketAnalyzer:
             "signals": {
                 "min_confidence": 0.6,  # confiança mínima para gerar sinal
                 "confirmation_required": True,  # requer confirmação de múltiplas estratégias
-                "risk_reward_min": 1.2  # relação risco/recompensa mínima
+                "risk_reward_min": 1.2,  # relação risco/recompensa mínima
+                "history_max": 10000  # máximo de sinais mantidos em memória por perfil
             },
             "assets": {
                 "winfut": {
@@ -268,14 +632,81 @@ class MarketAnalyzer:
                 logger.info(f"Arquivo de configuração {config_file} criado com valores padrão")
                 return default_config
         except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao carregar configurações: {e}")
             logger.info("Usando configurações padrão devido ao erro")
             return default_config
     
-    def _get_profile_config(self, profile_name):
+    def _load_validation_settings(self):
         """
-        Obtém configuração específica para um perfil de estratégia
+        Guarda em atributos as configurações de validação de dados e o intervalo de gráficos
+        usados a cada polling, evitando percorrer self.config em cada chamada
+        """
+        # Valores lidos a cada ciclo (loop principal, pré-carga, leitura do banco e envio de sinais),
+        # resolvidos uma vez por carga da configuração para acesso por atributo
+        self.cfg = SimpleNamespace(
+            polling_interval=self.config["analysis"]["polling_interval"],
+            lookback_periods=self.config["analysis"]["lookback_periods"],
+            table_prefix=self.config["database"]["table_prefix"],
+            executor_enabled=self.config["mt5_executor"]["enabled"],
+            signal_file=self.config["mt5_executor"]["signal_file"],
+            enabled_profiles=tuple(
+                profile for profile, config in self.config.get("strategy_profiles", {}).items()
+                if config.get("enabled", False)
+            )
+        )
+        
+        data_validation = self.config.get("data_validation", {})
+        self._required_cols = data_validation.get("required_columns", {})
+        self._fallback_values = data_validation.get("fallback_values", {})
+        self._min_data_points = data_validation.get("min_data_points", 10)
+        
+        # Intervalo entre gráficos convertido uma única vez para nanossegundos (relógio monotônico)
+        self._chart_interval_ns = int(self.config["analysis"]["chart_interval"] * 1_000_000_000)
+        
+        # Parâmetros de gravação dos gráficos (PNG de diagnóstico: resolução menor e compressão mínima)
+        self._chart_dpi = self.config["analysis"].get("chart_dpi", 100)
+        self._chart_pil_kwargs = {"compress_level": self.config["analysis"].get("chart_compress_level", 1)}
+        
+        # Chaves de problemas de qualidade pré-calculadas (e internadas) para cada ativo e tipo de análise
+        self._analysis_types = tuple(sys.intern(t) for t in ("basic", "wyckoff", "order_flow", "momentum"))
+        self._issue_keys = {
+            (asset, analysis_type): sys.intern(f"{asset}_{analysis_type}")
+            for asset in self.config.get("assets", {})
+            for analysis_type in self._analysis_types
+        }
+        
+        # Horários de trading convertidos uma única vez por carga da configuração
+        for asset_config in self.config.get("assets", {}).values():
+            asset_config["_trading_hours_parsed"] = self._parse_trading_hours(asset_config)
+    
+    @staticmethod
+    def _parse_trading_hours(asset_config):
+        """
+        Converte o horário de trading do ativo ("HH:MM") em objetos time
+        
+        Args:
+            asset_config (dict): Configuração do ativo
+            
+        Returns:
+            tuple: (time, time) - Início e fim do horário de trading
+        """
+        trading_hours = asset_config.get("trading_hours", {})
+        start_time = datetime.strptime(trading_hours.get("start", "00:00"), "%H:%M").time()
+        end_time = datetime.strptime(trading_hours.get("end", "23:59"), "%H:%M").time()
+        return start_time, end_time
+    
+    def _new_signals_history(self):
+        """
+        Cria o histórico de sinais de um perfil, limitado aos últimos signals.history_max sinais
+        
+        Returns:
+            deque: Histórico vazio com tamanho máximo configurado
+        """
+        return deque(maxlen=self.config.get("signals", {}).get("history_max", 10000))
+    
+    def _build_profile_config(self, profile_name):
+        """
+        Monta a configuração específica para um perfil de estratégia
         
         Args:
             profile_name (str): Nome do perfil de estratégia
@@ -284,28 +715,136 @@ class MarketAnalyzer:
             dict: Configuração combinada (base + perfil específico)
         """
         if profile_name not in self.config.get("strategy_profiles", {}):
-            logger.warning(f"Perfil de estratégia '{profile_name}' não encontrado. Usando configurações padrão.")
+            logger.warning("Perfil de estratégia '%s' não encontrado. Usando configurações padrão.", profile_name)
             return self.config
         
-        # Cria uma cópia profunda da configuração base
-        profile_config = json.loads(json.dumps(self.config))
-        
-        # Aplica configurações específicas do perfil
         profile = self.config["strategy_profiles"][profile_name]
+        profile_analysis = profile.get("analysis", {})
         
-        # Aplica configurações de sinais
-        if "signals" in profile:
-            for key, value in profile["signals"].items():
-                profile_config["signals"][key] = value
+        # Copia apenas os sub-dicionários sobrescritos pelo perfil (sinais e categorias de análise);
+        # o restante da configuração base é compartilhado sem cópia
+        return {
+            **self.config,
+            "signals": {**self.config["signals"], **profile.get("signals", {})},
+            "analysis": {
+                category: ({**settings, **profile_analysis.get(category, {})} if isinstance(settings, dict) else settings)
+                for category, settings in self.config["analysis"].items()
+            }
+        }
+    
+    def _get_profile_config(self, profile_name):
+        """
+        Obtém configuração específica para um perfil de estratégia
+        
+        Args:
+            profile_name (str): Nome do perfil de estratégia
+            
+        Returns:
+            dict: Configuração combinada (base + perfil específico), pré-calculada ao carregar a configuração
+        """
+        cached = self._profile_cache.get(profile_name)
+        if cached is not None:
+            return cached
+        return self._build_profile_config(profile_name)
+    
+    def _build_enabled_assets(self):
+        """
+        Pré-calcula o conjunto de ativos habilitados de cada perfil a partir das configurações combinadas
+        
+        Returns:
+            dict: Perfil -> frozenset com os nomes dos ativos habilitados
+        """
+        return {
+            profile: frozenset(asset for asset, asset_config in profile_config.get("assets", {}).items() if asset_config.get("enabled", False))
+            for profile, profile_config in self._profile_cache.items()
+        }
+    
+    def _get_enabled_assets(self, profile_name):
+        """
+        Obtém os ativos habilitados para um perfil de estratégia
+        
+        Args:
+            profile_name (str): Nome do perfil de estratégia
+            
+        Returns:
+            frozenset: Nomes dos ativos habilitados, pré-calculados ao carregar a configuração
+        """
+        cached = self._enabled_assets.get(profile_name)
+        if cached is not None:
+            return cached
+        return frozenset(
+            asset for asset, asset_config in self._get_profile_config(profile_name).get("assets", {}).items()
+            if asset_config.get("enabled", False)
+        )
+    
+    def _read_config_file(self, config_file):
+        """
+        Lê e valida o arquivo de configuração para a recarga em execução
+        (sem usar valores padrão e sem nunca gravar no arquivo, ao contrário de _load_config)
+        
+        Args:
+            config_file (str): Caminho para o arquivo de configuração
+            
+        Returns:
+            dict: Configuração lida ou None se o arquivo estiver incompleto ou inválido
+        """
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                new_config = json.load(f)
+            
+            if not isinstance(new_config.get("strategy_profiles"), dict):
+                raise ValueError("seção 'strategy_profiles' ausente ou inválida")
+            for section, key in self._required_config_keys:
+                if key not in new_config.get(section, {}):
+                    raise ValueError(f"chave '{section}.{key}' ausente")
+            return new_config
+        except Exception as e:
+            logger.error("Configuração inválida em %s, mantendo a configuração atual: %s", config_file, e)
+            return None
+    
+    def _reload_config_if_changed(self):
+        """
+        Recarrega o arquivo de configuração se ele foi modificado desde a última leitura
+        e recalcula as configurações combinadas dos perfis
+        (um arquivo inválido ou salvo pela metade é ignorado até a próxima modificação)
+        
+        Returns:
+            bool: True se a configuração foi recarregada, False caso contrário
+        """
+        try:
+            mtime = os.path.getmtime(self.config_file)
+        except OSError:
+            return False
+        
+        if mtime == self._config_mtime:
+            return False
+        
+        logger.info(f"Arquivo de configuração modificado, recarregando: {self.config_file}")
+        self._config_mtime = mtime
+        new_config = self._read_config_file(self.config_file)
+        if new_config is None:
+            return False
         
-        # Aplica configurações de análise
-        if "analysis" in profile:
-            for category, settings in profile["analysis"].items():
-                if category in profile_config["analysis"]:
-                    for key, value in settings.items():
-                        profile_config["analysis"][category][key] = value
+        previous_prefix = self.cfg.table_prefix
+        self.config = new_config
+        self._load_validation_settings()
+        self._analysis_cache.clear()
+        self._kernel_cache.clear()
         
-        return profile_config
+        # Com outro prefixo as tabelas lidas mudam: as janelas em memória guardam a tabela de origem
+        # e são descartadas pela própria thread de leitura (get_latest_data), sem disputa com uma leitura em andamento
+        if self.cfg.table_prefix != previous_prefix:
+            logger.info("Prefixo das tabelas alterado de %s para %s", previous_prefix, self.cfg.table_prefix)
+        
+        self._profile_cache = {
+            profile: self._build_profile_config(profile)
+            for profile in self.config.get("strategy_profiles", {})
+        }
+        self._enabled_assets = self._build_enabled_assets()
+        for profile in self.config.get("strategy_profiles", {}):
+            if profile not in self.signals_history:
+                self.signals_history[profile] = self._new_signals_history()
+        return True
     
     def setup_database_connection(self):
         """
@@ -323,26 +862,161 @@ class MarketAnalyzer:
                 logger.error(f"Banco de dados não encontrado: {db_path}")
                 return False
             
-            # Conecta ao banco de dados
-            self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
+            # Conecta ao banco de dados (conexão da thread atual)
+            conn = self._conn()
             
-            # Configura para retornar resultados como dicionários
-            self.db_conn.row_factory = sqlite3.Row
+            # Ajusta o SQLite para leitura concorrente com o processo escritor (WAL, persistente no arquivo)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._db_connected = True
             
             logger.info(f"Conectado ao banco de dados: {db_path}")
             
             # Verifica as tabelas disponíveis
-            cursor = self.db_conn.cursor()
+            cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
             logger.info(f"Tabelas disponíveis no banco de dados: {tables}")
             
+            # Guarda as tabelas conhecidas para evitar consultar sqlite_master a cada polling
+            self._known_tables = set(tables)
+            self._tables_refreshed_at = time.monotonic()
+            
+            # Tabelas com timestamp em epoch (ms) dispensam o parse das strings ISO a cada leitura
+            cursor.execute("SELECT m.name FROM sqlite_master m JOIN pragma_table_info(m.name) p WHERE m.type='table' AND p.name='ts_epoch';")
+            self._epoch_tables = {row[0] for row in cursor.fetchall()}
+            
+            return True
+        except Exception as e:
+            logger.exception(f"Erro ao conectar ao banco de dados: {e}")
+            return False
+    
+    def _table_exists(self, table_name):
+        """
+        Verifica se a tabela existe no banco usando a lista carregada ao conectar; se ela não estiver
+        na lista, consulta novamente o sqlite_master (no máximo uma vez por intervalo de polling),
+        para reconhecer as tabelas criadas pelo leitor RTD depois que o analisador foi iniciado
+        
+        Args:
+            table_name (str): Nome da tabela
+            
+        Returns:
+            bool: True se a tabela existe, False caso contrário
+        """
+        if table_name in self._known_tables:
+            return True
+        
+        now = time.monotonic()
+        if now - self._tables_refreshed_at < self.cfg.polling_interval:
+            return False
+        self._tables_refreshed_at = now
+        
+        cursor = self._conn().execute("SELECT name FROM sqlite_master WHERE type='table';")
+        self._known_tables = {row[0] for row in cursor.fetchall()}
+        return table_name in self._known_tables
+    
+    def _conn(self):
+        """
+        Retorna a conexão SQLite da thread atual, criando-a na primeira chamada
+        (sem compartilhar conexões entre threads, as leituras seguem em paralelo no modo WAL)
+        
+        Returns:
+            sqlite3.Connection: Conexão da thread atual
+        """
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.config["database"]["db_path"])
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._tls.conn = conn
+        return conn
+    
+    def _close_conn(self):
+        """
+        Fecha a conexão SQLite da thread atual, se existir
+        
+        Returns:
+            bool: True se havia uma conexão aberta, False caso contrário
+        """
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            return False
+        conn.close()
+        self._tls.conn = None
+        return True
+    
+    def migrate_timestamp_epoch(self, asset):
+        """
+        Adiciona a coluna ts_epoch (epoch em ms) à tabela de um ativo, preenche os registros
+        existentes e cria um trigger que a preenche nas novas inserções, para que as leituras
+        seguintes não precisem converter as strings de timestamp
+        
+        Args:
+            asset (str): Nome do ativo
+            
+        Returns:
+            bool: True se a migração foi concluída (ou já existia), False caso contrário
+        """
+        try:
+            if not self._db_connected:
+                logger.error("Conexão com banco de dados não estabelecida")
+                return False
+            
+            table_name = f"{self.config['database']['table_prefix']}_{asset}"
+            if not self._table_exists(table_name):
+                logger.error(f"Tabela {table_name} não encontrada no banco de dados")
+                return False
+            
+            if table_name in self._epoch_tables:
+                return True
+            
+            # Epoch em ms exato: segundos inteiros * 1000 + milissegundos de %f ("SS.SSS")
+            epoch_expr = "CAST(strftime('%s', {ts}) AS INTEGER) * 1000 + CAST(substr(strftime('%f', {ts}), 4, 3) AS INTEGER)"
+            
+            conn = self._conn()
+            cursor = conn.cursor()
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN ts_epoch INTEGER")
+            cursor.execute(f"UPDATE {table_name} SET ts_epoch = {epoch_expr.format(ts='timestamp')}")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{asset}_ts_epoch ON {table_name} (ts_epoch)")
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{asset}_ts_epoch AFTER INSERT ON {table_name} "
+                f"WHEN NEW.ts_epoch IS NULL BEGIN "
+                f"UPDATE {table_name} SET ts_epoch = {epoch_expr.format(ts='NEW.timestamp')} WHERE rowid = NEW.rowid; "
+                f"END"
+            )
+            conn.commit()
+            
+            # As próximas leituras passam a usar ts_epoch
+            self._epoch_tables.add(table_name)
+            self._select_stmts.pop(table_name, None)
+            
+            logger.info(f"Coluna ts_epoch criada e preenchida para {table_name}")
             return True
         except Exception as e:
-            logger.error(f"Erro ao conectar ao banco de dados: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao migrar timestamp para epoch em {asset}: {e}")
             return False
     
+    @staticmethod
+    def _memoized(cache, key, stamp, compute):
+        """
+        Retorna o valor memoizado para a chave se ele foi calculado sobre os mesmos dados,
+        ou calcula e guarda um novo (cada chave mantém apenas o valor mais recente)
+        
+        Args:
+            cache (dict): Dicionário de memoização
+            key (tuple): Chave do valor (ativo, análise e, se for o caso, configuração)
+            stamp (tuple): Identificação dos dados (quantidade de registros, último timestamp)
+            compute (callable): Função sem argumentos que calcula o valor
+            
+        Returns:
+            object: Valor memoizado ou recém-calculado
+        """
+        cached = cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = compute()
+        cache[key] = (stamp, value)
+        return value
+    
     def validate_data_columns(self, df, asset, analysis_type):
         """
         Valida se o DataFrame contém as colunas necessárias para um tipo de análise
@@ -356,32 +1030,38 @@ class MarketAnalyzer:
             tuple: (bool, list) - Indica se a validação passou e lista de colunas ausentes
         """
         if df is None or df.empty:
-            logger.warning(f"DataFrame vazio ou None para {asset} na validação de {analysis_type}")
+            logger.warning("DataFrame vazio ou None para %s na validação de %s", asset, analysis_type)
             return False, ["DataFrame vazio"]
         
         # Obtém a lista de colunas necessárias para o tipo de análise
-        required_columns = self.config.get("data_validation", {}).get("required_columns", {}).get(analysis_type, [])
+        required_columns = self._required_cols.get(analysis_type, [])
         
         # Verifica quais colunas estão ausentes
         missing_columns = [col for col in required_columns if col not in df.columns]
         
         # Se houver colunas ausentes, registra o problema
         if missing_columns:
-            issue_key = f"{asset}_{analysis_type}"
-            if issue_key not in self.data_quality_issues:
-                logger.warning(f"Colunas ausentes para {asset} na análise de {analysis_type}: {missing_columns}")
-                self.data_quality_issues[issue_key] = {
-                    "asset": asset,
-                    "analysis_type": analysis_type,
-                    "missing_columns": missing_columns,
-                    "first_detected": datetime.now().isoformat(),
-                    "count": 1
-                }
-            else:
-                self.data_quality_issues[issue_key]["count"] += 1
-                # Loga apenas a cada 10 ocorrências para evitar spam no log
-                if self.data_quality_issues[issue_key]["count"] % 10 == 0:
-                    logger.warning(f"Colunas ausentes para {asset} na análise de {analysis_type}: {missing_columns} (ocorrência {self.data_quality_issues[issue_key]['count']})")
+            issue_key = self._issue_keys.get((asset, analysis_type)) or f"{asset}_{analysis_type}"
+            with self._dq_lock:
+                self._dq_counts[issue_key] += 1
+                count = self._dq_counts[issue_key]
+                if count == 1:
+                    self._dq_meta[issue_key] = {
+                        "asset": asset,
+                        "analysis_type": analysis_type,
+                        "missing_columns": missing_columns,
+                        "first_detected": datetime.now().isoformat()
+                    }
+                    # Limita a memória em sessões longas: descarta o problema mais antigo (ordem de inserção)
+                    if len(self._dq_counts) > self._dq_max_issues:
+                        oldest = next(iter(self._dq_counts))
+                        del self._dq_counts[oldest]
+                        self._dq_meta.pop(oldest, None)
+            if count == 1:
+                logger.warning("Colunas ausentes para %s na análise de %s: %s", asset, analysis_type, missing_columns)
+            # Loga apenas a cada 10 ocorrências para evitar spam no log
+            elif count % 10 == 0:
+                logger.warning("Colunas ausentes para %s na análise de %s: %s (ocorrência %s)", asset, analysis_type, missing_columns, count)
             
             return False, missing_columns
         
@@ -400,26 +1080,23 @@ class MarketAnalyzer:
             pd.DataFrame: DataFrame preparado para análise
         """
         if df is None or df.empty:
-            logger.warning(f"DataFrame vazio ou None para {asset} na preparação para {analysis_type}")
+            logger.warning("DataFrame vazio ou None para %s na preparação para %s", asset, analysis_type)
             return None
         
-        # Cria uma cópia do DataFrame para não modificar o original
-        prepared_df = df.copy()
-        
         # Obtém a lista de colunas necessárias para o tipo de análise
-        required_columns = self.config.get("data_validation", {}).get("required_columns", {}).get(analysis_type, [])
+        required_columns = self._required_cols.get(analysis_type, [])
         
-        # Obtém valores padrão para colunas ausentes
-        fallback_values = self.config.get("data_validation", {}).get("fallback_values", {})
+        # Se nenhuma coluna estiver ausente, usa o DataFrame original sem copiá-lo
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if not missing_columns:
+            return df
         
-        # Adiciona colunas ausentes com valores padrão
-        for col in required_columns:
-            if col not in prepared_df.columns:
-                default_value = fallback_values.get(col, 0)
-                logger.debug(f"Adicionando coluna ausente {col} para {asset} com valor padrão {default_value}")
-                prepared_df[col] = default_value
+        # Adiciona colunas ausentes com valores padrão (assign gera uma única cópia, sem modificar o original)
+        defaults = {col: self._fallback_values.get(col, 0) for col in missing_columns}
+        for col, default_value in defaults.items():
+            logger.debug("Adicionando coluna ausente %s para %s com valor padrão %s", col, asset, default_value)
         
-        return prepared_df
+        return df.assign(**defaults)
     
     def get_latest_data(self, asset, limit=None):
         """
@@ -433,75 +1110,116 @@ class MarketAnalyzer:
             pd.DataFrame: DataFrame com os dados mais recentes ou None em caso de erro
         """
         try:
-            if not self.db_conn:
+            if not self._db_connected:
                 logger.error("Conexão com banco de dados não estabelecida")
                 return None
+            conn = self._conn()
             
-            table_name = f"{self.config['database']['table_prefix']}_{asset}"
+            table_name = f"{self.cfg.table_prefix}_{asset}"
             
-            # Verifica se a tabela existe
-            cursor = self.db_conn.cursor()
-            cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-            if not cursor.fetchone():
+            # Verifica se a tabela existe (lista obtida ao conectar, atualizada quando a tabela não está nela)
+            if not self._table_exists(table_name):
                 logger.error(f"Tabela {table_name} não encontrada no banco de dados")
                 return None
             
-            # Define o limite de registros
+            # Sem limite explícito, usa a janela de análise mantida em memória e busca apenas os registros novos
+            use_buffer = limit is None
+            lookback = self.cfg.lookback_periods
             if limit is None:
-                limit = self.config["analysis"]["lookback_periods"]
-            
-            # Obtém o timestamp do último registro analisado
-            last_timestamp = self.last_analyzed_timestamp.get(asset)
-            
-            # Prepara a query
-            query = f"SELECT * FROM {table_name} ORDER BY timestamp DESC LIMIT {limit}"
+                limit = lookback
             
-            # Executa a query
-            cursor = self.db_conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            if not rows:
-                logger.warning(f"Nenhum dado encontrado para {asset}")
+            # Obtém a janela em memória e o timestamp do último registro analisado; uma janela lida de outra
+            # tabela (prefixo alterado na recarga da configuração) é descartada e a leitura volta a ser completa
+            buffer_entry = self._buffers.get(asset) if use_buffer else None
+            if buffer_entry is not None and buffer_entry[0] == table_name:
+                _, buffer, last_timestamp = buffer_entry
+            else:
+                buffer, last_timestamp = None, None
+            incremental = buffer is not None
+            
+            # Prepara as queries parametrizadas (mesmo texto SQL por tabela, reaproveitado pelo cache de statements do SQLite)
+            epoch = table_name in self._epoch_tables
+            stmts = self._select_stmts.get(table_name)
+            if stmts is None:
+                order_column = "ts_epoch" if epoch else "timestamp"
+                stmts = (
+                    f"SELECT * FROM {table_name} ORDER BY {order_column} DESC LIMIT ?",
+                    f"SELECT * FROM {table_name} WHERE {order_column} > ? ORDER BY {order_column} ASC"
+                )
+                self._select_stmts[table_name] = stmts
+            
+            # Com ts_epoch o timestamp é montado a partir dos inteiros; sem ele, o parser ISO8601 em C
+            # converte as strings (aceitando registros com e sem microssegundos)
+            parse_dates = None if epoch else {'timestamp': {'format': 'ISO8601'}}
+            
+            # Executa a query e monta o DataFrame coluna a coluna
+            try:
+                if incremental:
+                    since = pd.Timestamp(last_timestamp).value // 1_000_000 if epoch else last_timestamp
+                    df = pd.read_sql_query(stmts[1], conn, params=(since,), parse_dates=parse_dates)
+                    if df.empty:
+                        # Nenhum registro novo: a janela em memória continua válida
+                        return pd.DataFrame(buffer, copy=False)
+                else:
+                    df = pd.read_sql_query(stmts[0], conn, params=(int(limit),), parse_dates=parse_dates)
+            except (sqlite3.OperationalError, pd.errors.DatabaseError) as e:
+                if not epoch:
+                    raise
+                # A tabela foi recriada sem ts_epoch (o leitor RTD recria as tabelas ao iniciar):
+                # volta a ler pelo timestamp ISO e repete a consulta
+                logger.warning("Coluna ts_epoch indisponível em %s, usando o timestamp ISO: %s", table_name, e)
+                self._epoch_tables.discard(table_name)
+                self._select_stmts.pop(table_name, None)
+                return self.get_latest_data(asset, None if use_buffer else limit)
+            
+            if epoch and not df.empty:
+                df['timestamp'] = pd.to_datetime(df.pop('ts_epoch'), unit='ms')
+            
+            if df.empty:
+                logger.warning("Nenhum dado encontrado para %s", asset)
                 return None
             
-            # Converte para DataFrame
-            df = pd.DataFrame([dict(row) for row in rows])
-            
             # Verifica se o DataFrame tem as colunas básicas necessárias
             valid, missing = self.validate_data_columns(df, asset, "basic")
             if not valid:
                 logger.error(f"Dados para {asset} não contêm colunas básicas necessárias: {missing}")
                 return None
             
-            # Converte timestamp para datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
             # Ordena por timestamp (mais antigo primeiro)
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            
-            # Converte colunas numéricas
-            numeric_columns = ['ultimo', 'abertura', 'maximo', 'minimo', 'variacao', 
-                              'agressao_compra', 'agressao_venda', 'agressao_saldo', 'volume']
+            df.sort_values('timestamp', inplace=True)
+            df.reset_index(drop=True, inplace=True)
             
-            for col in numeric_columns:
+            # Converte colunas numéricas, preenchendo com 0 os valores não numéricos para evitar erros
+            for col in self._numeric_cols:
                 if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Preenche valores NaN com 0 para evitar erros
-            df = df.fillna(0)
-            
-            # Atualiza o timestamp do último registro analisado
-            if not df.empty:
-                self.last_analyzed_timestamp[asset] = df['timestamp'].max().isoformat()
+                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            for col in self._float32_cols:
+                if col in df.columns:
+                    df[col] = df[col].astype(np.float32, copy=False)
+            
+            if use_buffer:
+                # Janela em memória guardada como arrays NumPy por coluna (SoA): os registros novos são
+                # anexados direto nos arrays, mantendo apenas os últimos lookback_periods, sem pd.concat
+                columns = {col: df[col].to_numpy() for col in df.columns}
+                if incremental:
+                    columns = {col: np.concatenate((buffer[col], values))[-lookback:] for col, values in columns.items()}
+                
+                # Atualiza o timestamp do último registro analisado (dados ordenados: o último é o mais recente),
+                # guardado junto com a janela e a tabela de origem em uma única atribuição
+                last_timestamp = pd.Timestamp(columns['timestamp'][-1]).isoformat()
+                self._buffers[asset] = (table_name, columns, last_timestamp)
+                self.last_analyzed_timestamp[asset] = last_timestamp
+                
+                # DataFrame novo sobre os mesmos arrays: as análises adicionam colunas sem alterar a janela
+                df = pd.DataFrame(columns, copy=False)
             
-            # Registra estatísticas sobre os dados
-            logger.debug(f"Dados obtidos para {asset}: {len(df)} registros, período de {df['timestamp'].min()} a {df['timestamp'].max()}")
+            # Registra estatísticas sobre os dados (min/max só são calculados com DEBUG ativo)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Dados obtidos para %s: %s registros, período de %s a %s", asset, len(df), df['timestamp'].min(), df['timestamp'].max())
             
             return df
         except Exception as e:
-            logger.error(f"Erro ao obter dados para {asset}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao obter dados para {asset}: {e}")
             return None
     
     def analyze_wyckoff(self, df, asset, profile_config):
@@ -514,121 +1232,95 @@ class MarketAnalyzer:
             profile_config (dict): Configuração específica do perfil
             
         Returns:
-            dict: Resultados da análise de Wyckoff
+            WyckoffResult: Resultados da análise de Wyckoff
         """
         try:
-            # Validação básica de dados
-            if df is None or df.empty:
-                return {"valid": False, "message": "Dados insuficientes para análise"}
+            # Validação básica de dados (tamanho calculado uma única vez e reutilizado)
+            n = 0 if df is None else len(df)
+            if n == 0:
+                return WyckoffResult(valid=False, message="Dados insuficientes para análise")
             
             # Configurações
             wyckoff_config = profile_config["analysis"]["wyckoff"]
             if not wyckoff_config["enabled"]:
-                return {"valid": False, "message": "Análise de Wyckoff desativada"}
+                return WyckoffResult(valid=False, message="Análise de Wyckoff desativada")
             
             # Valida e prepara o DataFrame para análise de Wyckoff
             valid, missing = self.validate_data_columns(df, asset, "wyckoff")
             if not valid:
                 # Prepara o DataFrame com colunas padrão para continuar a análise
                 df = self.prepare_dataframe(df, asset, "wyckoff")
-                logger.debug(f"Usando valores padrão para colunas ausentes na análise de Wyckoff: {missing}")
+                logger.debug("Usando valores padrão para colunas ausentes na análise de Wyckoff: %s", missing)
             
             # Resultados
-            results = {
-                "valid": True,
-                "phase": None,  # Acumulação, Distribuição, Uptrend, Downtrend
-                "signals": [],
-                "confidence": 0.0,
-                "support_level": None,
-                "resistance_level": None,
-                "volume_analysis": {},
-                "price_analysis": {}
-            }
+            results = WyckoffResult()
+            
+            # Volume é opcional (as tabelas do leitor RTD não têm essa coluna): sem ele, o núcleo recebe
+            # o valor padrão e apenas a análise de volume abaixo fica de fora
+            if 'volume' in df.columns:
+                volume = df['volume'].to_numpy(dtype=np.float64)
+            else:
+                volume = np.full(n, self._fallback_values.get('volume', 0), dtype=np.float64)
+            
+            # Extrai os arrays uma única vez e executa o núcleo numérico sobre eles
+            # (memoizado por ativo e último registro: o resultado não depende do perfil)
+            (price_up_volume_down, price_down_volume_up, support_level, resistance_level,
+             position_in_range, last_price) = self._memoized(
+                self._kernel_cache, (asset, "wyckoff"), (n, df['timestamp'].iloc[-1]),
+                lambda: _wyckoff_kernel(df['ultimo'].to_numpy(dtype=np.float64), df['maximo'].to_numpy(dtype=np.float64),
+                                        df['minimo'].to_numpy(dtype=np.float64), volume))
             
             # 1. Análise de Volume e Preço (Lei de Esforço vs. Resultado)
-            # Calcula a média móvel de volume e preço
             if 'volume' in df.columns:
-                # Verifica se há dados suficientes para calcular médias móveis
-                if len(df) >= 5:
-                    df['volume_ma'] = df['volume'].rolling(window=5).mean()
-                    
-                    # Divergência de volume e preço
-                    df['price_change'] = df['ultimo'].pct_change()
-                    df['volume_change'] = df['volume'].pct_change()
-                    
-                    # Preenche valores NaN com 0
-                    df['price_change'] = df['price_change'].fillna(0)
-                    df['volume_change'] = df['volume_change'].fillna(0)
-                    
-                    # Verifica divergência: preço sobe mas volume cai (possível distribuição)
-                    price_up_volume_down = ((df['price_change'] > 0) & (df['volume_change'] < 0)).sum()
-                    
-                    # Verifica divergência: preço desce mas volume sobe (possível acumulação)
-                    price_down_volume_up = ((df['price_change'] < 0) & (df['volume_change'] > 0)).sum()
-                    
-                    results["volume_analysis"] = {
-                        "price_up_volume_down": price_up_volume_down,
-                        "price_down_volume_up": price_down_volume_up,
+                # Verifica se há dados suficientes para a análise de divergência
+                if n >= 5:
+                    results.volume_analysis = {
+                        "price_up_volume_down": int(price_up_volume_down),  # Preço sobe mas volume cai (possível distribuição)
+                        "price_down_volume_up": int(price_down_volume_up),  # Preço desce mas volume sobe (possível acumulação)
                         "effort_result_ratio": price_up_volume_down / (price_down_volume_up + 1)  # Evita divisão por zero
                     }
                 else:
-                    logger.debug(f"Dados insuficientes para análise de volume para {asset} (len={len(df)})")
+                    logger.debug("Dados insuficientes para análise de volume para %s (len=%s)", asset, n)
             
             # 2. Análise de Suporte e Resistência (Lei de Oferta e Demanda)
-            # Identifica níveis de suporte e resistência usando mínimos e máximos recentes
-            if len(df) >= 10:
-                # Pega os últimos N períodos para análise
-                recent_df = df.tail(20)
-                
-                # Encontra mínimos e máximos locais
-                min_prices = recent_df['minimo'].nsmallest(3).tolist()
-                max_prices = recent_df['maximo'].nlargest(3).tolist()
-                
-                # Define suporte como a média dos mínimos recentes
-                results["support_level"] = sum(min_prices) / len(min_prices)
+            # Níveis calculados pelo kernel a partir dos mínimos e máximos dos últimos 20 períodos
+            if n >= 10:
+                results.support_level = float(support_level)
+                results.resistance_level = float(resistance_level)
                 
-                # Define resistência como a média dos máximos recentes
-                results["resistance_level"] = sum(max_prices) / len(max_prices)
-                
-                # Calcula a largura do range
-                range_width = results["resistance_level"] - results["support_level"]
-                
-                # Posição atual do preço no range
-                last_price = df['ultimo'].iloc[-1]
-                if range_width > 0:
-                    position_in_range = (last_price - results["support_level"]) / range_width
-                    results["price_analysis"]["position_in_range"] = position_in_range
+                # Posição atual do preço no range (NaN quando a largura do range não é positiva)
+                if not np.isnan(position_in_range):
+                    results.price_analysis["position_in_range"] = float(position_in_range)
                     
                     # Determina a fase com base na posição no range e no volume
                     if position_in_range < 0.3:
                         # Próximo ao suporte
-                        if 'volume_analysis' in results and results["volume_analysis"].get("price_down_volume_up", 0) > 5:
-                            results["phase"] = "Acumulação"
-                            results["signals"].append({"type": "Compra", "reason": "Acumulação próxima ao suporte"})
-                            results["confidence"] = 0.7
+                        if results.volume_analysis.get("price_down_volume_up", 0) > 5:
+                            results.phase = "Acumulação"
+                            results.signals.append(Signal("Compra", "Acumulação próxima ao suporte"))
+                            results.confidence = 0.7
                     elif position_in_range > 0.7:
                         # Próximo à resistência
-                        if 'volume_analysis' in results and results["volume_analysis"].get("price_up_volume_down", 0) > 5:
-                            results["phase"] = "Distribuição"
-                            results["signals"].append({"type": "Venda", "reason": "Distribuição próxima à resistência"})
-                            results["confidence"] = 0.7
+                        if results.volume_analysis.get("price_up_volume_down", 0) > 5:
+                            results.phase = "Distribuição"
+                            results.signals.append(Signal("Venda", "Distribuição próxima à resistência"))
+                            results.confidence = 0.7
             
             # 3. Análise de Causa e Efeito (Potencial de movimento)
             # Estima o potencial de movimento com base no tamanho da fase de acumulação/distribuição
-            if results["phase"] == "Acumulação" and "support_level" in results and "resistance_level" in results:
-                potential_target = results["resistance_level"] + (results["resistance_level"] - results["support_level"])
-                results["price_analysis"]["potential_target"] = potential_target
-                results["price_analysis"]["risk_reward"] = (potential_target - df['ultimo'].iloc[-1]) / (df['ultimo'].iloc[-1] - results["support_level"])
-            elif results["phase"] == "Distribuição" and "support_level" in results and "resistance_level" in results:
-                potential_target = results["support_level"] - (results["resistance_level"] - results["support_level"])
-                results["price_analysis"]["potential_target"] = potential_target
-                results["price_analysis"]["risk_reward"] = (df['ultimo'].iloc[-1] - potential_target) / (results["resistance_level"] - df['ultimo'].iloc[-1])
+            if results.phase == "Acumulação":
+                potential_target = results.resistance_level + (results.resistance_level - results.support_level)
+                results.price_analysis["potential_target"] = potential_target
+                results.price_analysis["risk_reward"] = (potential_target - last_price) / (last_price - results.support_level)
+            elif results.phase == "Distribuição":
+                potential_target = results.support_level - (results.resistance_level - results.support_level)
+                results.price_analysis["potential_target"] = potential_target
+                results.price_analysis["risk_reward"] = (last_price - potential_target) / (results.resistance_level - last_price)
             
             return results
         except Exception as e:
-            logger.error(f"Erro na análise de Wyckoff para {asset}: {e}")
-            logger.error(traceback.format_exc())
-            return {"valid": False, "message": f"Erro na análise: {str(e)}"}
+            logger.exception(f"Erro na análise de Wyckoff para {asset}: {e}")
+            return WyckoffResult(valid=False, message=f"Erro na análise: {str(e)}")
     
     def analyze_order_flow(self, df, asset, profile_config):
         """
@@ -640,62 +1332,50 @@ class MarketAnalyzer:
             profile_config (dict): Configuração específica do perfil
             
         Returns:
-            dict: Resultados da análise de fluxo de ordens
+            OrderFlowResult: Resultados da análise de fluxo de ordens
         """
         try:
-            # Validação básica de dados
-            if df is None or df.empty:
-                return {"valid": False, "message": "Dados insuficientes para análise"}
+            # Validação básica de dados (tamanho calculado uma única vez e reutilizado)
+            n = 0 if df is None else len(df)
+            if n == 0:
+                return OrderFlowResult(valid=False, message="Dados insuficientes para análise")
             
             # Configurações
             order_flow_config = profile_config["analysis"]["order_flow"]
             if not order_flow_config["enabled"]:
-                return {"valid": False, "message": "Análise de fluxo de ordens desativada"}
+                return OrderFlowResult(valid=False, message="Análise de fluxo de ordens desativada")
+            aggression_threshold = order_flow_config["aggression_threshold"]
+            absorption_threshold = order_flow_config["absorption_threshold"]
             
             # Valida e prepara o DataFrame para análise de fluxo de ordens
             valid, missing = self.validate_data_columns(df, asset, "order_flow")
             if not valid:
                 # Prepara o DataFrame com colunas padrão para continuar a análise
                 df = self.prepare_dataframe(df, asset, "order_flow")
-                logger.debug(f"Usando valores padrão para colunas ausentes na análise de fluxo de ordens: {missing}")
+                logger.debug("Usando valores padrão para colunas ausentes na análise de fluxo de ordens: %s", missing)
             
             # Resultados
-            results = {
-                "valid": True,
-                "signals": [],
-                "confidence": 0.0,
-                "aggression_analysis": {},
-                "absorption_analysis": {},
-                "exhaustion_analysis": {}
-            }
+            results = OrderFlowResult()
             
             # Verifica se temos as colunas necessárias após a preparação
             required_columns = ['agressao_compra', 'agressao_venda', 'agressao_saldo']
             if not all(col in df.columns for col in required_columns):
                 logger.error(f"Colunas necessárias ainda ausentes após preparação para {asset}: {[col for col in required_columns if col not in df.columns]}")
-                return {"valid": False, "message": "Dados de fluxo de ordens não disponíveis mesmo após preparação"}
+                return OrderFlowResult(valid=False, message="Dados de fluxo de ordens não disponíveis mesmo após preparação")
+            
+            # Todo o cálculo numérico fica no kernel; aqui apenas são montados os resultados e sinais
+            # (kernel memoizado por ativo e último registro: o resultado não depende do perfil)
+            (last_saldo, last_saldo_ma5, last_saldo_ma20, aggression_strength,
+             recent_price_change, recent_aggression_volume, recent_aggression_balance, absorption_ratio,
+             previous_aggression, recent_aggression, previous_price_change,
+             aggression_direction_change, price_direction_change, exhaustion_detected) = self._memoized(
+                self._kernel_cache, (asset, "order_flow"), (n, df['timestamp'].iloc[-1]),
+                lambda: _order_flow_kernel(df['ultimo'].to_numpy(dtype=np.float64), df['agressao_compra'].to_numpy(dtype=np.float32),
+                                           df['agressao_venda'].to_numpy(dtype=np.float32), df['agressao_saldo'].to_numpy(dtype=np.float32)))
             
             # 1. Análise de Agressão
-            # Calcula o saldo de agressão e sua média móvel
-            if len(df) >= 5:
-                df['agressao_saldo_ma5'] = df['agressao_saldo'].rolling(window=5).mean().fillna(0)
-            else:
-                df['agressao_saldo_ma5'] = df['agressao_saldo']
-            
-            if len(df) >= 20:
-                df['agressao_saldo_ma20'] = df['agressao_saldo'].rolling(window=20).mean().fillna(0)
-            else:
-                df['agressao_saldo_ma20'] = df['agressao_saldo']
-            
-            # Pega os últimos valores
-            last_saldo = df['agressao_saldo'].iloc[-1] if not df.empty else 0
-            last_saldo_ma5 = df['agressao_saldo_ma5'].iloc[-1] if not df.empty else 0
-            last_saldo_ma20 = df['agressao_saldo_ma20'].iloc[-1] if not df.empty else 0
-            
-            # Calcula a força da agressão
-            aggression_strength = last_saldo / max(1, abs(last_saldo_ma20))
-            
-            results["aggression_analysis"] = {
+            # Saldo de agressão atual, suas médias móveis e a força da agressão
+            results.aggression_analysis = {
                 "current_balance": last_saldo,
                 "short_term_ma": last_saldo_ma5,
                 "long_term_ma": last_saldo_ma20,
@@ -703,38 +1383,19 @@ class MarketAnalyzer:
             }
             
             # Gera sinais com base na agressão
-            if aggression_strength > order_flow_config["aggression_threshold"]:
+            if aggression_strength > aggression_threshold:
                 if last_saldo > 0:
-                    results["signals"].append({
-                        "type": "Compra", 
-                        "reason": "Forte agressão compradora", 
-                        "strength": aggression_strength
-                    })
-                    results["confidence"] = min(0.9, 0.5 + aggression_strength / 10)
+                    results.signals.append(Signal("Compra", "Forte agressão compradora", aggression_strength))
+                    results.confidence = min(0.9, 0.5 + aggression_strength / 10)
                 elif last_saldo < 0:
-                    results["signals"].append({
-                        "type": "Venda", 
-                        "reason": "Forte agressão vendedora", 
-                        "strength": -aggression_strength
-                    })
-                    results["confidence"] = min(0.9, 0.5 + abs(aggression_strength) / 10)
+                    results.signals.append(Signal("Venda", "Forte agressão vendedora", -aggression_strength))
+                    results.confidence = min(0.9, 0.5 + abs(aggression_strength) / 10)
             
             # 2. Análise de Absorção
             # Verifica se o preço não se move significativamente apesar de forte agressão
-            if len(df) >= 5:
-                # Calcula a variação de preço nos últimos períodos
-                recent_price_change = (df['ultimo'].iloc[-1] - df['ultimo'].iloc[-5]) / max(0.01, df['ultimo'].iloc[-5])
-                
-                # Calcula o volume de agressão acumulado nos últimos períodos
-                recent_aggression_volume = df['agressao_compra'].iloc[-5:].sum() + df['agressao_venda'].iloc[-5:].sum()
-                
-                # Calcula o saldo de agressão acumulado
-                recent_aggression_balance = df['agressao_saldo'].iloc[-5:].sum()
-                
-                # Determina se há absorção (alto volume de agressão com pouca variação de preço)
-                absorption_ratio = recent_aggression_volume / max(0.001, abs(recent_price_change))
-                
-                results["absorption_analysis"] = {
+            # (variação de preço, volume/saldo de agressão acumulados e razão de absorção calculados pelo kernel)
+            if n >= 5:
+                results.absorption_analysis = {
                     "recent_price_change": recent_price_change,
                     "recent_aggression_volume": recent_aggression_volume,
                     "recent_aggression_balance": recent_aggression_balance,
@@ -742,45 +1403,23 @@ class MarketAnalyzer:
                 }
                 
                 # Gera sinais com base na absorção
-                if absorption_ratio > order_flow_config["absorption_threshold"]:
+                if absorption_ratio > absorption_threshold:
                     if recent_aggression_balance > 0 and recent_price_change <= 0:
                         # Absorção de venda (agressão compradora não move o preço para cima)
-                        results["signals"].append({
-                            "type": "Venda", 
-                            "reason": "Absorção de compra detectada", 
-                            "strength": absorption_ratio / order_flow_config["absorption_threshold"]
-                        })
-                        results["confidence"] = max(results["confidence"], min(0.8, 0.4 + absorption_ratio / 20))
+                        results.signals.append(Signal("Venda", "Absorção de compra detectada", absorption_ratio / absorption_threshold))
+                        results.confidence = max(results.confidence, min(0.8, 0.4 + absorption_ratio / 20))
                     elif recent_aggression_balance < 0 and recent_price_change >= 0:
                         # Absorção de compra (agressão vendedora não move o preço para baixo)
-                        results["signals"].append({
-                            "type": "Compra", 
-                            "reason": "Absorção de venda detectada", 
-                            "strength": absorption_ratio / order_flow_config["absorption_threshold"]
-                        })
-                        results["confidence"] = max(results["confidence"], min(0.8, 0.4 + absorption_ratio / 20))
+                        results.signals.append(Signal("Compra", "Absorção de venda detectada", absorption_ratio / absorption_threshold))
+                        results.confidence = max(results.confidence, min(0.8, 0.4 + absorption_ratio / 20))
             
             # 3. Análise de Exaustão
             # Verifica se há sinais de exaustão do movimento (agressão forte seguida de reversão)
-            if len(df) >= 10:
-                # Calcula a média de agressão nos períodos anteriores
-                previous_aggression = df['agressao_saldo'].iloc[-10:-5].mean()
-                recent_aggression = df['agressao_saldo'].iloc[-5:].mean()
-                
-                # Verifica se houve mudança significativa na direção da agressão
-                aggression_direction_change = previous_aggression * recent_aggression
-                
-                # Calcula a variação de preço
-                previous_price_change = (df['ultimo'].iloc[-5] - df['ultimo'].iloc[-10]) / max(0.01, df['ultimo'].iloc[-10])
-                recent_price_change = (df['ultimo'].iloc[-1] - df['ultimo'].iloc[-5]) / max(0.01, df['ultimo'].iloc[-5])
+            # (médias de agressão, variações de preço e mudanças de direção calculadas pelo kernel)
+            if n >= 10:
+                exhaustion_detected = bool(exhaustion_detected)
                 
-                # Verifica se houve mudança na direção do preço
-                price_direction_change = previous_price_change * recent_price_change
-                
-                # Determina se há exaustão (mudança na direção da agressão e/ou preço)
-                exhaustion_detected = (aggression_direction_change < 0 or price_direction_change < 0)
-                
-                results["exhaustion_analysis"] = {
+                results.exhaustion_analysis = {
                     "previous_aggression": previous_aggression,
                     "recent_aggression": recent_aggression,
                     "aggression_direction_change": aggression_direction_change,
@@ -794,26 +1433,17 @@ class MarketAnalyzer:
                 if exhaustion_detected:
                     if previous_aggression > 0 and recent_aggression < 0:
                         # Exaustão de compra
-                        results["signals"].append({
-                            "type": "Venda", 
-                            "reason": "Exaustão de compra detectada", 
-                            "strength": abs(recent_aggression / max(0.01, previous_aggression))
-                        })
-                        results["confidence"] = max(results["confidence"], 0.75)
+                        results.signals.append(Signal("Venda", "Exaustão de compra detectada", abs(recent_aggression / max(0.01, previous_aggression))))
+                        results.confidence = max(results.confidence, 0.75)
                     elif previous_aggression < 0 and recent_aggression > 0:
                         # Exaustão de venda
-                        results["signals"].append({
-                            "type": "Compra", 
-                            "reason": "Exaustão de venda detectada", 
-                            "strength": abs(recent_aggression / max(0.01, previous_aggression))
-                        })
-                        results["confidence"] = max(results["confidence"], 0.75)
+                        results.signals.append(Signal("Compra", "Exaustão de venda detectada", abs(recent_aggression / max(0.01, previous_aggression))))
+                        results.confidence = max(results.confidence, 0.75)
             
             return results
         except Exception as e:
-            logger.error(f"Erro na análise de fluxo de ordens para {asset}: {e}")
-            logger.error(traceback.format_exc())
-            return {"valid": False, "message": f"Erro na análise: {str(e)}"}
+            logger.exception(f"Erro na análise de fluxo de ordens para {asset}: {e}")
+            return OrderFlowResult(valid=False, message=f"Erro na análise: {str(e)}")
     
     def analyze_momentum(self, df, asset, profile_config):
         """
@@ -825,68 +1455,59 @@ class MarketAnalyzer:
             profile_config (dict): Configuração específica do perfil
             
         Returns:
-            dict: Resultados da análise de momentum
+            MomentumResult: Resultados da análise de momentum
         """
         try:
-            # Validação básica de dados
-            if df is None or df.empty:
-                return {"valid": False, "message": "Dados insuficientes para análise"}
+            # Validação básica de dados (tamanho calculado uma única vez e reutilizado)
+            n = 0 if df is None else len(df)
+            if n == 0:
+                return MomentumResult(valid=False, message="Dados insuficientes para análise")
             
             # Configurações
             momentum_config = profile_config["analysis"]["momentum"]
             if not momentum_config["enabled"]:
-                return {"valid": False, "message": "Análise de momentum desativada"}
+                return MomentumResult(valid=False, message="Análise de momentum desativada")
+            signal_threshold = momentum_config["signal_threshold"]
             
             # Valida e prepara o DataFrame para análise de momentum
             valid, missing = self.validate_data_columns(df, asset, "momentum")
             if not valid:
                 # Prepara o DataFrame com colunas padrão para continuar a análise
                 df = self.prepare_dataframe(df, asset, "momentum")
-                logger.debug(f"Usando valores padrão para colunas ausentes na análise de momentum: {missing}")
+                logger.debug("Usando valores padrão para colunas ausentes na análise de momentum: %s", missing)
             
             # Resultados
-            results = {
-                "valid": True,
-                "signals": [],
-                "confidence": 0.0,
-                "trend": None,
-                "momentum_strength": 0.0,
-                "indicators": {}
-            }
+            results = MomentumResult()
             
             # Verifica se temos dados suficientes
             fast_period = momentum_config["fast_period"]
             slow_period = momentum_config["slow_period"]
             
-            if len(df) < slow_period:
-                logger.debug(f"Dados insuficientes para cálculo de médias móveis para {asset} (len={len(df)}, required={slow_period})")
-                return {"valid": False, "message": f"Dados insuficientes para cálculo de médias móveis (len={len(df)}, required={slow_period})"}
-            
-            # 1. Médias Móveis
-            # Calcula médias móveis rápida e lenta
-            df['ma_fast'] = df['ultimo'].rolling(window=fast_period).mean().fillna(df['ultimo'])
-            df['ma_slow'] = df['ultimo'].rolling(window=slow_period).mean().fillna(df['ultimo'])
+            if n < slow_period:
+                logger.debug("Dados insuficientes para cálculo de médias móveis para %s (len=%s, required=%s)", asset, n, slow_period)
+                return MomentumResult(valid=False, message=f"Dados insuficientes para cálculo de médias móveis (len={n}, required={slow_period})")
             
-            # Calcula a diferença entre as médias móveis
-            df['ma_diff'] = df['ma_fast'] - df['ma_slow']
-            df['ma_diff_pct'] = df['ma_diff'] / df['ma_slow'].replace(0, 1)  # Evita divisão por zero
+            # Médias móveis (apenas os dois últimos valores; as séries completas são calculadas somente se o
+            # gráfico for gerado) e taxas de variação calculadas pelo kernel, memoizado por ativo, último registro
+            # e períodos das médias (errstate silencia a divisão por zero no caminho sem Numba)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                last_ma_fast, last_ma_slow, prev_ma_diff, last_roc_5, last_roc_10 = self._memoized(
+                    self._kernel_cache, (asset, "momentum", fast_period, slow_period), (n, df['timestamp'].iloc[-1]),
+                    lambda: _momentum_kernel(df['ultimo'].to_numpy(dtype=np.float64), fast_period, slow_period))
             
-            # Pega os últimos valores
-            last_price = df['ultimo'].iloc[-1]
-            last_ma_fast = df['ma_fast'].iloc[-1]
-            last_ma_slow = df['ma_slow'].iloc[-1]
-            last_ma_diff = df['ma_diff'].iloc[-1]
-            last_ma_diff_pct = df['ma_diff_pct'].iloc[-1]
+            # 1. Médias Móveis
+            last_ma_diff = last_ma_fast - last_ma_slow
+            last_ma_diff_pct = last_ma_diff / (last_ma_slow if last_ma_slow != 0 else 1)  # Evita divisão por zero
             
             # Determina a tendência
             if last_ma_diff > 0:
-                results["trend"] = "Alta"
-                results["momentum_strength"] = last_ma_diff_pct
+                results.trend = "Alta"
+                results.momentum_strength = last_ma_diff_pct
             else:
-                results["trend"] = "Baixa"
-                results["momentum_strength"] = -last_ma_diff_pct
+                results.trend = "Baixa"
+                results.momentum_strength = -last_ma_diff_pct
             
-            results["indicators"]["moving_averages"] = {
+            results.indicators["moving_averages"] = {
                 "fast": last_ma_fast,
                 "slow": last_ma_slow,
                 "diff": last_ma_diff,
@@ -895,76 +1516,45 @@ class MarketAnalyzer:
             
             # 2. Cruzamentos de Médias Móveis
             # Verifica se houve cruzamento recente
-            if len(df) >= 3:
-                prev_ma_diff = df['ma_diff'].iloc[-2]
-                
+            if n >= 3:
                 # Cruzamento para cima (Golden Cross)
                 if prev_ma_diff <= 0 and last_ma_diff > 0:
-                    results["signals"].append({
-                        "type": "Compra", 
-                        "reason": "Cruzamento de médias para cima (Golden Cross)", 
-                        "strength": abs(last_ma_diff_pct) * 10
-                    })
-                    results["confidence"] = min(0.85, 0.6 + abs(last_ma_diff_pct) * 5)
+                    results.signals.append(Signal("Compra", "Cruzamento de médias para cima (Golden Cross)", abs(last_ma_diff_pct) * 10))
+                    results.confidence = min(0.85, 0.6 + abs(last_ma_diff_pct) * 5)
                 
                 # Cruzamento para baixo (Death Cross)
                 elif prev_ma_diff >= 0 and last_ma_diff < 0:
-                    results["signals"].append({
-                        "type": "Venda", 
-                        "reason": "Cruzamento de médias para baixo (Death Cross)", 
-                        "strength": abs(last_ma_diff_pct) * 10
-                    })
-                    results["confidence"] = min(0.85, 0.6 + abs(last_ma_diff_pct) * 5)
+                    results.signals.append(Signal("Venda", "Cruzamento de médias para baixo (Death Cross)", abs(last_ma_diff_pct) * 10))
+                    results.confidence = min(0.85, 0.6 + abs(last_ma_diff_pct) * 5)
             
             # 3. Momentum (Rate of Change)
-            # Calcula a taxa de variação do preço
-            if len(df) >= 5:
-                df['roc_5'] = df['ultimo'].pct_change(periods=5) * 100
-                last_roc_5 = df['roc_5'].iloc[-1] if not pd.isna(df['roc_5'].iloc[-1]) else 0
-            else:
-                last_roc_5 = 0
-            
-            if len(df) >= 10:
-                df['roc_10'] = df['ultimo'].pct_change(periods=10) * 100
-                last_roc_10 = df['roc_10'].iloc[-1] if not pd.isna(df['roc_10'].iloc[-1]) else 0
-            else:
-                last_roc_10 = 0
-            
-            results["indicators"]["rate_of_change"] = {
+            # Taxas de variação do preço calculadas pelo kernel (0 sem períodos suficientes ou se indefinidas)
+            results.indicators["rate_of_change"] = {
                 "roc_5": last_roc_5,
                 "roc_10": last_roc_10
             }
             
             # Gera sinais com base no momentum
-            if abs(last_roc_5) > momentum_config["signal_threshold"]:
+            if abs(last_roc_5) > signal_threshold:
                 if last_roc_5 > 0:
                     # Momentum positivo
-                    if results["trend"] == "Alta":
+                    if results.trend == "Alta":
                         # Confirmação de tendência
-                        results["signals"].append({
-                            "type": "Compra", 
-                            "reason": "Momentum positivo em tendência de alta", 
-                            "strength": last_roc_5 / momentum_config["signal_threshold"]
-                        })
-                        results["confidence"] = max(results["confidence"], min(0.8, 0.5 + last_roc_5 / 10))
+                        results.signals.append(Signal("Compra", "Momentum positivo em tendência de alta", last_roc_5 / signal_threshold))
+                        results.confidence = max(results.confidence, min(0.8, 0.5 + last_roc_5 / 10))
                 else:
                     # Momentum negativo
-                    if results["trend"] == "Baixa":
+                    if results.trend == "Baixa":
                         # Confirmação de tendência
-                        results["signals"].append({
-                            "type": "Venda", 
-                            "reason": "Momentum negativo em tendência de baixa", 
-                            "strength": abs(last_roc_5) / momentum_config["signal_threshold"]
-                        })
-                        results["confidence"] = max(results["confidence"], min(0.8, 0.5 + abs(last_roc_5) / 10))
+                        results.signals.append(Signal("Venda", "Momentum negativo em tendência de baixa", abs(last_roc_5) / signal_threshold))
+                        results.confidence = max(results.confidence, min(0.8, 0.5 + abs(last_roc_5) / 10))
             
             return results
         except Exception as e:
-            logger.error(f"Erro na análise de momentum para {asset}: {e}")
-            logger.error(traceback.format_exc())
-            return {"valid": False, "message": f"Erro na análise: {str(e)}"}
+            logger.exception(f"Erro na análise de momentum para {asset}: {e}")
+            return MomentumResult(valid=False, message=f"Erro na análise: {str(e)}")
     
-    def generate_trading_signal(self, asset, analysis_results, profile_name, profile_config):
+    def generate_trading_signal(self, asset, analysis_results, profile_name, profile_config, *, last_price):
         """
         Gera sinais de trading com base nos resultados das análises
         
@@ -973,6 +1563,7 @@ class MarketAnalyzer:
             analysis_results (dict): Resultados das análises
             profile_name (str): Nome do perfil de estratégia
             profile_config (dict): Configuração específica do perfil
+            last_price (float): Último preço dos dados analisados (informado por quem chama, sem nova leitura do banco)
             
         Returns:
             dict: Sinal de trading ou None se não houver sinal
@@ -980,101 +1571,86 @@ class MarketAnalyzer:
         try:
             # Configurações
             signal_config = profile_config["signals"]
-            asset_config = profile_config["assets"].get(asset, {})
             
             # Verifica se o ativo está habilitado
-            if not asset_config.get("enabled", False):
+            if asset not in self._get_enabled_assets(profile_name):
                 return None
             
             # Verifica se já enviamos um sinal recentemente para este ativo e perfil
-            now = datetime.now()
+            now_ns = time.monotonic_ns()
             signal_key = f"{asset}_{profile_name}"
-            last_signal_time = self.last_signal_time.get(signal_key)
-            signal_interval = profile_config["analysis"]["signal_interval"]
+            last_signal_time_ns = self.last_signal_time_ns.get(signal_key)
+            signal_interval_ns = int(profile_config["analysis"]["signal_interval"] * 1_000_000_000)
             
-            if last_signal_time and (now - last_signal_time).total_seconds() < signal_interval:
-                logger.debug(f"Sinal para {asset} (perfil {profile_name}) ignorado: intervalo mínimo não atingido")
+            if last_signal_time_ns is not None and now_ns - last_signal_time_ns < signal_interval_ns:
+                logger.debug("Sinal para %s (perfil %s) ignorado: intervalo mínimo não atingido", asset, profile_name)
                 return None
             
             # Extrai sinais de cada análise
-            wyckoff_signals = analysis_results.get("wyckoff", {}).get("signals", [])
-            order_flow_signals = analysis_results.get("order_flow", {}).get("signals", [])
-            momentum_signals = analysis_results.get("momentum", {}).get("signals", [])
-            
-            # Combina todos os sinais
-            all_signals = wyckoff_signals + order_flow_signals + momentum_signals
-            
-            if not all_signals:
-                return None
-            
-            # Conta sinais de compra e venda
-            buy_signals = [s for s in all_signals if s.get("type") == "Compra"]
-            sell_signals = [s for s in all_signals if s.get("type") == "Venda"]
-            
-            # Determina o tipo de sinal predominante
-            signal_type = "Compra" if len(buy_signals) > len(sell_signals) else "Venda"
-            
-            # Filtra sinais do tipo predominante
-            filtered_signals = buy_signals if signal_type == "Compra" else sell_signals
+            strategy_signals = {
+                strategy: analysis_results[strategy].signals
+                for strategy in self._strategies
+            }
             
-            if not filtered_signals:
+            # Conta os sinais de compra e venda, soma as confianças, coleta os motivos e conta as estratégias
+            # com sinais de cada tipo em uma única passada
+            buy_n = sell_n = 0
+            buy_conf = sell_conf = 0.0
+            buy_reasons = []
+            sell_reasons = []
+            buy_strategies = sell_strategies = 0
+            for signals in strategy_signals.values():
+                strategy_buy_n, strategy_sell_n = buy_n, sell_n
+                for s in signals:
+                    signal_kind = s.type
+                    if signal_kind == "Compra":
+                        buy_n += 1
+                        buy_conf += s.confidence
+                        if s.reason:
+                            buy_reasons.append(s.reason)
+                    elif signal_kind == "Venda":
+                        sell_n += 1
+                        sell_conf += s.confidence
+                        if s.reason:
+                            sell_reasons.append(s.reason)
+                buy_strategies += buy_n > strategy_buy_n
+                sell_strategies += sell_n > strategy_sell_n
+            
+            if not buy_n and not sell_n:
                 return None
             
-            # Calcula a confiança média dos sinais
-            confidence = sum(s.get("confidence", 0) for s in filtered_signals) / len(filtered_signals) if filtered_signals else 0
+            # Determina o tipo de sinal predominante e calcula a confiança média dos seus sinais
+            if buy_n > sell_n:
+                signal_type, confidence, reasons, strategies_with_signals = "Compra", buy_conf / buy_n, buy_reasons, buy_strategies
+            else:
+                signal_type, confidence, reasons, strategies_with_signals = "Venda", sell_conf / sell_n, sell_reasons, sell_strategies
             
             # Considera também a confiança das análises individuais
-            if "wyckoff" in analysis_results and analysis_results["wyckoff"].get("valid", False):
-                confidence = max(confidence, analysis_results["wyckoff"].get("confidence", 0))
-            if "order_flow" in analysis_results and analysis_results["order_flow"].get("valid", False):
-                confidence = max(confidence, analysis_results["order_flow"].get("confidence", 0))
-            if "momentum" in analysis_results and analysis_results["momentum"].get("valid", False):
-                confidence = max(confidence, analysis_results["momentum"].get("confidence", 0))
+            for strategy in self._strategies:
+                strategy_results = analysis_results[strategy]
+                if strategy_results.valid:
+                    confidence = max(confidence, strategy_results.confidence)
             
             # Verifica se a confiança é suficiente
             if confidence < signal_config["min_confidence"]:
-                logger.debug(f"Sinal para {asset} (perfil {profile_name}) ignorado: confiança insuficiente ({confidence:.2f} < {signal_config['min_confidence']:.2f})")
+                logger.debug("Sinal para %s (perfil %s) ignorado: confiança insuficiente (%.2f < %.2f)", asset, profile_name, confidence, signal_config['min_confidence'])
                 return None
             
             # Verifica se requer confirmação de múltiplas estratégias
             if signal_config["confirmation_required"]:
-                # Conta quantas estratégias diferentes geraram sinais do mesmo tipo
-                strategies_with_signals = 0
-                if any(s.get("type") == signal_type for s in wyckoff_signals):
-                    strategies_with_signals += 1
-                if any(s.get("type") == signal_type for s in order_flow_signals):
-                    strategies_with_signals += 1
-                if any(s.get("type") == signal_type for s in momentum_signals):
-                    strategies_with_signals += 1
-                
-                # Requer pelo menos 2 estratégias diferentes
+                # Requer pelo menos 2 estratégias diferentes com sinais do mesmo tipo
                 if strategies_with_signals < 2:
-                    logger.debug(f"Sinal para {asset} (perfil {profile_name}) ignorado: confirmação insuficiente ({strategies_with_signals} < 2)")
+                    logger.debug("Sinal para %s (perfil %s) ignorado: confirmação insuficiente (%s < 2)", asset, profile_name, strategies_with_signals)
                     return None
             
             # Determina níveis de entrada, stop e alvo
-            last_price = self.market_data.get(asset, {}).get("ultimo")
             if not last_price:
-                # Tenta obter o último preço dos resultados da análise
-                if "wyckoff" in analysis_results and analysis_results["wyckoff"].get("valid", False):
-                    support_level = analysis_results["wyckoff"].get("support_level")
-                    resistance_level = analysis_results["wyckoff"].get("resistance_level")
-                else:
-                    # Valores padrão se não houver análise de Wyckoff
-                    support_level = None
-                    resistance_level = None
-                
-                # Tenta obter o último preço do DataFrame original
-                df = self.get_latest_data(asset, limit=1)
-                if df is not None and not df.empty:
-                    last_price = df['ultimo'].iloc[-1]
-                else:
-                    logger.error(f"Não foi possível determinar o último preço para {asset}")
-                    return None
-            else:
-                # Obtém níveis de suporte e resistência da análise de Wyckoff
-                support_level = analysis_results.get("wyckoff", {}).get("support_level")
-                resistance_level = analysis_results.get("wyckoff", {}).get("resistance_level")
+                logger.error(f"Não foi possível determinar o último preço para {asset}")
+                return None
+            
+            # Obtém níveis de suporte e resistência da análise de Wyckoff (None se a análise não é válida)
+            support_level = analysis_results["wyckoff"].support_level
+            resistance_level = analysis_results["wyckoff"].resistance_level
             
             # Define níveis com base no tipo de sinal
             if signal_type == "Compra":
@@ -1093,11 +1669,12 @@ class MarketAnalyzer:
             
             # Verifica se a relação risco/recompensa é suficiente
             if risk_reward_ratio < signal_config["risk_reward_min"]:
-                logger.debug(f"Sinal para {asset} (perfil {profile_name}) ignorado: relação risco/recompensa insuficiente ({risk_reward_ratio:.2f} < {signal_config['risk_reward_min']:.2f})")
+                logger.debug("Sinal para %s (perfil %s) ignorado: relação risco/recompensa insuficiente (%.2f < %.2f)", asset, profile_name, risk_reward_ratio, signal_config['risk_reward_min'])
                 return None
             
             # Atualiza o timestamp do último sinal
-            self.last_signal_time[signal_key] = now
+            self.last_signal_time_ns[signal_key] = now_ns
+            now = datetime.now()
             
             # Cria o sinal de trading
             trading_signal = {
@@ -1109,11 +1686,10 @@ class MarketAnalyzer:
                 "confidence": confidence,
                 "risk_reward_ratio": risk_reward_ratio,
                 "timestamp": now.isoformat(),
-                "reasons": [s.get("reason") for s in filtered_signals if "reason" in s],
+                "reasons": reasons,
                 "analysis": {
-                    "wyckoff": analysis_results.get("wyckoff", {}).get("valid", False),
-                    "order_flow": analysis_results.get("order_flow", {}).get("valid", False),
-                    "momentum": analysis_results.get("momentum", {}).get("valid", False)
+                    strategy: analysis_results[strategy].valid
+                    for strategy in self._strategies
                 },
                 "strategy_profile": profile_name
             }
@@ -1124,8 +1700,7 @@ class MarketAnalyzer:
             
             return trading_signal
         except Exception as e:
-            logger.error(f"Erro ao gerar sinal de trading para {asset} (perfil {profile_name}): {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao gerar sinal de trading para {asset} (perfil {profile_name}): {e}")
             return None
     
     def send_signal_to_executor(self, signal):
@@ -1143,7 +1718,7 @@ class MarketAnalyzer:
                 return False
             
             # Verifica se o executor MT5 está habilitado
-            if not self.config["mt5_executor"]["enabled"]:
+            if not self.cfg.executor_enabled:
                 logger.info(f"Executor MT5 desabilitado, sinal não enviado: {signal}")
                 return False
             
@@ -1152,36 +1727,147 @@ class MarketAnalyzer:
             if profile_name in self.signals_history:
                 self.signals_history[profile_name].append(signal)
             
-            # Salva o sinal em arquivo JSON
-            signal_file = self.config["mt5_executor"]["signal_file"]
+            # Com a thread de gravação ativa, apenas enfileira o sinal (a gravação sai do loop de análise);
+            # sem ela (uso direto, fora de start()), grava imediatamente
+            if self._signal_writer is not None and self._signal_writer.is_alive():
+                self.signal_queue.put(signal)
+                return True
+            return self._write_signals([signal])
+        except Exception as e:
+            logger.exception(f"Erro ao enviar sinal para o executor MT5: {e}")
+            return False
+    
+    def _write_signals(self, signals):
+        """
+        Acrescenta um lote de sinais ao arquivo de sinais do executor em uma única abertura do arquivo
+        
+        Args:
+            signals (list): Sinais de trading
             
-            # Lê sinais existentes, se houver
-            existing_signals = []
-            if os.path.exists(signal_file):
-                try:
-                    with open(signal_file, 'r', encoding='utf-8') as f:
-                        existing_signals = json.load(f)
-                except Exception as e:
-                    logger.error(f"Erro ao ler arquivo de sinais existente: {e}")
-                    existing_signals = []
+        Returns:
+            bool: True se os sinais foram gravados, False caso contrário
+        """
+        try:
+            signal_file = self.cfg.signal_file
+            if not self._signal_file_checked:
+                # Sem a conversão, as linhas seriam acrescentadas a uma lista JSON: não grava e tenta no próximo lote
+                if not self._convert_signal_file_to_ndjson(signal_file):
+                    return False
+                self._signal_file_checked = True
+            
+            # Acrescenta os sinais como linhas JSON (NDJSON), sem reler nem regravar os sinais anteriores
+            with open(signal_file, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(signal) + "\n" for signal in signals)
+            
+            for signal in signals:
+                logger.info(f"Sinal de trading enviado para o executor MT5: {signal}")
+            return True
+        except Exception as e:
+            logger.exception(f"Erro ao gravar sinais para o executor MT5: {e}")
+            return False
+    
+    def _drain_signal_queue(self, first_timeout=None, max_batch=32):
+        """
+        Retira da fila um lote de até max_batch sinais e o grava no arquivo de sinais
+        
+        Args:
+            first_timeout (float, optional): Tempo máximo de espera pelo primeiro sinal. Se None, não espera.
+            max_batch (int): Quantidade máxima de sinais por lote
+            
+        Returns:
+            int: Quantidade de sinais gravados no lote
+        """
+        batch = []
+        try:
+            if first_timeout is not None:
+                batch.append(self.signal_queue.get(timeout=first_timeout))
+            while len(batch) < max_batch:
+                batch.append(self.signal_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if batch:
+            self._write_signals(batch)
+        return len(batch)
+    
+    def _signal_writer_loop(self):
+        """
+        Loop da thread de gravação: grava os sinais enfileirados em lotes (até 32 sinais ou 100 ms de espera)
+        """
+        while not self.stop_event.is_set():
+            self._drain_signal_queue(first_timeout=0.1)
+    
+    def _convert_signal_file_to_ndjson(self, signal_file):
+        """
+        Converte um arquivo de sinais no formato antigo (lista JSON) para NDJSON (um sinal por linha),
+        para que os novos sinais possam ser apenas acrescentados ao final
+        
+        Args:
+            signal_file (str): Caminho do arquivo de sinais
             
-            # Adiciona o novo sinal
-            existing_signals.append(signal)
+        Returns:
+            bool: True se o arquivo já pode receber linhas NDJSON (convertido, já no novo formato ou inexistente),
+                False se a conversão falhou e deve ser tentada novamente
+        """
+        try:
+            if not os.path.exists(signal_file):
+                return True
             
-            # Salva o arquivo atualizado
-            with open(signal_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_signals, f, indent=4)
+            with open(signal_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if not content.lstrip().startswith('['):
+                return True
             
-            logger.info(f"Sinal de trading enviado para o executor MT5: {signal}")
+            try:
+                existing_signals = json.loads(content)
+                if not isinstance(existing_signals, list):
+                    raise ValueError("esperado uma lista JSON")
+            except ValueError as e:
+                # Lista antiga ilegível (ex.: gravação interrompida): preserva o arquivo ao lado e começa
+                # um arquivo NDJSON novo (acrescentar linhas após o '[' deixaria o arquivo ilegível para o executor)
+                backup_file = f"{signal_file}.bak"
+                os.replace(signal_file, backup_file)
+                logger.warning(f"Arquivo de sinais antigo ilegível ({e}), movido para {backup_file}")
+                return True
+            
+            # Grava em um arquivo temporário e substitui o original de uma vez, sem truncar
+            # o arquivo que o executor pode estar lendo
+            tmp_file = f"{signal_file}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.writelines(json.dumps(existing_signal) + "\n" for existing_signal in existing_signals)
+                os.replace(tmp_file, signal_file)
+            finally:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+            logger.info(f"Arquivo de sinais convertido para NDJSON: {signal_file} ({len(existing_signals)} sinais)")
             return True
         except Exception as e:
-            logger.error(f"Erro ao enviar sinal para o executor MT5: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao converter arquivo de sinais existente: {e}")
             return False
     
+    def _may_chart(self, asset, profile_name, now_ns=None):
+        """
+        Verifica, sem registrar, se o intervalo de gráficos do ativo e perfil já passou
+        
+        Args:
+            asset (str): Nome do ativo
+            profile_name (str): Nome do perfil de estratégia
+            now_ns (int, optional): Momento de referência em nanossegundos de time.monotonic_ns().
+                Se None, usa o valor atual do relógio monotônico.
+            
+        Returns:
+            bool: True se um gráfico pode ser gerado, False caso contrário
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        last_chart_time_ns = self.last_chart_time_ns.get(f"{asset}_{profile_name}")
+        return last_chart_time_ns is None or now_ns - last_chart_time_ns >= self._chart_interval_ns
+    
     def should_generate_chart(self, asset, profile_name):
         """
-        Verifica se deve gerar um gráfico para o ativo e perfil
+        Verifica se deve gerar um gráfico para o ativo e perfil e, em caso positivo,
+        registra o horário da geração
         
         Args:
             asset (str): Nome do ativo
@@ -1190,17 +1876,37 @@ class MarketAnalyzer:
         Returns:
             bool: True se deve gerar gráfico, False caso contrário
         """
-        now = datetime.now()
-        chart_key = f"{asset}_{profile_name}"
-        last_chart_time = self.last_chart_time.get(chart_key)
-        chart_interval = self.config["analysis"]["chart_interval"]
-        
-        if not last_chart_time or (now - last_chart_time).total_seconds() >= chart_interval:
-            self.last_chart_time[chart_key] = now
+        now_ns = time.monotonic_ns()
+        if self._may_chart(asset, profile_name, now_ns):
+            self.last_chart_time_ns[f"{asset}_{profile_name}"] = now_ns
             return True
         
         return False
     
+    def _get_chart_figure(self, asset, profile_name):
+        """
+        Obtém a figura de gráficos do ativo e perfil, criando-a na primeira chamada
+        e limpando os eixos nas seguintes (evita recriar figura, layout e fontes a cada gráfico)
+        
+        Args:
+            asset (str): Nome do ativo
+            profile_name (str): Nome do perfil de estratégia
+            
+        Returns:
+            tuple: (Figure, tuple de Axes, tuple de DateFormatter) - um formatador por eixo
+        """
+        key = f"{asset}_{profile_name}"
+        cached = self._fig_cache.get(key)
+        if cached is None:
+            # Layout restrito: o ajuste é feito durante o próprio desenho ao salvar, sem um tight_layout a cada gráfico
+            fig, axes = plt.subplots(3, 1, figsize=(12, 10), gridspec_kw={'height_ratios': [3, 1, 1]}, layout='constrained')
+            cached = (fig, tuple(axes), tuple(DateFormatter('%H:%M') for _ in axes))
+            self._fig_cache[key] = cached
+        else:
+            for ax in cached[1]:
+                ax.clear()
+        return cached
+    
     def generate_analysis_chart(self, df, asset, analysis_results, profile_name):
         """
         Gera gráfico de análise para o ativo
@@ -1216,32 +1922,71 @@ class MarketAnalyzer:
         """
         try:
             if df is None or df.empty:
-                logger.warning(f"DataFrame vazio ou None para geração de gráfico de {asset} (perfil {profile_name})")
+                logger.warning("DataFrame vazio ou None para geração de gráfico de %s (perfil %s)", asset, profile_name)
                 return None
             
             # Verifica se deve gerar gráfico
             if not self.should_generate_chart(asset, profile_name):
                 return None
             
-            # Cria figura e eixos
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10), gridspec_kw={'height_ratios': [3, 1, 1]})
+            return self._render_analysis_chart(df, asset, analysis_results, profile_name, self._chart_file_path(asset, profile_name))
+        except Exception as e:
+            logger.exception(f"Erro ao gerar gráfico de análise para {asset} (perfil {profile_name}): {e}")
+            return None
+    
+    def _chart_file_path(self, asset, profile_name):
+        """
+        Monta o caminho do arquivo de gráfico para o ativo e perfil no momento atual
+        
+        Args:
+            asset (str): Nome do ativo
+            profile_name (str): Nome do perfil de estratégia
+            
+        Returns:
+            str: Caminho do arquivo de gráfico
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.charts_dir, f"{asset}_{profile_name}_{timestamp}.png")
+    
+    def _render_analysis_chart(self, df, asset, analysis_results, profile_name, chart_file):
+        """
+        Desenha e salva o gráfico de análise, sem verificar o intervalo entre gráficos
+        (executado pelo worker de gráficos ou diretamente por generate_analysis_chart)
+        
+        Args:
+            df (pd.DataFrame): DataFrame com os dados do ativo
+            asset (str): Nome do ativo
+            analysis_results (dict): Resultados das análises
+            profile_name (str): Nome do perfil de estratégia
+            chart_file (str): Caminho do arquivo de gráfico a gravar
+            
+        Returns:
+            str: Caminho do arquivo de gráfico gerado ou None em caso de erro
+        """
+        try:
+            # Obtém a figura reutilizada (eixos limpos) e os formatadores de data
+            fig, (ax1, ax2, ax3), (date_format1, date_format2, date_format3) = self._get_chart_figure(asset, profile_name)
             
-            # Configura o formato da data
-            date_format = DateFormatter('%H:%M')
+            # Eixo de tempo e preços como arrays NumPy (o matplotlib não precisa passar pela indexação do pandas)
+            timestamps = df['timestamp'].to_numpy()
+            close = df['ultimo'].to_numpy()
             
             # Gráfico de preço
-            ax1.plot(df['timestamp'], df['ultimo'], label='Preço', color='black')
+            ax1.plot(timestamps, close, label='Preço', color='black')
             
-            # Adiciona médias móveis se disponíveis
-            if 'ma_fast' in df.columns and 'ma_slow' in df.columns:
-                ax1.plot(df['timestamp'], df['ma_fast'], label=f'MM Rápida (5)', color='blue', alpha=0.7)
-                ax1.plot(df['timestamp'], df['ma_slow'], label=f'MM Lenta (20)', color='red', alpha=0.7)
+            # Adiciona médias móveis se a análise de momentum as calculou (séries completas só para o gráfico)
+            if analysis_results["momentum"].valid:
+                momentum_config = self._get_profile_config(profile_name)["analysis"]["momentum"]
+                ma_fast = df['ultimo'].rolling(window=momentum_config["fast_period"]).mean().fillna(df['ultimo'])
+                ma_slow = df['ultimo'].rolling(window=momentum_config["slow_period"]).mean().fillna(df['ultimo'])
+                ax1.plot(timestamps, ma_fast.to_numpy(), label=f'MM Rápida (5)', color='blue', alpha=0.7)
+                ax1.plot(timestamps, ma_slow.to_numpy(), label=f'MM Lenta (20)', color='red', alpha=0.7)
             
             # Adiciona níveis de suporte e resistência se disponíveis
-            wyckoff_results = analysis_results.get("wyckoff", {})
-            if wyckoff_results.get("valid", False):
-                support_level = wyckoff_results.get("support_level")
-                resistance_level = wyckoff_results.get("resistance_level")
+            wyckoff_results = analysis_results["wyckoff"]
+            if wyckoff_results.valid:
+                support_level = wyckoff_results.support_level
+                resistance_level = wyckoff_results.resistance_level
                 
                 if support_level:
                     ax1.axhline(y=support_level, color='green', linestyle='--', alpha=0.7, label='Suporte')
@@ -1252,7 +1997,7 @@ class MarketAnalyzer:
             # Adiciona sinais de trading
             trading_signal = analysis_results.get("trading_signal")
             if trading_signal:
-                signal_time = df['timestamp'].iloc[-1]
+                signal_time = timestamps[-1]
                 
                 if trading_signal["type"] == "Compra":
                     ax1.scatter(signal_time, trading_signal["entry_price"], marker='^', color='green', s=100, label='Sinal de Compra')
@@ -1268,14 +2013,14 @@ class MarketAnalyzer:
             ax1.set_ylabel('Preço')
             ax1.legend(loc='upper left')
             ax1.grid(True, alpha=0.3)
-            ax1.xaxis.set_major_formatter(date_format)
+            ax1.xaxis.set_major_formatter(date_format1)
             
             # Gráfico de volume se disponível
             if 'volume' in df.columns:
-                ax2.bar(df['timestamp'], df['volume'], color='blue', alpha=0.5, label='Volume')
+                ax2.bar(timestamps, df['volume'].to_numpy(), color='blue', alpha=0.5, label='Volume')
                 ax2.set_ylabel('Volume')
                 ax2.grid(True, alpha=0.3)
-                ax2.xaxis.set_major_formatter(date_format)
+                ax2.xaxis.set_major_formatter(date_format2)
                 ax2.legend(loc='upper left')
             else:
                 ax2.text(0.5, 0.5, 'Dados de volume não disponíveis', horizontalalignment='center', verticalalignment='center', transform=ax2.transAxes)
@@ -1285,48 +2030,44 @@ class MarketAnalyzer:
             # Gráfico de agressão se disponível
             if 'agressao_saldo' in df.columns:
                 # Cria barras coloridas com base no sinal (positivo/negativo)
-                colors = ['green' if x > 0 else 'red' for x in df['agressao_saldo']]
-                ax3.bar(df['timestamp'], df['agressao_saldo'], color=colors, alpha=0.7, label='Saldo de Agressão')
+                balance = df['agressao_saldo'].to_numpy(dtype=np.float64)
+                colors = np.where(balance > 0, 'green', 'red')
+                ax3.bar(timestamps, balance, color=colors, alpha=0.7, label='Saldo de Agressão')
                 
-                # Adiciona linha de média móvel do saldo de agressão
-                if 'agressao_saldo_ma5' in df.columns:
-                    ax3.plot(df['timestamp'], df['agressao_saldo_ma5'], color='blue', label='MM Agressão (5)')
+                # Adiciona linha de média móvel do saldo de agressão (série completa calculada só para o gráfico)
+                balance_ma5 = _rolling_mean(balance, 5) if len(balance) >= 5 else balance
+                ax3.plot(timestamps, balance_ma5, color='blue', label='MM Agressão (5)')
                 
                 ax3.set_ylabel('Agressão')
                 ax3.grid(True, alpha=0.3)
-                ax3.xaxis.set_major_formatter(date_format)
+                ax3.xaxis.set_major_formatter(date_format3)
                 ax3.legend(loc='upper left')
             else:
                 ax3.text(0.5, 0.5, 'Dados de agressão não disponíveis', horizontalalignment='center', verticalalignment='center', transform=ax3.transAxes)
                 ax3.set_ylabel('Agressão')
                 ax3.grid(False)
             
-            # Ajusta o layout
-            plt.tight_layout()
-            
             # Salva o gráfico
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            chart_file = os.path.join(self.charts_dir, f"{asset}_{profile_name}_{timestamp}.png")
-            plt.savefig(chart_file, dpi=150)
-            plt.close(fig)
+            fig.savefig(chart_file, dpi=self._chart_dpi, pil_kwargs=self._chart_pil_kwargs)
             
             logger.info(f"Gráfico de análise gerado: {chart_file}")
             return chart_file
         except Exception as e:
-            logger.error(f"Erro ao gerar gráfico de análise para {asset} (perfil {profile_name}): {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao gerar gráfico de análise para {asset} (perfil {profile_name}): {e}")
             return None
     
-    def analyze_asset_with_profile(self, asset, profile_name):
+    def compute_asset_analysis(self, asset, profile_name, df=None):
         """
-        Realiza análise completa de um ativo com um perfil específico
+        Executa as análises (Wyckoff, fluxo de ordens e momentum) de um ativo com um perfil específico,
+        sem gerar sinal, gráfico ou envio ao executor - pode rodar em paralelo para ativos diferentes
         
         Args:
             asset (str): Nome do ativo
             profile_name (str): Nome do perfil de estratégia
+            df (pd.DataFrame, optional): Dados já carregados. Se None, busca no banco de dados.
             
         Returns:
-            dict: Resultados da análise
+            tuple: (dict, pd.DataFrame) - Resultados das análises e dados analisados (None se a análise não foi realizada)
         """
         try:
             # Obtém configuração específica do perfil
@@ -1334,32 +2075,43 @@ class MarketAnalyzer:
             
             # Verifica se o perfil está habilitado
             if not profile_config["strategy_profiles"].get(profile_name, {}).get("enabled", False):
-                logger.debug(f"Perfil {profile_name} desabilitado para {asset}")
-                return {"valid": False, "message": f"Perfil {profile_name} desabilitado"}
+                logger.debug("Perfil %s desabilitado para %s", profile_name, asset)
+                return {"valid": False, "message": f"Perfil {profile_name} desabilitado"}, None
             
             # Obtém os dados mais recentes
-            df = self.get_latest_data(asset)
-            if df is None or df.empty:
-                logger.warning(f"Sem dados para análise de {asset} (perfil {profile_name})")
-                return {"valid": False, "message": "Sem dados para análise"}
+            if df is None:
+                df = self.get_latest_data(asset)
+            n = 0 if df is None else len(df)
+            if n == 0:
+                logger.warning("Sem dados para análise de %s (perfil %s)", asset, profile_name)
+                return {"valid": False, "message": "Sem dados para análise"}, None
             
             # Verifica se há dados suficientes para análise
-            min_data_points = self.config.get("data_validation", {}).get("min_data_points", 10)
-            if len(df) < min_data_points:
-                logger.warning(f"Dados insuficientes para análise de {asset} (perfil {profile_name}): {len(df)} < {min_data_points}")
-                return {"valid": False, "message": f"Dados insuficientes para análise: {len(df)} < {min_data_points}"}
+            min_data_points = self._min_data_points
+            if n < min_data_points:
+                logger.warning("Dados insuficientes para análise de %s (perfil %s): %s < %s", asset, profile_name, n, min_data_points)
+                return {"valid": False, "message": f"Dados insuficientes para análise: {n} < {min_data_points}"}, None
             
             # Armazena os últimos dados para referência
-            if not df.empty:
-                self.market_data[asset] = {
-                    "ultimo": df['ultimo'].iloc[-1],
-                    "timestamp": df['timestamp'].iloc[-1].isoformat()
-                }
+            last_timestamp = df['timestamp'].iloc[-1]
+            self.market_data[asset] = {
+                "ultimo": df['ultimo'].iloc[-1],
+                "timestamp": last_timestamp.isoformat()
+            }
             
-            # Realiza as análises
-            wyckoff_results = self.analyze_wyckoff(df, asset, profile_config)
-            order_flow_results = self.analyze_order_flow(df, asset, profile_config)
-            momentum_results = self.analyze_momentum(df, asset, profile_config)
+            # Realiza as análises, reaproveitando o resultado quando os dados e a configuração da análise
+            # no perfil não mudaram (ex.: ciclos de polling sem registros novos)
+            stamp = (n, last_timestamp)
+            analysis_config = profile_config["analysis"]
+            wyckoff_results = self._memoized(
+                self._analysis_cache, (asset, "wyckoff", frozenset(analysis_config["wyckoff"].items())), stamp,
+                lambda: self.analyze_wyckoff(df, asset, profile_config))
+            order_flow_results = self._memoized(
+                self._analysis_cache, (asset, "order_flow", frozenset(analysis_config["order_flow"].items())), stamp,
+                lambda: self.analyze_order_flow(df, asset, profile_config))
+            momentum_results = self._memoized(
+                self._analysis_cache, (asset, "momentum", frozenset(analysis_config["momentum"].items())), stamp,
+                lambda: self.analyze_momentum(df, asset, profile_config))
             
             # Combina os resultados
             analysis_results = {
@@ -1371,13 +2123,40 @@ class MarketAnalyzer:
                 "momentum": momentum_results
             }
             
+            return analysis_results, df
+        except Exception as e:
+            logger.exception(f"Erro na análise de {asset} com perfil {profile_name}: {e}")
+            return {"valid": False, "message": f"Erro na análise: {str(e)}"}, None
+    
+    def finalize_asset_analysis(self, asset, profile_name, analysis_results, df):
+        """
+        Gera o sinal de trading, o gráfico e o envio ao executor a partir das análises já realizadas
+        (deve rodar na thread principal: matplotlib e o arquivo de sinais não são compartilháveis entre threads)
+        
+        Args:
+            asset (str): Nome do ativo
+            profile_name (str): Nome do perfil de estratégia
+            analysis_results (dict): Resultados de compute_asset_analysis
+            df (pd.DataFrame): Dados analisados
+            
+        Returns:
+            dict: Resultados da análise
+        """
+        try:
+            profile_config = self._get_profile_config(profile_name)
+            
             # Gera sinal de trading
-            trading_signal = self.generate_trading_signal(asset, analysis_results, profile_name, profile_config)
+            trading_signal = self.generate_trading_signal(asset, analysis_results, profile_name, profile_config, last_price=df['ultimo'].iloc[-1])
             analysis_results["trading_signal"] = trading_signal
             
-            # Gera gráfico de análise apenas se houver sinal ou periodicamente
-            if trading_signal or self.should_generate_chart(asset, profile_name):
-                chart_file = self.generate_analysis_chart(df, asset, analysis_results, profile_name)
+            # Gera gráfico de análise apenas quando há sinal (ciclos sem sinal não fazem nenhum trabalho de
+            # matplotlib), respeitando o intervalo mínimo por ativo/perfil. A renderização é enviada ao worker
+            # de gráficos (com cópias rasas dos dados e resultados); o caminho do arquivo já é conhecido aqui
+            if trading_signal:
+                chart_file = None
+                if self.should_generate_chart(asset, profile_name):
+                    chart_file = self._chart_file_path(asset, profile_name)
+                    self._chart_pool.submit(self._render_analysis_chart, df.copy(deep=False), asset, dict(analysis_results), profile_name, chart_file)
                 analysis_results["chart_file"] = chart_file
             
             # Envia sinal para o executor, se houver
@@ -1386,10 +2165,26 @@ class MarketAnalyzer:
             
             return analysis_results
         except Exception as e:
-            logger.error(f"Erro na análise de {asset} com perfil {profile_name}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro na análise de {asset} com perfil {profile_name}: {e}")
             return {"valid": False, "message": f"Erro na análise: {str(e)}"}
     
+    def analyze_asset_with_profile(self, asset, profile_name, df=None):
+        """
+        Realiza análise completa de um ativo com um perfil específico
+        
+        Args:
+            asset (str): Nome do ativo
+            profile_name (str): Nome do perfil de estratégia
+            df (pd.DataFrame, optional): Dados já carregados. Se None, busca no banco de dados.
+            
+        Returns:
+            dict: Resultados da análise
+        """
+        analysis_results, df = self.compute_asset_analysis(asset, profile_name, df)
+        if df is None:
+            return analysis_results
+        return self.finalize_asset_analysis(asset, profile_name, analysis_results, df)
+    
     def start(self):
         """
         Inicia o analisador de mercado
@@ -1431,18 +2226,84 @@ class MarketAnalyzer:
         
         logger.info(f"Ativos habilitados: {', '.join(enabled_assets)}")
         
+        # Pool para analisar os ativos em paralelo (não há dependência entre ativos)
+        self._pool = ThreadPoolExecutor(max_workers=len(enabled_assets), thread_name_prefix="Analysis")
+        
+        # Inicia a thread de pré-carga dos dados, que sobrepõe a leitura do banco com a análise
+        prefetch_thread = threading.Thread(target=self._prefetch_loop, name="DataPrefetch", daemon=True)
+        prefetch_thread.start()
+        self.threads.append(prefetch_thread)
+        
+        # Inicia a thread de gravação dos sinais para o executor
+        self._signal_writer = threading.Thread(target=self._signal_writer_loop, name="SignalWriter", daemon=True)
+        self._signal_writer.start()
+        self.threads.append(self._signal_writer)
+        
         # Verifica se as tabelas necessárias existem no banco de dados
-        if self.db_conn:
-            cursor = self.db_conn.cursor()
-            for asset in enabled_assets:
-                table_name = f"{self.config['database']['table_prefix']}_{asset}"
-                cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-                if not cursor.fetchone():
-                    logger.warning(f"Tabela {table_name} não encontrada no banco de dados. O ativo {asset} pode não funcionar corretamente.")
+        for asset in enabled_assets:
+            table_name = f"{self.config['database']['table_prefix']}_{asset}"
+            if table_name not in self._known_tables:
+                logger.warning("Tabela %s não encontrada no banco de dados. O ativo %s pode não funcionar corretamente.", table_name, asset)
         
         logger.info("Market Analyzer iniciado com sucesso")
         return True
     
+    def is_within_trading_hours(self, asset_config, now=None):
+        """
+        Verifica se o horário atual está dentro do horário de trading do ativo
+        
+        Args:
+            asset_config (dict): Configuração do ativo
+            now (time, optional): Hora atual, já obtida pelo chamador para todo o ciclo de polling
+            
+        Returns:
+            tuple: (bool, time, time, time) - Se está no horário, hora atual, início e fim
+        """
+        if now is None:
+            now = datetime.now().time()
+        parsed = asset_config.get("_trading_hours_parsed")
+        start_time, end_time = parsed if parsed is not None else self._parse_trading_hours(asset_config)
+        return start_time <= now <= end_time, now, start_time, end_time
+    
+    def _prefetch_loop(self):
+        """
+        Thread de pré-carga: lê os dados de cada ativo habilitado com a conexão própria
+        da thread e os coloca na fila de análise
+        """
+        try:
+            while not self.stop_event.is_set():
+                # Todos os ativos do ciclo compartilham a mesma hora de referência
+                cycle_now = datetime.now().time()
+                for asset, asset_config in list(self.config["assets"].items()):
+                    if not asset_config.get("enabled", False):
+                        continue
+                    
+                    within_hours, now, start_time, end_time = self.is_within_trading_hours(asset_config, cycle_now)
+                    if not within_hours:
+                        logger.debug("Fora do horário de trading para %s: %s (horário: %s-%s)", asset, now, start_time, end_time)
+                        continue
+                    
+                    df = self.get_latest_data(asset)
+                    if df is None:
+                        continue
+                    
+                    # Fila cheia: descarta o item mais antigo, já desatualizado
+                    try:
+                        self._data_queue.put_nowait((asset, df))
+                    except queue.Full:
+                        try:
+                            self._data_queue.get_nowait()
+                        except queue.Empty:
+                            pass
+                        self._data_queue.put_nowait((asset, df))
+                
+                # Aguarda o intervalo de polling (interrompido imediatamente ao parar)
+                self.stop_event.wait(self.cfg.polling_interval)
+        except Exception as e:
+            logger.exception(f"Erro na thread de pré-carga de dados: {e}")
+        finally:
+            self._close_conn()
+    
     def stop(self):
         """
         Para o analisador de mercado
@@ -1452,20 +2313,40 @@ class MarketAnalyzer:
         # Sinaliza para as threads pararem
         self.stop_event.set()
         
+        # Acorda o loop principal, que pode estar aguardando dados na fila por até polling_interval
+        try:
+            self._data_queue.put_nowait(None)
+        except queue.Full:
+            pass  # Fila cheia: o loop principal não está bloqueado
+        
         # Aguarda as threads terminarem
         for thread in self.threads:
             thread.join(timeout=5.0)
         
-        # Fecha a conexão com o banco de dados
-        if self.db_conn:
-            self.db_conn.close()
+        # stop() pode ser chamado por outra thread e, em seguida, pelo próprio loop principal ao encerrar
+        pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=True)
+        
+        # Fecha a conexão com o banco de dados (as threads fecham as próprias ao terminar)
+        if self._close_conn():
             logger.info("Conexão com banco de dados fechada")
         
+        # Grava os sinais que ainda estiverem na fila
+        while self._drain_signal_queue():
+            pass
+        
+        # Aguarda os gráficos pendentes e libera as figuras reutilizadas
+        self._chart_pool.shutdown(wait=True)
+        for fig, _, _ in self._fig_cache.values():
+            plt.close(fig)
+        self._fig_cache.clear()
+        
         # Registra estatísticas de problemas de qualidade de dados
-        if self.data_quality_issues:
+        if self._dq_counts:
             logger.info("Resumo de problemas de qualidade de dados:")
-            for issue_key, issue_data in self.data_quality_issues.items():
-                logger.info(f"  {issue_key}: {issue_data['count']} ocorrências, primeira detecção em {issue_data['first_detected']}")
+            for issue_key, count in self._dq_counts.items():
+                logger.info(f"  {issue_key}: {count} ocorrências, primeira detecção em {self._dq_meta[issue_key]['first_detected']}")
         
         logger.info("Market Analyzer parado com sucesso")
     
@@ -1474,43 +2355,58 @@ class MarketAnalyzer:
         Loop principal para análise e geração de sinais
         Esta função deve ser chamada pela thread principal após iniciar o analisador
         """
-        polling_interval = self.config["analysis"]["polling_interval"]
-        
         try:
-            logger.info(f"Iniciando loop principal com intervalo de polling de {polling_interval} segundos")
+            logger.info(f"Iniciando loop principal com intervalo de polling de {self.cfg.polling_interval} segundos")
             
             while not self.stop_event.is_set():
                 try:
-                    # Obtém a lista de perfis habilitados
-                    enabled_profiles = [
-                        profile for profile, config in self.config.get("strategy_profiles", {}).items()
-                        if config.get("enabled", False)
-                    ]
+                    # Recarrega a configuração (e os perfis pré-calculados) se o arquivo mudou
+                    self._reload_config_if_changed()
+                    
+                    # Obtém a lista de perfis habilitados (pré-calculada na carga da configuração)
+                    enabled_profiles = self.cfg.enabled_profiles
                     
                     if not enabled_profiles:
-                        enabled_profiles = ["moderado"]
+                        enabled_profiles = ("moderado",)
                         logger.warning("Nenhum perfil habilitado encontrado, usando perfil padrão 'moderado'")
                     
-                    # Analisa cada ativo habilitado com cada perfil habilitado
-                    for asset, asset_config in self.config["assets"].items():
-                        if asset_config.get("enabled", False):
-                            # Verifica se está dentro do horário de trading
-                            now = datetime.now().time()
-                            trading_hours = asset_config.get("trading_hours", {})
-                            start_time = datetime.strptime(trading_hours.get("start", "00:00"), "%H:%M").time()
-                            end_time = datetime.strptime(trading_hours.get("end", "23:59"), "%H:%M").time()
-                            
-                            if start_time <= now <= end_time:
-                                # Realiza a análise com cada perfil
-                                for profile_name in enabled_profiles:
-                                    analysis_results = self.analyze_asset_with_profile(asset, profile_name)
-                                    
-                                    if analysis_results.get("valid", False):
-                                        logger.debug(f"Análise de {asset} com perfil {profile_name} concluída com sucesso")
-                                    elif "message" in analysis_results:
-                                        logger.debug(f"Análise de {asset} com perfil {profile_name} falhou: {analysis_results['message']}")
-                            else:
-                                logger.debug(f"Fora do horário de trading para {asset}: {now} (horário: {start_time}-{end_time})")
+                    # Aguarda os dados pré-carregados (o próprio intervalo de polling da thread de leitura dita o ritmo)
+                    try:
+                        pending = [self._data_queue.get(timeout=self.cfg.polling_interval)]
+                    except queue.Empty:
+                        pending = []
+                    while True:
+                        try:
+                            pending.append(self._data_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    
+                    # Parada solicitada durante a espera: encerra sem iniciar um novo ciclo de análise
+                    # (None é apenas o aviso de parada colocado na fila por stop())
+                    if self.stop_event.is_set():
+                        break
+                    pending = [item for item in pending if item is not None]
+                    
+                    # Analisa cada ativo recebido com cada perfil habilitado: as análises rodam em paralelo no pool
+                    # (cópia rasa por perfil, pois as análises adicionam colunas ao DataFrame).
+                    # Ativos desabilitados no perfil são descartados antes de qualquer análise.
+                    futures = [
+                        (asset, profile_name, self._pool.submit(self.compute_asset_analysis, asset, profile_name, df.copy(deep=False)))
+                        for asset, df in pending
+                        for profile_name in enabled_profiles
+                        if asset in self._get_enabled_assets(profile_name)
+                    ]
+                    
+                    # Sinais, gráficos e envio ao executor na thread principal, na ordem de submissão
+                    for asset, profile_name, future in futures:
+                        analysis_results, analysis_df = future.result()
+                        if analysis_df is not None:
+                            analysis_results = self.finalize_asset_analysis(asset, profile_name, analysis_results, analysis_df)
+                        
+                        if analysis_results.get("valid", False):
+                            logger.debug("Análise de %s com perfil %s concluída com sucesso", asset, profile_name)
+                        elif "message" in analysis_results:
+                            logger.debug("Análise de %s com perfil %s falhou: %s", asset, profile_name, analysis_results['message'])
                     
                     # A cada 5 minutos, exibe um resumo do status
                     current_time = time.time()
@@ -1520,21 +2416,21 @@ class MarketAnalyzer:
                         logger.info(f"Status: Analisador em execução, sinais gerados por perfil: {signals_count}")
                         
                         # Registra estatísticas de problemas de qualidade de dados
-                        if self.data_quality_issues:
+                        # (cópia apenas dos 5 primeiros, sob o lock, pois as threads do pool podem estar registrando problemas)
+                        with self._dq_lock:
+                            dq_total = len(self._dq_counts)
+                            dq_top = list(islice(self._dq_counts.items(), 5))  # Limita a 5 para não sobrecarregar o log
+                        if dq_top:
                             logger.info("Problemas de qualidade de dados detectados:")
-                            for issue_key, issue_data in list(self.data_quality_issues.items())[:5]:  # Limita a 5 para não sobrecarregar o log
-                                logger.info(f"  {issue_key}: {issue_data['count']} ocorrências")
-                            if len(self.data_quality_issues) > 5:
-                                logger.info(f"  ... e mais {len(self.data_quality_issues) - 5} problemas")
+                            for issue_key, count in dq_top:
+                                logger.info(f"  {issue_key}: {count} ocorrências")
+                            if dq_total > 5:
+                                logger.info(f"  ... e mais {dq_total - 5} problemas")
                         
                         self._last_status_time = current_time
-                    
-                    # Aguarda o intervalo de polling
-                    time.sleep(polling_interval)
                 except Exception as e:
-                    logger.error(f"Erro no loop principal: {e}")
-                    logger.error(traceback.format_exc())
-                    time.sleep(1)  # Pausa maior em caso de erro
+                    logger.exception(f"Erro no loop principal: {e}")
+                    self.stop_event.wait(1)  # Pausa maior em caso de erro (interrompida por stop())
         except KeyboardInterrupt:
             logger.info("Interrupção pelo usuário detectada")
         finally:
@@ -1553,10 +2449,10 @@ def main():
                 with open(config_file, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                 if "strategy_profiles" not in config:
-                    logger.warning(f"Arquivo de configuração {config_file} não contém 'strategy_profiles'. Renomeando para backup.")
+                    logger.warning("Arquivo de configuração %s não contém 'strategy_profiles'. Renomeando para backup.", config_file)
                     os.rename(config_file, f"{config_file}.bak")
             except Exception as e:
-                logger.warning(f"Erro ao ler arquivo de configuração {config_file}: {e}. Renomeando para backup.")
+                logger.warning("Erro ao ler arquivo de configuração %s: %s. Renomeando para backup.", config_file, e)
                 if os.path.exists(config_file):
                     os.rename(config_file, f"{config_file}.bak")
         
@@ -1569,8 +2465,7 @@ def main():
         # Executa o loop principal na thread principal
         analyzer.run_main_loop()
     except Exception as e:
-        logger.error(f"Erro na função principal: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Erro na função principal: {e}")
 
 
 if __name__ == "__main__":
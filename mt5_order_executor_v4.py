@@ -18,22 +18,49 @@ import MetaTrader5 as mt5
 import time
 import threading
 import queue
+import atexit
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import os
 import logging
+import logging.handlers
 import json
+import mmap
 import sqlite3
 import sys
-import traceback
 
-# Configuração de logging
+# watchfiles é opcional: sem ele, o arquivo de sinais é verificado por polling
+try:
+    from watchfiles import watch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
+# orjson é opcional: sem ele, a leitura de JSON usa o módulo json da biblioteca padrão
+# (orjson.JSONDecodeError é subclasse de json.JSONDecodeError, então o tratamento de erros não muda)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# Configuração de logging: as threads apenas enfileiram os registros (QueueHandler) e uma thread
+# dedicada (QueueListener) formata e grava no arquivo e no console, fora do caminho das ordens
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [logging.FileHandler("mt5_order_executor.log"), logging.StreamHandler(sys.stdout)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Grava os registros pendentes ao encerrar o processo
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("mt5_order_executor.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
+    format="%(message)s",  # Apenas mensagem e traceback no registro enfileirado; o formato final é aplicado pelo listener
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("MT5OrderExecutor")
 
@@ -58,16 +85,40 @@ class MT5OrderExecutor:
         logger.info(f"Inicializando MT5 Order Executor v4.0 com arquivo de configuração: {config_file}")
         self.config_file = config_file
         self.config = self._load_config(config_file)
+        self._load_trading_settings()
         self.mt5_initialized = False
         self.account_info = None
         self.stop_event = threading.Event()
-        self.order_queue = queue.Queue()
-        self.signal_queue = queue.Queue() # Mantido para compatibilidade, mas não usado diretamente
+        # Fila de ordens (thread de sinais -> thread de ordens): append/popleft do deque são atômicos,
+        # sem o mutex e a condição de queue.Queue por operação; o evento acorda a thread de ordens
+        self.order_queue = deque()
+        self._order_event = threading.Event()
         self.threads = []
-        self.db_conn = None
+        # Chaves obrigatórias dos sinais e das ordens (verificação de subconjunto sem recriar a lista a cada sinal)
+        self._required_signal_keys = frozenset(("asset", "type", "stop_loss", "take_profit", "timestamp"))
+        self._required_order_keys = frozenset(("asset", "type", "stop_loss", "take_profit", "signal_details"))
+        self._tls = threading.local() # Conexão SQLite de cada thread (no modo WAL, leituras e gravações seguem em paralelo)
         self.daily_stats = {"trades": 0, "pnl": 0, "wins": 0, "losses": 0, "last_reset": datetime.now().strftime("%Y-%m-%d")}
-        self.processed_signal_timestamps = set() # Para evitar processar o mesmo sinal múltiplas vezes
+        # Para evitar processar o mesmo sinal múltiplas vezes: LRU limitado aos últimos 5000 timestamps
+        # (um único dicionário ordenado faz a consulta e guarda a ordem de inserção para descartar o mais antigo)
+        # e o maior timestamp já descartado, abaixo do qual todo sinal é considerado processado
+        # (o arquivo pode ser relido desde o início)
+        self.processed_signal_timestamps = OrderedDict()
+        self._processed_signal_max = 5000
+        self._processed_signal_floor = ""
+        self._signals_reset_day = None # Dia (YYYY-MM-DD) do último descarte dos sinais processados no fim do pregão
         self.last_signal_file_mtime = 0 # Timestamp da última modificação do arquivo de sinais
+        self._signal_file_state = None # (inode, tamanho, mtime_ns) do arquivo de sinais na última leitura
+        self._signal_file_offset = 0 # Posição após a última linha completa já lida do arquivo de sinais
+        self._lot_calcs = {} # Funções de cálculo de lote especializadas por símbolo (recriadas ao reconectar)
+        self._symbol_info_cache = {} # Informações dos símbolos (estáticas durante o pregão, recarregadas ao reconectar)
+        self._tick_cache = {} # Último tick de cada símbolo e momento (time.monotonic) da consulta
+        self._open_pos_count = 0 # Quantidade de posições abertas em cache (verificação de max_open_trades)
+        self._open_pos_ts = float("-inf") # Momento (time.monotonic) da última atualização do cache de posições
+        self._positions_cache = (float("-inf"), []) # (momento em time.monotonic, posições) compartilhado por monitoramento e status
+        self._open_pos_exact = False # Se o cache é a contagem exata (filtrada pelo número mágico) ou apenas o total da conta
+        self.db_queue = queue.Queue(maxsize=1000) # Registros de ordens aguardando a gravação em lote pela thread de banco de dados
+        self._trading_ok_cached = (float("-inf"), False) # (momento em time.monotonic, resultado) da última verificação de permissão de trading
     
     def _load_config(self, config_file):
         """
@@ -112,8 +163,8 @@ class MT5OrderExecutor:
         try:
             if os.path.exists(config_file):
                 logger.info(f"Carregando configurações do arquivo: {config_file}")
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(config_file, 'rb') as f:
+                    return _json_loads(f.read())
             else:
                 logger.info(f"Arquivo de configuração não encontrado. Criando com valores padrão: {config_file}")
                 with open(config_file, 'w', encoding='utf-8') as f:
@@ -121,11 +172,55 @@ class MT5OrderExecutor:
                 logger.info(f"Arquivo de configuração {config_file} criado com valores padrão. Por favor, edite-o com suas informações.")
                 return default_config
         except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao carregar configurações: {e}")
             logger.info("Usando configurações padrão devido ao erro")
             return default_config
     
+    def _load_trading_settings(self):
+        """
+        Guarda em atributos os parâmetros de trading usados a cada ordem e verificação
+        (horários já convertidos e percentuais já divididos por 100), evitando percorrer self.config em cada chamada
+        """
+        trading_config = self.config["trading"]
+        self._slippage = trading_config["slippage"]
+        self._magic = trading_config["magic_number"]
+        self._risk_pct = trading_config["risk_per_trade_pct"] / 100.0
+        self._max_open = trading_config["max_open_trades"]
+        self._max_loss_pct = trading_config["max_daily_loss_pct"] / 100.0
+        self._session_start = datetime.strptime(trading_config["trading_hours"]["start"], "%H:%M").time()
+        self._session_end = datetime.strptime(trading_config["trading_hours"]["end"], "%H:%M").time()
+        # Fecha as posições 2 minutos antes do fim do pregão
+        self._session_close_threshold = (datetime.combine(datetime.today(), self._session_end) - timedelta(minutes=2)).time()
+        # Data do dia e limites do pregão em epoch, recalculados apenas na virada do dia (ver _refresh_day)
+        self._tomorrow_epoch = 0.0
+    
+    def _refresh_day(self, now):
+        """
+        Recalcula a data do dia (YYYY-MM-DD) e os limites do pregão de hoje em epoch,
+        para que as verificações a cada ordem comparem apenas números
+        
+        Args:
+            now (float): Momento atual (time.time())
+        """
+        today = datetime.fromtimestamp(now).date()
+        self._today_str = today.isoformat()
+        self._tomorrow_epoch = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        self._session_start_epoch = datetime.combine(today, self._session_start).timestamp()
+        self._session_end_epoch = datetime.combine(today, self._session_end).timestamp()
+        self._session_close_epoch = datetime.combine(today, self._session_close_threshold).timestamp()
+    
+    def _today(self):
+        """
+        Retorna a data do dia (YYYY-MM-DD), recalculada apenas na virada do dia
+        
+        Returns:
+            str: Data atual
+        """
+        now = time.time()
+        if now >= self._tomorrow_epoch:
+            self._refresh_day(now)
+        return self._today_str
+    
     def setup_database_connection(self):
         """
         Configura a conexão com o banco de dados SQLite e cria tabelas se necessário
@@ -136,13 +231,20 @@ class MT5OrderExecutor:
         try:
             db_config = self.config["database"]
             db_path = db_config["db_path"]
-            self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
-            self.db_conn.row_factory = sqlite3.Row
-            cursor = self.db_conn.cursor()
+            cursor = self._conn().cursor()
             
-            # Cria tabela de ordens executadas se não existir
+            # Modo WAL (persistente no arquivo): leituras (analisador, monitoramento)
+            # sem bloquear as gravações de ordens e estatísticas
+            journal_mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if journal_mode.lower() != "wal":
+                logger.warning(f"Não foi possível ativar o modo WAL no banco de dados (modo atual: {journal_mode})")
+            
+            # Cria as tabelas de ordens executadas e de estatísticas diárias (se não existirem)
+            # em um único script DDL, dentro de uma única transação
             orders_table = db_config["orders_table"]
-            cursor.execute(f"""
+            stats_table = db_config["stats_table"]
+            cursor.executescript(f"""
+            BEGIN;
             CREATE TABLE IF NOT EXISTS {orders_table} (
                 order_id INTEGER PRIMARY KEY,
                 mt5_ticket INTEGER UNIQUE,
@@ -159,22 +261,40 @@ class MT5OrderExecutor:
                 reason TEXT, -- Motivo da entrada/saída
                 signal_timestamp TEXT, -- Timestamp do sinal original
                 strategy_profile TEXT -- Perfil de estratégia que gerou o sinal
-            )
-            """)
-            
-            # Cria tabela de estatísticas diárias se não existir
-            stats_table = db_config["stats_table"]
-            cursor.execute(f"""
+            );
             CREATE TABLE IF NOT EXISTS {stats_table} (
                 date TEXT PRIMARY KEY,
                 trades INTEGER DEFAULT 0,
                 pnl REAL DEFAULT 0.0,
                 wins INTEGER DEFAULT 0,
                 losses INTEGER DEFAULT 0
-            )
+            );
+            COMMIT;
             """)
             
-            self.db_conn.commit()
+            # Comandos de gravação montados uma única vez (o texto idêntico reaproveita o statement
+            # já compilado no cache de cada conexão)
+            self._sql_insert_order = f"""
+            INSERT INTO {orders_table} (mt5_ticket, asset, type, volume, price, sl, tp, status, open_time, signal_timestamp, strategy_profile, reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            self._sql_reset_stats = f"INSERT OR REPLACE INTO {stats_table} (date, trades, pnl, wins, losses) VALUES (?, 0, 0.0, 0, 0)"
+            # Atualiza a linha do dia no lugar (INSERT OR REPLACE apagaria e reinseriria a linha)
+            self._sql_upsert_stats = f"""
+            INSERT INTO {stats_table} (date, trades, pnl, wins, losses)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                trades = excluded.trades, pnl = excluded.pnl, wins = excluded.wins, losses = excluded.losses
+            """
+            # Acumula uma operação fechada na linha do dia
+            self._sql_add_trade_stats = f"""
+            INSERT INTO {stats_table} (date, trades, pnl, wins, losses)
+            VALUES (?, 1, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                trades = trades + 1, pnl = pnl + excluded.pnl,
+                wins = wins + excluded.wins, losses = losses + excluded.losses
+            """
+            
             logger.info(f"Banco de dados configurado: {db_path}")
             
             # Carrega estatísticas do dia atual
@@ -182,8 +302,7 @@ class MT5OrderExecutor:
             
             return True
         except Exception as e:
-            logger.error(f"Erro ao configurar banco de dados: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao configurar banco de dados: {e}")
             return False
     
     def load_daily_stats(self):
@@ -191,9 +310,9 @@ class MT5OrderExecutor:
         Carrega as estatísticas de trading do dia atual do banco de dados
         """
         try:
-            today_str = datetime.now().strftime("%Y-%m-%d")
+            today_str = self._today()
             stats_table = self.config["database"]["stats_table"]
-            cursor = self.db_conn.cursor()
+            cursor = self._conn().cursor()
             
             cursor.execute(f"SELECT * FROM {stats_table} WHERE date = ?", (today_str,))
             stats = cursor.fetchone()
@@ -204,40 +323,87 @@ class MT5OrderExecutor:
             else:
                 # Se não houver estatísticas para hoje, reseta
                 self.daily_stats = {"date": today_str, "trades": 0, "pnl": 0, "wins": 0, "losses": 0}
-                cursor.execute(f"INSERT OR REPLACE INTO {stats_table} (date, trades, pnl, wins, losses) VALUES (?, ?, ?, ?, ?)",
-                               (today_str, 0, 0.0, 0, 0))
-                self.db_conn.commit()
+                with self._txn() as cursor:
+                    cursor.execute(self._sql_reset_stats, (today_str,))
                 logger.info("Estatísticas diárias resetadas para hoje")
             
             # Garante que last_reset está presente
             self.daily_stats["last_reset"] = self.daily_stats.get("date", today_str)
             
         except Exception as e:
-            logger.error(f"Erro ao carregar estatísticas diárias: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao carregar estatísticas diárias: {e}")
             # Usa valores padrão em caso de erro
-            today_str = datetime.now().strftime("%Y-%m-%d")
+            today_str = self._today()
             self.daily_stats = {"date": today_str, "trades": 0, "pnl": 0, "wins": 0, "losses": 0, "last_reset": today_str}
     
+    def _conn(self):
+        """
+        Retorna a conexão SQLite da thread atual, criando-a na primeira chamada
+        (em modo autocommit: as transações são abertas explicitamente por _txn)
+        
+        Returns:
+            sqlite3.Connection: Conexão da thread atual
+        """
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.config["database"]["db_path"], isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # Sincronização NORMAL (commits sem fsync completo no modo WAL) e espera em vez de erro se outra thread estiver gravando
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8000")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._tls.conn = conn
+            self._tls.writer_cursor = conn.cursor()
+        return conn
+    
+    def _close_conn(self):
+        """
+        Fecha a conexão SQLite da thread atual, se existir
+        
+        Returns:
+            bool: True se havia uma conexão aberta, False caso contrário
+        """
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            return False
+        conn.close()
+        self._tls.conn = None
+        self._tls.writer_cursor = None
+        return True
+    
+    @contextmanager
+    def _txn(self):
+        """
+        Executa as gravações do bloco em uma única transação (um único commit/fsync),
+        desfazendo-as em caso de erro
+        
+        Yields:
+            sqlite3.Cursor: Cursor de gravação da thread atual com a transação aberta
+        """
+        self._conn()
+        cursor = self._tls.writer_cursor
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+    
     def save_daily_stats(self):
         """
         Salva as estatísticas de trading do dia atual no banco de dados
         """
         try:
-            stats_table = self.config["database"]["stats_table"]
-            cursor = self.db_conn.cursor()
-            
-            cursor.execute(f"""
-            INSERT OR REPLACE INTO {stats_table} (date, trades, pnl, wins, losses)
-            VALUES (?, ?, ?, ?, ?)
-            """, (self.daily_stats["date"], self.daily_stats["trades"], self.daily_stats["pnl"],
-                  self.daily_stats["wins"], self.daily_stats["losses"]))
+            with self._txn() as cursor:
+                cursor.execute(self._sql_upsert_stats, (self.daily_stats["date"], self.daily_stats["trades"], self.daily_stats["pnl"],
+                                                        self.daily_stats["wins"], self.daily_stats["losses"]))
             
-            self.db_conn.commit()
-            logger.debug(f"Estatísticas diárias salvas: {self.daily_stats}")
+            logger.debug("Estatísticas diárias salvas: %s", self.daily_stats)
         except Exception as e:
-            logger.error(f"Erro ao salvar estatísticas diárias: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao salvar estatísticas diárias: {e}")
     
     def update_daily_stats(self, profit):
         """
@@ -246,20 +412,29 @@ class MT5OrderExecutor:
         Args:
             profit (float): Lucro ou prejuízo da operação fechada
         """
-        today_str = datetime.now().strftime("%Y-%m-%d")
+        today_str = self._today()
         
         # Reseta estatísticas se for um novo dia
         if self.daily_stats["date"] != today_str:
             self.load_daily_stats()
         
+        win = 1 if profit > 0 else 0
         self.daily_stats["trades"] += 1
         self.daily_stats["pnl"] += profit
-        if profit > 0:
-            self.daily_stats["wins"] += 1
-        else:
-            self.daily_stats["losses"] += 1
+        self.daily_stats["wins"] += win
+        self.daily_stats["losses"] += 1 - win
+        
+        # Perda máxima diária atingida: bloqueia o trading imediatamente, sem esperar o cache da verificação expirar
+        if self.account_info is not None and self.daily_stats["pnl"] < -self._max_loss_pct * self.account_info.balance:
+            self._trading_ok_cached = (time.monotonic(), False)
         
-        self.save_daily_stats()
+        # Acumula a operação diretamente no banco (sem ler e regravar a linha do dia a partir do Python)
+        try:
+            with self._txn() as cursor:
+                cursor.execute(self._sql_add_trade_stats, (self.daily_stats["date"], profit, win, 1 - win))
+            logger.debug("Estatísticas diárias salvas: %s", self.daily_stats)
+        except Exception as e:
+            logger.exception(f"Erro ao salvar estatísticas diárias: {e}")
     
     def connect_mt5(self):
         """
@@ -288,10 +463,12 @@ class MT5OrderExecutor:
             logger.info(f"Conectado ao MetaTrader 5. Conta: {self.account_info.login}, Servidor: {self.account_info.server}")
             logger.info(f"Saldo: {self.account_info.balance}, Margem Livre: {self.account_info.margin_free}")
             self.mt5_initialized = True
+            self._lot_calcs.clear()
+            self._symbol_info_cache.clear()
+            self._tick_cache.clear()
             return True
         except Exception as e:
-            logger.error(f"Erro ao conectar ao MT5: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao conectar ao MT5: {e}")
             self.mt5_initialized = False
             return False
     
@@ -305,6 +482,22 @@ class MT5OrderExecutor:
             logger.info("Desconectado do MetaTrader 5")
     
     def check_trading_allowed(self):
+        """
+        Verifica se o trading é permitido, reaproveitando o resultado por 500 ms
+        (uma rajada de ordens no mesmo instante não muda a resposta)
+        
+        Returns:
+            bool: True se o trading é permitido, False caso contrário
+        """
+        now = time.monotonic()
+        ts, ok = self._trading_ok_cached
+        if now - ts < 0.5:
+            return ok
+        ok = self._check_trading_allowed_uncached()
+        self._trading_ok_cached = (now, ok)
+        return ok
+    
+    def _check_trading_allowed_uncached(self):
         """
         Verifica se o trading é permitido com base no horário e perda diária
         
@@ -312,22 +505,20 @@ class MT5OrderExecutor:
             bool: True se o trading é permitido, False caso contrário
         """
         try:
-            # Verifica horário de trading
-            trading_hours = self.config["trading"]["trading_hours"]
-            now = datetime.now().time()
-            start_time = datetime.strptime(trading_hours["start"], "%H:%M").time()
-            end_time = datetime.strptime(trading_hours["end"], "%H:%M").time()
-            
-            if not (start_time <= now <= end_time):
-                logger.debug(f"Fora do horário de trading: {now} (permitido: {start_time}-{end_time})")
+            # Verifica horário de trading (comparação direta com os limites do pregão de hoje em epoch)
+            now = time.time()
+            if now >= self._tomorrow_epoch:
+                self._refresh_day(now)
+            if not (self._session_start_epoch <= now <= self._session_end_epoch):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Fora do horário de trading: %s (permitido: %s-%s)", datetime.fromtimestamp(now).time(), self._session_start, self._session_end)
                 return False
             
             # Verifica perda máxima diária
-            max_daily_loss_pct = self.config["trading"]["max_daily_loss_pct"]
             # Usa saldo atual como base para cálculo da perda máxima (simplificação)
             # Idealmente, o saldo inicial do dia deveria ser armazenado
             current_balance = self.account_info.balance
-            max_loss_value = (max_daily_loss_pct / 100.0) * current_balance
+            max_loss_value = self._max_loss_pct * current_balance
             
             # Correção do erro de sintaxe na f-string:
             # Usar aspas simples para a chave do dicionário dentro da f-string
@@ -337,17 +528,57 @@ class MT5OrderExecutor:
             
             return True
         except Exception as e:
-            logger.error(f"Erro ao verificar permissão de trading: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao verificar permissão de trading: {e}")
             return False
     
-    def calculate_lot_size(self, asset, stop_loss_price):
+    def _symbol_info(self, asset, refresh=False):
+        """
+        Obtém as informações do símbolo, consultando o MT5 apenas na primeira vez (ou se refresh=True)
+        
+        Args:
+            asset (str): Símbolo do ativo
+            refresh (bool): Força uma nova consulta ao MT5
+            
+        Returns:
+            SymbolInfo: Informações do símbolo ou None em caso de falha
+        """
+        symbol_info = None if refresh else self._symbol_info_cache.get(asset)
+        if symbol_info is None:
+            symbol_info = mt5.symbol_info(asset)
+            if symbol_info is not None:
+                self._symbol_info_cache[asset] = symbol_info
+        return symbol_info
+    
+    def _symbol_tick(self, asset, ttl=0.05):
+        """
+        Obtém o último tick do símbolo, reaproveitando a cotação consultada há menos de ttl segundos
+        (ordens de uma mesma rajada usam a mesma cotação)
+        
+        Args:
+            asset (str): Símbolo do ativo
+            ttl (float): Validade do tick em cache, em segundos
+            
+        Returns:
+            Tick: Último tick do símbolo ou None em caso de falha
+        """
+        now = time.monotonic()
+        cached = self._tick_cache.get(asset)
+        if cached is not None and now - cached[1] < ttl:
+            return cached[0]
+        tick = mt5.symbol_info_tick(asset)
+        if tick is not None:
+            self._tick_cache[asset] = (tick, now)
+        return tick
+    
+    def calculate_lot_size(self, asset, stop_loss_price, symbol_info=None, tick=None):
         """
         Calcula o tamanho do lote com base no risco por operação
         
         Args:
             asset (str): Símbolo do ativo
             stop_loss_price (float): Preço do stop loss
+            symbol_info (optional): Informações do símbolo já obtidas do MT5 (consultadas se None)
+            tick (optional): Último tick do símbolo já obtido do MT5 (consultado se None)
             
         Returns:
             float: Tamanho do lote calculado ou 0.0 em caso de erro
@@ -358,13 +589,15 @@ class MT5OrderExecutor:
                 return 0.0
             
             # Obtém informações do símbolo
-            symbol_info = mt5.symbol_info(asset)
+            if symbol_info is None:
+                symbol_info = self._symbol_info(asset)
             if symbol_info is None:
                 logger.error(f"Falha ao obter informações do símbolo {asset}: {mt5.last_error()}")
                 return 0.0
             
             # Obtém preço atual
-            tick = mt5.symbol_info_tick(asset)
+            if tick is None:
+                tick = self._symbol_tick(asset)
             if tick is None:
                 logger.error(f"Falha ao obter tick do símbolo {asset}: {mt5.last_error()}")
                 return 0.0
@@ -376,50 +609,68 @@ class MT5OrderExecutor:
                 logger.warning(f"Risco em pontos é zero para {asset}, não é possível calcular lote")
                 return 0.0
             
-            # Calcula valor do ponto na moeda da conta
-            point_value = symbol_info.trade_tick_value / symbol_info.trade_tick_size * symbol_info.point
-            if point_value == 0:
-                # Tenta obter do config se não disponível no MT5
-                point_value = self.config.get("assets", {}).get(asset, {}).get("point_value", 0)
-                if point_value == 0:
-                    logger.error(f"Valor do ponto não encontrado para {asset}")
+            # Obtém a função de cálculo especializada para o símbolo (criada no primeiro uso)
+            lot_calc = self._lot_calcs.get(asset)
+            if lot_calc is None:
+                lot_calc = self._build_lot_calc(asset, symbol_info)
+                if lot_calc is None:
                     return 0.0
+                self._lot_calcs[asset] = lot_calc
             
-            # Calcula risco por contrato
-            risk_per_contract = risk_points / symbol_info.point * point_value
-            if risk_per_contract <= 0:
-                logger.error(f"Risco por contrato inválido para {asset}: {risk_per_contract}")
-                return 0.0
-            
-            # Calcula valor do risco em dinheiro
-            risk_per_trade_pct = self.config["trading"]["risk_per_trade_pct"]
-            account_balance = self.account_info.balance
-            risk_amount = (risk_per_trade_pct / 100.0) * account_balance
-            
-            # Calcula tamanho do lote
-            lot_size = risk_amount / risk_per_contract
-            
-            # Ajusta para o volume mínimo e máximo permitido
-            lot_size = max(symbol_info.volume_min, lot_size)
-            lot_size = min(symbol_info.volume_max, lot_size)
+            # Calcula tamanho do lote a partir do risco em pontos e do saldo da conta
+            lot_size = lot_calc(risk_points, self.account_info.balance)
             
-            # Ajusta para o passo de volume
-            if symbol_info.volume_step != 0:
-                lot_size = round(lot_size / symbol_info.volume_step) * symbol_info.volume_step
-            
-            # Arredonda para precisão de volume
-            volume_digits = getattr(symbol_info, 'volume_digits', 2) # Usa getattr para compatibilidade
-            lot_size = round(lot_size, volume_digits)
-            
-            logger.info(f"Cálculo de lote para {asset}: Risco={risk_amount:.2f}, Risco/Contrato={risk_per_contract:.2f}, Lote={lot_size}")
+            logger.info("Cálculo de lote para %s: Risco=%.2f, Risco em pontos=%s, Lote=%s", asset, self._risk_pct * self.account_info.balance, risk_points, lot_size)
             
             return lot_size
         except Exception as e:
-            logger.error(f"Erro ao calcular tamanho do lote para {asset}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao calcular tamanho do lote para {asset}: {e}")
             return 0.0
     
-    def send_market_order(self, asset, order_type, volume, stop_loss, take_profit, signal_details):
+    def _build_lot_calc(self, asset, symbol_info):
+        """
+        Cria a função de cálculo de lote do símbolo com as constantes do símbolo (valor do ponto,
+        limites, passo e precisão de volume) e o risco por operação já resolvidos
+        
+        Args:
+            asset (str): Símbolo do ativo
+            symbol_info: Informações do símbolo obtidas do MT5
+            
+        Returns:
+            callable: Função (risco em pontos, saldo) -> lote, ou None se o valor do ponto não estiver disponível
+        """
+        # Calcula valor do ponto na moeda da conta
+        point_value = symbol_info.trade_tick_value / symbol_info.trade_tick_size * symbol_info.point
+        if point_value == 0:
+            # Tenta obter do config se não disponível no MT5
+            point_value = self.config.get("assets", {}).get(asset, {}).get("point_value", 0)
+            if point_value == 0:
+                logger.error(f"Valor do ponto não encontrado para {asset}")
+                return None
+        
+        # Risco por contrato = risco em pontos * k
+        k = point_value / symbol_info.point
+        if k <= 0:
+            logger.error(f"Risco por contrato inválido para {asset}: valor do ponto {point_value}")
+            return None
+        
+        risk_pct = self._risk_pct
+        vmin = symbol_info.volume_min
+        vmax = symbol_info.volume_max
+        vstep = symbol_info.volume_step
+        vdigits = getattr(symbol_info, 'volume_digits', 2) # Usa getattr para compatibilidade
+        
+        if vstep != 0:
+            def lot_calc(risk_points, balance):
+                # Ajusta para o volume mínimo e máximo permitido, depois para o passo e a precisão de volume
+                lot_size = min(vmax, max(vmin, risk_pct * balance / (risk_points * k)))
+                return round(round(lot_size / vstep) * vstep, vdigits)
+        else:
+            def lot_calc(risk_points, balance):
+                return round(min(vmax, max(vmin, risk_pct * balance / (risk_points * k))), vdigits)
+        return lot_calc
+    
+    def send_market_order(self, asset, order_type, volume, stop_loss, take_profit, signal_details, symbol_info=None, tick=None):
         """
         Envia uma ordem a mercado para o MT5
         
@@ -430,6 +681,8 @@ class MT5OrderExecutor:
             stop_loss (float): Preço do stop loss
             take_profit (float): Preço do take profit
             signal_details (dict): Detalhes do sinal original
+            symbol_info (optional): Informações do símbolo já obtidas do MT5 (consultadas se None)
+            tick (optional): Último tick do símbolo já obtido do MT5 (consultado se None)
             
         Returns:
             int: Ticket da ordem MT5 ou None em caso de falha
@@ -440,7 +693,8 @@ class MT5OrderExecutor:
                 return None
             
             # Verifica se o símbolo está disponível
-            symbol_info = mt5.symbol_info(asset)
+            if symbol_info is None:
+                symbol_info = self._symbol_info(asset)
             if symbol_info is None:
                 logger.error(f"Símbolo {asset} não encontrado no MT5")
                 return None
@@ -450,13 +704,15 @@ class MT5OrderExecutor:
                     logger.error(f"Falha ao selecionar símbolo {asset}: {mt5.last_error()}")
                     return None
                 time.sleep(0.1) # Pequena pausa após selecionar
-                symbol_info = mt5.symbol_info(asset)
+                symbol_info = self._symbol_info(asset, refresh=True)
+                tick = None # Tick anterior à seleção do símbolo não é confiável
             
             # Define o tipo de ordem MT5
             mt5_order_type = mt5.ORDER_TYPE_BUY if order_type == "BUY" else mt5.ORDER_TYPE_SELL
             
             # Obtém o preço atual para preencher a ordem
-            tick = mt5.symbol_info_tick(asset)
+            if tick is None:
+                tick = self._symbol_tick(asset)
             if tick is None:
                 logger.error(f"Falha ao obter tick do símbolo {asset}: {mt5.last_error()}")
                 return None
@@ -471,15 +727,15 @@ class MT5OrderExecutor:
                 "price": price,
                 "sl": stop_loss,
                 "tp": take_profit,
-                "deviation": self.config["trading"]["slippage"],
-                "magic": self.config["trading"]["magic_number"],
+                "deviation": self._slippage,
+                "magic": self._magic,
                 "comment": f"Signal {signal_details.get('strategy_profile', 'N/A')}",
                 "type_time": mt5.ORDER_TIME_GTC, # Good till cancelled
                 "type_filling": mt5.ORDER_FILLING_IOC, # Immediate or Cancel
             }
             
             # Envia a ordem
-            logger.info(f"Enviando ordem {order_type} para {asset} - Vol: {volume}, SL: {stop_loss}, TP: {take_profit}")
+            logger.info("Enviando ordem %s para %s - Vol: %s, SL: %s, TP: %s", order_type, asset, volume, stop_loss, take_profit)
             result = mt5.order_send(request)
             
             # Verifica o resultado
@@ -490,15 +746,15 @@ class MT5OrderExecutor:
             if result.retcode != mt5.TRADE_RETCODE_DONE:
                 logger.error(f"Ordem para {asset} não executada: {result.retcode} - {result.comment}")
                 # Loga detalhes da requisição e resultado para debug
-                logger.debug(f"Detalhes da requisição: {request}")
-                logger.debug(f"Detalhes do resultado: {result}")
+                logger.debug("Detalhes da requisição: %s", request)
+                logger.debug("Detalhes do resultado: %s", result)
                 return None
             
-            logger.info(f"Ordem {order_type} para {asset} executada com sucesso. Ticket: {result.order}")
+            logger.info("Ordem %s para %s executada com sucesso. Ticket: %s", order_type, asset, result.order)
+            self._adjust_open_positions_count(1)
             return result.order
         except Exception as e:
-            logger.error(f"Erro ao enviar ordem a mercado para {asset}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao enviar ordem a mercado para {asset}: {e}")
             return None
     
     def close_position(self, position_ticket, reason="Fechamento manual"):
@@ -532,7 +788,7 @@ class MT5OrderExecutor:
             close_order_type = mt5.ORDER_TYPE_SELL if order_type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
             
             # Obtém o preço atual para fechar
-            tick = mt5.symbol_info_tick(asset)
+            tick = self._symbol_tick(asset)
             if tick is None:
                 logger.error(f"Falha ao obter tick do símbolo {asset} para fechar posição: {mt5.last_error()}")
                 return False
@@ -546,15 +802,15 @@ class MT5OrderExecutor:
                 "type": close_order_type,
                 "position": position_ticket,
                 "price": price,
-                "deviation": self.config["trading"]["slippage"],
-                "magic": self.config["trading"]["magic_number"],
+                "deviation": self._slippage,
+                "magic": self._magic,
                 "comment": reason,
                 "type_time": mt5.ORDER_TIME_GTC,
                 "type_filling": mt5.ORDER_FILLING_IOC,
             }
             
             # Envia a ordem de fechamento
-            logger.info(f"Enviando ordem de fechamento para posição {position_ticket} ({asset})")
+            logger.info("Enviando ordem de fechamento para posição %s (%s)", position_ticket, asset)
             result = mt5.order_send(request)
             
             # Verifica o resultado
@@ -564,11 +820,12 @@ class MT5OrderExecutor:
             
             if result.retcode != mt5.TRADE_RETCODE_DONE:
                 logger.error(f"Ordem de fechamento para {position_ticket} não executada: {result.retcode} - {result.comment}")
-                logger.debug(f"Detalhes da requisição de fechamento: {request}")
-                logger.debug(f"Detalhes do resultado do fechamento: {result}")
+                logger.debug("Detalhes da requisição de fechamento: %s", request)
+                logger.debug("Detalhes do resultado do fechamento: %s", result)
                 return False
             
-            logger.info(f"Posição {position_ticket} ({asset}) fechada com sucesso. Ticket da ordem de fechamento: {result.order}")
+            logger.info("Posição %s (%s) fechada com sucesso. Ticket da ordem de fechamento: %s", position_ticket, asset, result.order)
+            self._adjust_open_positions_count(-1)
             
             # Atualiza estatísticas diárias (requer obter o lucro da operação fechada)
             # Tenta obter o lucro do histórico recente
@@ -582,14 +839,13 @@ class MT5OrderExecutor:
                         break
             if profit != 0:
                 self.update_daily_stats(profit)
-                logger.info(f"Estatísticas atualizadas com lucro/prejuízo: {profit:.2f}")
+                logger.info("Estatísticas atualizadas com lucro/prejuízo: %.2f", profit)
             else:
                 logger.warning(f"Não foi possível obter o lucro da posição {position_ticket} do histórico")
             
             return True
         except Exception as e:
-            logger.error(f"Erro ao fechar posição {position_ticket}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao fechar posição {position_ticket}: {e}")
             return False
     
     def close_all_positions(self, reason="Fechamento de todas as posições"):
@@ -601,7 +857,7 @@ class MT5OrderExecutor:
                 logger.error("MT5 não inicializado para fechar todas as posições")
                 return
             
-            positions = mt5.positions_get(magic=self.config["trading"]["magic_number"])
+            positions = self._own_positions()
             if positions is None:
                 logger.error(f"Erro ao obter posições: {mt5.last_error()}")
                 return
@@ -618,8 +874,21 @@ class MT5OrderExecutor:
                     closed_count += 1
             logger.info(f"{closed_count} posições fechadas com sucesso")
         except Exception as e:
-            logger.error(f"Erro ao fechar todas as posições: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao fechar todas as posições: {e}")
+    
+    def _own_positions(self):
+        """
+        Obtém as posições abertas com o número mágico deste executor
+        (positions_get aceita apenas symbol, group ou ticket como filtro; o número mágico é filtrado aqui)
+        
+        Returns:
+            tuple: Posições deste executor ou None em caso de erro no MT5
+        """
+        positions = mt5.positions_get()
+        if positions is None:
+            return None
+        magic = self._magic
+        return tuple(pos for pos in positions if pos.magic == magic)
     
     def get_open_positions(self):
         """
@@ -632,7 +901,7 @@ class MT5OrderExecutor:
             if not self.mt5_initialized:
                 return []
             
-            positions = mt5.positions_get(magic=self.config["trading"]["magic_number"])
+            positions = self._own_positions()
             if positions is None:
                 logger.error(f"Erro ao obter posições abertas: {mt5.last_error()}")
                 return []
@@ -653,10 +922,75 @@ class MT5OrderExecutor:
                 })
             return open_positions
         except Exception as e:
-            logger.error(f"Erro ao obter posições abertas: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao obter posições abertas: {e}")
             return []
     
+    def _cached_open_positions(self, ttl=1.0):
+        """
+        Obtém as posições abertas reaproveitando a última consulta por até ttl segundos
+        (monitoramento e status no mesmo instante fazem uma única consulta ao MT5)
+        
+        Args:
+            ttl (float): Validade do valor em cache, em segundos
+            
+        Returns:
+            list: Lista de dicionários com informações das posições abertas
+        """
+        now = time.monotonic()
+        ts, positions = self._positions_cache
+        if now - ts < ttl:
+            return positions
+        positions = self.get_open_positions()
+        self._positions_cache = (now, positions)
+        return positions
+    
+    def _open_positions_count(self, ttl=1.0):
+        """
+        Obtém a quantidade de posições abertas gerenciadas por este executor, consultando o MT5
+        no máximo uma vez por ttl segundos (uma rajada de ordens na fila faz uma única consulta)
+        
+        Enquanto o total de posições da conta (positions_total, um inteiro sem transferir as posições)
+        estiver abaixo de max_open_trades, ele é usado como limite superior da contagem; as posições
+        só são listadas e filtradas pelo número mágico quando o total atinge o limite
+        
+        Args:
+            ttl (float): Validade do valor em cache, em segundos
+            
+        Returns:
+            int: Quantidade de posições abertas (exata ao atingir max_open_trades)
+        """
+        now = time.monotonic()
+        if now - self._open_pos_ts < ttl and (self._open_pos_exact or self._open_pos_count < self._max_open):
+            return self._open_pos_count
+        
+        count = mt5.positions_total() if self.mt5_initialized else 0
+        exact = count is None or count == 0
+        if count is None:
+            logger.error(f"Erro ao obter quantidade de posições abertas: {mt5.last_error()}")
+            count = 0
+        elif count >= self._max_open:
+            positions = self._own_positions()
+            if positions is None:
+                logger.error(f"Erro ao obter posições abertas: {mt5.last_error()}")
+                positions = ()
+            count = len(positions)
+            exact = True
+        self._open_pos_count = count
+        self._open_pos_exact = exact
+        self._open_pos_ts = now
+        return self._open_pos_count
+    
+    def _adjust_open_positions_count(self, delta):
+        """
+        Ajusta o cache de posições abertas após abrir (+1) ou fechar (-1) uma posição
+        
+        Args:
+            delta (int): Variação na quantidade de posições abertas
+        """
+        self._open_pos_count = max(0, self._open_pos_count + delta)
+        self._positions_cache = (float("-inf"), []) # A lista de posições em cache deixou de valer
+        self._open_pos_ts = time.monotonic()
+    
     def add_order_to_queue(self, order_details):
         """
         Adiciona uma ordem à fila de processamento
@@ -667,17 +1001,16 @@ class MT5OrderExecutor:
         """
         try:
             # Validação básica da ordem
-            required_keys = ["asset", "type", "stop_loss", "take_profit", "signal_details"]
-            if not all(key in order_details for key in required_keys):
+            if not self._required_order_keys <= order_details.keys():
                 logger.error(f"Detalhes da ordem inválidos: {order_details}")
                 return
             
             # Adiciona à fila
-            self.order_queue.put(order_details)
-            logger.info(f"Ordem adicionada à fila: {order_details['type']} {order_details['asset']}")
+            self.order_queue.append(order_details)
+            self._order_event.set()
+            logger.info("Ordem adicionada à fila: %s %s", order_details["type"], order_details["asset"])
         except Exception as e:
-            logger.error(f"Erro ao adicionar ordem à fila: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Erro ao adicionar ordem à fila: {e}")
     
     def order_processor_thread(self):
         """
@@ -686,30 +1019,35 @@ class MT5OrderExecutor:
         logger.info("Thread de processamento de ordens iniciada")
         while not self.stop_event.is_set():
             try:
-                # Obtém ordem da fila (bloqueia por 1 segundo)
-                order = self.order_queue.get(timeout=1.0)
+                # Obtém ordem da fila (aguarda até 1 segundo por uma nova ordem)
+                if not self.order_queue:
+                    self._order_event.wait(1.0)
+                    self._order_event.clear()
+                    continue
+                order = self.order_queue.popleft()
                 
-                logger.info(f"Processando ordem da fila: {order['type']} {order['asset']}")
+                logger.info("Processando ordem da fila: %s %s", order["type"], order["asset"])
                 
                 # Verifica se o trading é permitido
                 if not self.check_trading_allowed():
                     logger.warning(f"Trading não permitido, ordem ignorada: {order}")
-                    self.order_queue.task_done()
                     continue
                 
-                # Verifica se o número máximo de trades abertos foi atingido
-                open_positions = self.get_open_positions()
-                if len(open_positions) >= self.config["trading"]["max_open_trades"]:
-                    logger.warning(f"Número máximo de trades abertos atingido ({len(open_positions)}), ordem ignorada: {order}")
-                    self.order_queue.task_done()
+                # Verifica se o número máximo de trades abertos foi atingido (contagem em cache por até 1s)
+                open_positions_count = self._open_positions_count()
+                if open_positions_count >= self._max_open:
+                    logger.warning(f"Número máximo de trades abertos atingido ({open_positions_count}), ordem ignorada: {order}")
                     continue
                 
+                # Obtém informações e tick do símbolo uma única vez para o cálculo do lote e o envio da ordem
+                symbol_info = self._symbol_info(order["asset"])
+                tick = self._symbol_tick(order["asset"])
+                
                 # Calcula o tamanho do lote
-                lot_size = self.calculate_lot_size(order["asset"], order["stop_loss"])
+                lot_size = self.calculate_lot_size(order["asset"], order["stop_loss"], symbol_info=symbol_info, tick=tick)
                 
                 if lot_size <= 0:
                     logger.error(f"Tamanho do lote inválido ({lot_size}), ordem ignorada: {order}")
-                    self.order_queue.task_done()
                     continue
                 
                 # Envia a ordem a mercado
@@ -719,7 +1057,9 @@ class MT5OrderExecutor:
                     volume=lot_size,
                     stop_loss=order["stop_loss"],
                     take_profit=order["take_profit"],
-                    signal_details=order["signal_details"]
+                    signal_details=order["signal_details"],
+                    symbol_info=symbol_info,
+                    tick=tick
                 )
                 
                 # Registra a ordem no banco de dados
@@ -729,133 +1069,272 @@ class MT5OrderExecutor:
                 reasons = ", ".join(order["signal_details"].get("reasons", []))
                 entry_price = order["signal_details"].get("entry_price", 0) # Pega o preço de entrada do sinal
                 
+                # Entrega o registro à thread de banco de dados (a gravação não atrasa o envio da próxima ordem)
+                row = (mt5_ticket, order["asset"], order["type"], lot_size, entry_price, 
+                       order["stop_loss"], order["take_profit"], status, datetime.now().isoformat(timespec='seconds'), 
+                       signal_timestamp, strategy_profile, reasons)
                 try:
-                    cursor = self.db_conn.cursor()
-                    orders_table = self.config["database"]["orders_table"]
-                    cursor.execute(f"""
-                    INSERT INTO {orders_table} (mt5_ticket, asset, type, volume, price, sl, tp, status, open_time, signal_timestamp, strategy_profile, reason)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (mt5_ticket, order["asset"], order["type"], lot_size, entry_price, 
-                          order["stop_loss"], order["take_profit"], status, datetime.now().isoformat(), 
-                          signal_timestamp, strategy_profile, reasons))
-                    self.db_conn.commit()
-                    logger.info(f"Ordem registrada no banco de dados (Status: {status})")
-                except Exception as db_err:
-                    logger.error(f"Erro ao registrar ordem no banco de dados: {db_err}")
-                    logger.error(traceback.format_exc())
-                
-                # Marca a tarefa como concluída
-                self.order_queue.task_done()
+                    self.db_queue.put_nowait(row)
+                except queue.Full:
+                    logger.warning("Fila de gravação no banco de dados cheia, registrando ordem diretamente")
+                    self._write_order_rows([row])
                 
-            except queue.Empty:
-                # Fila vazia, continua esperando
-                continue
             except Exception as e:
-                logger.error(f"Erro na thread de processamento de ordens: {e}")
-                logger.error(traceback.format_exc())
-                time.sleep(5) # Pausa em caso de erro
+                logger.exception("Erro na thread de processamento de ordens: %s", e)
+                self.stop_event.wait(5) # Pausa em caso de erro (interrompida ao parar)
         
+        self._close_conn()
         logger.info("Thread de processamento de ordens finalizada")
     
+    def _write_order_rows(self, rows):
+        """
+        Grava no banco de dados, em uma única transação, um lote de registros de ordens executadas
+        
+        Args:
+            rows (list): Tuplas com os valores do INSERT de ordens
+            
+        Returns:
+            bool: True se os registros foram gravados, False caso contrário
+        """
+        try:
+            with self._txn() as cursor:
+                cursor.executemany(self._sql_insert_order, rows)
+            logger.info("%d ordem(ns) registrada(s) no banco de dados", len(rows))
+            return True
+        except sqlite3.IntegrityError as db_err:
+            if len(rows) == 1:
+                logger.exception(f"Erro ao registrar ordem no banco de dados: {db_err}")
+                return False
+            # Um registro inválido (ex.: ticket repetido) desfaz o lote inteiro: grava um a um (abaixo) para não perder os demais
+            logger.warning(f"Erro ao registrar lote de ordens ({db_err}), gravando individualmente")
+        except Exception as db_err:
+            logger.exception(f"Erro ao registrar ordens no banco de dados: {db_err}")
+            return False
+        return all([self._write_order_rows([row]) for row in rows])
+    
+    def _drain_db_queue(self, first_timeout=None, max_batch=64):
+        """
+        Retira da fila um lote de até max_batch registros de ordens e o grava no banco de dados
+        
+        Args:
+            first_timeout (float, optional): Tempo máximo de espera pelo primeiro registro. Se None, não espera.
+            max_batch (int): Quantidade máxima de registros por lote
+            
+        Returns:
+            int: Quantidade de registros retirados da fila
+        """
+        rows = []
+        try:
+            if first_timeout is not None:
+                rows.append(self.db_queue.get(timeout=first_timeout))
+            while len(rows) < max_batch:
+                rows.append(self.db_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if rows:
+            self._write_order_rows(rows)
+        return len(rows)
+    
+    def db_writer_thread(self):
+        """
+        Thread dedicada para gravar os registros de ordens no banco de dados em lotes
+        (até 64 registros por transação), fora do caminho de envio das ordens
+        """
+        logger.info("Thread de gravação no banco de dados iniciada")
+        while not self.stop_event.is_set():
+            self._drain_db_queue(first_timeout=0.5)
+        
+        self._close_conn()
+        logger.info("Thread de gravação no banco de dados finalizada")
+    
     def signal_processor_thread(self):
         """
-        Thread dedicada para ler sinais do arquivo JSON e adicioná-los à fila de ordens
+        Thread dedicada para ler sinais do arquivo NDJSON (um sinal por linha) e adicioná-los à fila de ordens
         """
         logger.info("Thread de processamento de sinais iniciada")
         signal_file = self.config["signals"]["signal_file"]
         polling_interval = self.config["signals"]["polling_interval"]
         
+        # Observa o diretório do arquivo (não o próprio arquivo): cobre a criação do arquivo e a substituição
+        # atômica por renomeação; eventos de outros arquivos do diretório são descartados pelo filtro
+        signal_path = os.path.join(os.path.realpath(os.path.dirname(os.path.abspath(signal_file))), os.path.basename(signal_file))
+        signal_dir = os.path.dirname(signal_path)
+        current_poll = polling_interval # Intervalo atual do polling (quando watchfiles não está disponível)
+        empty_polls = 0 # Verificações seguidas sem novos sinais
+        
         while not self.stop_event.is_set():
             try:
-                # Verifica se o arquivo de sinais existe
-                if not os.path.exists(signal_file):
-                    logger.debug(f"Arquivo de sinais não encontrado: {signal_file}")
-                    time.sleep(polling_interval)
-                    continue
-                
-                # Verifica se o arquivo foi modificado desde a última leitura
-                current_mtime = os.path.getmtime(signal_file)
-                if current_mtime <= self.last_signal_file_mtime:
-                    #logger.debug("Arquivo de sinais não modificado")
-                    time.sleep(polling_interval)
-                    continue
-                
-                logger.info(f"Arquivo de sinais modificado, lendo novos sinais...")
-                self.last_signal_file_mtime = current_mtime
-                
-                # Lê o arquivo JSON
-                # Adiciona tratamento para arquivo vazio ou sendo escrito
-                signals = []
-                try:
-                    with open(signal_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.strip(): # Verifica se o conteúdo não está vazio
-                            signals = json.loads(content)
+                if WATCHFILES_AVAILABLE and os.path.isdir(signal_dir):
+                    self._process_signal_file(signal_file)
+                    
+                    # Aguarda notificações do sistema de arquivos (inotify/FSEvents/ReadDirectoryChangesW);
+                    # o timeout (polling_interval) mantém a verificação periódica para sistemas de arquivos
+                    # que não entregam eventos (unidades de rede NFS/CIFS)
+                    for _changes in watch(signal_dir, watch_filter=lambda change, path: path == signal_path,
+                                          stop_event=self.stop_event, rust_timeout=int(polling_interval * 1000),
+                                          yield_on_timeout=True, recursive=False):
+                        self._process_signal_file(signal_file)
+                else:
+                    # Polling adaptativo: intervalo curto logo após receber sinais,
+                    # longo (até 4x o configurado, no máximo 10s) após 10 verificações seguidas sem sinais
+                    if self._process_signal_file(signal_file):
+                        empty_polls = 0
+                        current_poll = max(0.05, polling_interval / 8)
+                    else:
+                        empty_polls += 1
+                        if empty_polls >= 10:
+                            current_poll = min(polling_interval * 4, 10.0)
+                    
+                    # Aguarda o intervalo de polling
+                    self.stop_event.wait(current_poll)
+            except Exception as e:
+                logger.exception("Erro na thread de processamento de sinais: %s", e)
+                self.stop_event.wait(polling_interval)
+        
+        logger.info("Thread de processamento de sinais finalizada")
+    
+    def _process_signal_file(self, signal_file):
+        """
+        Lê os sinais do arquivo, se ele foi modificado desde a última leitura, e adiciona os novos à fila de ordens
+        
+        Args:
+            signal_file (str): Caminho do arquivo de sinais
+            
+        Returns:
+            int: Quantidade de novos sinais adicionados à fila
+        """
+        try:
+            # Após o fechamento do pregão, descarta uma vez por dia os timestamps processados
+            now = time.time()
+            if now >= self._tomorrow_epoch:
+                self._refresh_day(now)
+            if now >= self._session_close_epoch and self._signals_reset_day != self._today_str:
+                self._reset_processed_signals()
+            
+            # Verifica se o arquivo foi modificado desde a última leitura (sem abrir nem ler o arquivo)
+            st = os.stat(signal_file)
+            file_state = (st.st_ino, st.st_size, st.st_mtime_ns)
+            if file_state == self._signal_file_state:
+                return 0
+            
+            logger.info("Arquivo de sinais modificado, lendo novos sinais...")
+            
+            # Arquivo substituído ou truncado: volta a ler desde o início (sinais repetidos são descartados pelo timestamp)
+            if self._signal_file_state is None or st.st_ino != self._signal_file_state[0] or st.st_size < self._signal_file_offset:
+                self._signal_file_offset = 0
+            self._signal_file_state = file_state
+            self.last_signal_file_mtime = st.st_mtime
+            
+            # Lê o arquivo de sinais (NDJSON: um sinal JSON por linha) mapeado em memória,
+            # decodificando apenas as linhas acrescentadas desde a última leitura
+            # Adiciona tratamento para arquivo vazio ou sendo escrito
+            signals = []
+            try:
+                if st.st_size == 0:
+                    logger.debug("Arquivo de sinais está vazio")
+                else:
+                    with open(signal_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if self._signal_file_offset == 0 and mm[:64].lstrip().startswith(b'['):
+                            # Formato antigo: lista JSON
+                            signals = _json_loads(mm[:])
                             if not isinstance(signals, list):
                                 logger.error("Formato inválido no arquivo de sinais, esperado uma lista JSON")
                                 signals = []
                         else:
-                            logger.debug("Arquivo de sinais está vazio")
-                except json.JSONDecodeError as json_err:
-                    logger.warning(f"Erro ao decodificar JSON do arquivo de sinais (pode estar sendo escrito): {json_err}")
-                except Exception as read_err:
-                    logger.error(f"Erro ao ler arquivo de sinais: {read_err}")
-                
-                # Processa cada sinal
-                new_signals_count = 0
-                for signal in signals:
-                    try:
-                        # Usa o timestamp do sinal como identificador único
-                        signal_timestamp = signal.get("timestamp")
-                        if not signal_timestamp:
-                            logger.warning(f"Sinal sem timestamp ignorado: {signal}")
-                            continue
-                        
-                        # Verifica se o sinal já foi processado
-                        if signal_timestamp in self.processed_signal_timestamps:
-                            #logger.debug(f"Sinal já processado ignorado: {signal_timestamp}")
-                            continue
-                        
-                        # Validação básica do sinal
-                        required_keys = ["asset", "type", "stop_loss", "take_profit", "timestamp"]
-                        if not all(key in signal for key in required_keys):
-                            logger.warning(f"Sinal inválido ignorado: {signal}")
-                            self.processed_signal_timestamps.add(signal_timestamp) # Marca como processado mesmo se inválido
-                            continue
-                        
-                        # Adiciona à fila de ordens
-                        order_details = {
-                            "asset": signal["asset"],
-                            "type": signal["type"],
-                            "stop_loss": signal["stop_loss"],
-                            "take_profit": signal["take_profit"],
-                            "signal_details": signal # Passa todos os detalhes do sinal
-                        }
-                        self.add_order_to_queue(order_details)
-                        self.processed_signal_timestamps.add(signal_timestamp)
-                        new_signals_count += 1
-                        
-                    except Exception as signal_err:
-                        logger.error(f"Erro ao processar sinal individual: {signal_err}")
-                        logger.error(f"Sinal com erro: {signal}")
-                        logger.error(traceback.format_exc())
-                        # Marca como processado para não tentar novamente
-                        if signal_timestamp:
-                            self.processed_signal_timestamps.add(signal_timestamp)
-                
-                if new_signals_count > 0:
-                    logger.info(f"{new_signals_count} novos sinais processados do arquivo {signal_file}")
-                
-            except FileNotFoundError:
-                logger.debug(f"Arquivo de sinais não encontrado: {signal_file}")
-            except Exception as e:
-                logger.error(f"Erro na thread de processamento de sinais: {e}")
-                logger.error(traceback.format_exc())
+                            # Ignora a última linha se ainda estiver sendo escrita (sem quebra de linha final);
+                            # ela será lida na próxima modificação do arquivo
+                            end = mm.rfind(b'\n', self._signal_file_offset) + 1
+                            if end > self._signal_file_offset:
+                                for line in mm[self._signal_file_offset:end].split(b'\n'):
+                                    if not line.strip():
+                                        continue
+                                    try:
+                                        signals.append(_json_loads(line))
+                                    except json.JSONDecodeError as line_err:
+                                        logger.warning(f"Linha inválida no arquivo de sinais ignorada: {line_err}")
+                                self._signal_file_offset = end
+            except json.JSONDecodeError as json_err:
+                logger.warning(f"Erro ao decodificar JSON do arquivo de sinais (pode estar sendo escrito): {json_err}")
+            except Exception as read_err:
+                logger.error(f"Erro ao ler arquivo de sinais: {read_err}")
             
-            # Aguarda o intervalo de polling
-            time.sleep(polling_interval)
+            # Processa cada sinal
+            new_signals_count = 0
+            for signal in signals:
+                try:
+                    # Usa o timestamp do sinal como identificador único
+                    signal_timestamp = signal.get("timestamp")
+                    if not signal_timestamp:
+                        logger.warning(f"Sinal sem timestamp ignorado: {signal}")
+                        continue
+                    signal_timestamp = str(signal_timestamp)
+                    
+                    # Verifica se o sinal já foi processado
+                    if signal_timestamp in self.processed_signal_timestamps or signal_timestamp <= self._processed_signal_floor:
+                        #logger.debug(f"Sinal já processado ignorado: {signal_timestamp}")
+                        continue
+                    
+                    # Validação básica do sinal
+                    if not self._required_signal_keys <= signal.keys():
+                        logger.warning(f"Sinal inválido ignorado: {signal}")
+                        self._mark_signal_processed(signal_timestamp) # Marca como processado mesmo se inválido
+                        continue
+                    
+                    # Adiciona à fila de ordens
+                    order_details = {
+                        "asset": signal["asset"],
+                        "type": signal["type"],
+                        "stop_loss": signal["stop_loss"],
+                        "take_profit": signal["take_profit"],
+                        "signal_details": signal # Passa todos os detalhes do sinal
+                    }
+                    self.add_order_to_queue(order_details)
+                    self._mark_signal_processed(signal_timestamp)
+                    new_signals_count += 1
+                    
+                except Exception as signal_err:
+                    logger.exception("Erro ao processar sinal individual: %s (sinal: %s)", signal_err, signal)
+                    # Marca como processado para não tentar novamente
+                    if signal_timestamp:
+                        self._mark_signal_processed(signal_timestamp)
+            
+            if new_signals_count > 0:
+                logger.info("%d novos sinais processados do arquivo %s", new_signals_count, signal_file)
+            return new_signals_count
+            
+        except FileNotFoundError:
+            logger.debug("Arquivo de sinais não encontrado: %s", signal_file)
+        except Exception as e:
+            logger.exception("Erro ao processar arquivo de sinais: %s", e)
+        return 0
+    
+    def _reset_processed_signals(self):
+        """
+        Descarta os timestamps dos sinais processados no dia, elevando o limite inferior ao maior deles
+        (sinais de um pregão não se repetem no seguinte; executado pela thread de sinais, dona do LRU)
+        """
+        processed = self.processed_signal_timestamps
+        if processed:
+            self._processed_signal_floor = max(self._processed_signal_floor, max(processed))
+            processed.clear()
+        self._signals_reset_day = self._today_str
+        logger.info("Sinais processados do dia descartados (limite: %s)", self._processed_signal_floor or "-")
+    
+    def _mark_signal_processed(self, signal_timestamp):
+        """
+        Registra o timestamp de um sinal como processado, descartando o mais antigo quando o limite é atingido
         
-        logger.info("Thread de processamento de sinais finalizada")
+        Args:
+            signal_timestamp (str): Timestamp do sinal (ISO 8601)
+        """
+        processed = self.processed_signal_timestamps
+        if signal_timestamp in processed:
+            return
+        processed[signal_timestamp] = None
+        if len(processed) > self._processed_signal_max:
+            oldest, _ = processed.popitem(last=False)
+            self._processed_signal_floor = max(self._processed_signal_floor, oldest)
     
     def position_monitor_thread(self):
         """
@@ -863,23 +1342,27 @@ class MT5OrderExecutor:
         (Pode implementar lógicas como trailing stop, fechamento por tempo, etc.)
         """
         logger.info("Thread de monitoramento de posições iniciada")
-        monitor_interval = 30.0 # Intervalo de monitoramento em segundos
+        monitor_interval = 30.0 # Intervalo de monitoramento em segundos (sem posições abertas)
+        active_monitor_interval = 5.0 # Intervalo de monitoramento com posições abertas
+        open_positions = []
         
         while not self.stop_event.is_set():
             try:
                 if not self.mt5_initialized:
-                    time.sleep(monitor_interval)
+                    self.stop_event.wait(monitor_interval)
                     continue
                 
-                open_positions = self.get_open_positions()
+                open_positions = self._cached_open_positions()
                 
                 if open_positions:
-                    logger.info(f"Monitorando {len(open_positions)} posições abertas:")
-                    total_profit = 0
-                    for pos in open_positions:
-                        logger.info(f"  - Ticket: {pos['ticket']}, Ativo: {pos['symbol']}, Tipo: {pos['type']}, Vol: {pos['volume']}, Lucro: {pos['profit']:.2f}")
-                        total_profit += pos['profit']
-                    logger.info(f"Lucro total das posições abertas: {total_profit:.2f}")
+                    # Monta as linhas por posição apenas se o nível INFO estiver habilitado
+                    if logger.isEnabledFor(logging.INFO):
+                        total_profit = sum(pos['profit'] for pos in open_positions)
+                        logger.info("Monitorando %d posições abertas:", len(open_positions))
+                        for pos in open_positions:
+                            logger.info("  - Ticket: %s, Ativo: %s, Tipo: %s, Vol: %s, Lucro: %.2f",
+                                        pos['ticket'], pos['symbol'], pos['type'], pos['volume'], pos['profit'])
+                        logger.info("Lucro total das posições abertas: %.2f", total_profit)
                 else:
                     logger.debug("Nenhuma posição aberta para monitorar")
                 
@@ -887,24 +1370,23 @@ class MT5OrderExecutor:
                 # Exemplo: verificar se SL/TP foram atingidos (embora o MT5 faça isso)
                 # Exemplo: fechar posições no final do dia
                 
-                # Verifica se precisa fechar posições no final do dia
-                trading_hours = self.config["trading"]["trading_hours"]
-                now = datetime.now().time()
-                end_time = datetime.strptime(trading_hours["end"], "%H:%M").time()
-                # Fecha X minutos antes do fim do pregão
-                close_time_threshold = (datetime.combine(datetime.today(), end_time) - timedelta(minutes=2)).time()
+                # Verifica se precisa fechar posições no final do dia (X minutos antes do fim do pregão),
+                # comparando com o limite de hoje em epoch
+                now = time.time()
+                if now >= self._tomorrow_epoch:
+                    self._refresh_day(now)
                 
-                if now >= close_time_threshold and open_positions:
-                    logger.warning(f"Horário de fechamento próximo ({close_time_threshold}). Fechando todas as posições...")
+                if now >= self._session_close_epoch and open_positions:
+                    logger.warning(f"Horário de fechamento próximo ({self._session_close_threshold}). Fechando todas as posições...")
                     self.close_all_positions(reason="Fim do pregão")
                 
             except Exception as e:
-                logger.error(f"Erro na thread de monitoramento de posições: {e}")
-                logger.error(traceback.format_exc())
+                logger.exception("Erro na thread de monitoramento de posições: %s", e)
             
-            # Aguarda o intervalo de monitoramento
-            time.sleep(monitor_interval)
+            # Aguarda o intervalo de monitoramento (menor com posições abertas; interrompido imediatamente ao parar)
+            self.stop_event.wait(active_monitor_interval if open_positions else monitor_interval)
         
+        self._close_conn()
         logger.info("Thread de monitoramento de posições finalizada")
     
     def start(self):
@@ -942,6 +1424,9 @@ class MT5OrderExecutor:
         monitor_thread = threading.Thread(target=self.position_monitor_thread, name="PositionMonitor")
         self.threads.append(monitor_thread)
         
+        db_thread = threading.Thread(target=self.db_writer_thread, name="DBWriter")
+        self.threads.append(db_thread)
+        
         for thread in self.threads:
             thread.start()
         
@@ -954,16 +1439,20 @@ class MT5OrderExecutor:
         """
         logger.info("Parando MT5 Order Executor...")
         
-        # Sinaliza para as threads pararem
+        # Sinaliza para as threads pararem (e acorda a thread de ordens)
         self.stop_event.set()
+        self._order_event.set()
         
         # Aguarda as threads terminarem
         for thread in self.threads:
             thread.join(timeout=5.0)
         
-        # Fecha a conexão com o banco de dados
-        if self.db_conn:
-            self.db_conn.close()
+        # Grava os registros de ordens que ainda estiverem na fila
+        while self._drain_db_queue():
+            pass
+        
+        # Fecha a conexão com o banco de dados (as threads fecham as próprias ao terminar)
+        if self._close_conn():
             logger.info("Conexão com banco de dados fechada")
         
         # Desconecta do MT5
@@ -978,7 +1467,7 @@ class MT5OrderExecutor:
         Returns:
             dict: Dicionário com informações de status
         """
-        open_positions_info = self.get_open_positions()
+        open_positions_info = self._cached_open_positions()
         total_profit = sum(p["profit"] for p in open_positions_info)
         
         account_details = {}
@@ -995,8 +1484,8 @@ class MT5OrderExecutor:
         return {
             "connected": self.mt5_initialized,
             "trading_allowed": self.check_trading_allowed(),
-            "order_queue_size": self.order_queue.qsize(),
-            "signal_queue_size": self.signal_queue.qsize(), # Mantido para compatibilidade
+            "order_queue_size": len(self.order_queue),
+            "signal_queue_size": 0, # Mantido para compatibilidade (os sinais vão direto para a fila de ordens)
             "positions": {
                 "count": len(open_positions_info),
                 "total_profit": total_profit,
@@ -1020,10 +1509,25 @@ def main():
     
     try:
         # Mantém a thread principal viva para exibir status ou receber comandos
-        while not executor.stop_event.is_set():
+        # (espera em fatias de 1s pelo evento de parada: no Windows, uma espera longa não é interrompida por Ctrl+C)
+        next_status = time.monotonic() + 60 # Exibe status a cada minuto
+        last_signature = None
+        while not executor.stop_event.wait(1.0):
+            if time.monotonic() < next_status:
+                continue
+            next_status += 60
+            
+            # get_status consulta o MT5: só monta o status se o nível INFO estiver habilitado
+            if not logger.isEnabledFor(logging.INFO):
+                continue
             status = executor.get_status()
-            logger.info(f"Status: {status}")
-            time.sleep(60) # Exibe status a cada minuto
+            
+            # Só registra o status se posições, fila, permissão ou operações do dia mudaram
+            signature = (tuple(p["ticket"] for p in status["positions"]["positions"]), status["order_queue_size"],
+                         status["trading_allowed"], status["daily_stats"]["trades"])
+            if signature != last_signature:
+                last_signature = signature
+                logger.info("Status: %s", status)
             
     except KeyboardInterrupt:
         logger.info("Interrupção pelo usuário detectada")
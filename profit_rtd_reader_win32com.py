@@ -23,8 +23,8 @@ import sqlite3
 import os
 import logging
 import json
+import re
 import sys
-import traceback
 
 # Configuração de logging
 logging.basicConfig(
@@ -37,6 +37,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ProfitRTDReader")
 
+# Application.CalculationState do Excel: xlDone = 0, xlCalculating = 1, xlPending = 2
+XL_CALCULATING = 1
+
+# Colunas gravadas como REAL (valor numérico do Excel, sem conversão); as demais (ex.: data, hora) ficam como TEXT
+NUMERIC_COLUMNS = frozenset(("ultimo", "abertura", "maximo", "minimo", "variacao",
+                             "agressao_compra", "agressao_venda", "agressao_saldo", "volume"))
+
 class ProfitRTDReader:
     """
     Classe principal para leitura de dados do Excel via Win32COM
@@ -57,12 +64,24 @@ class ProfitRTDReader:
         self.excel_app = None
         self.workbook = None
         self.db_conn = None
+        self._cursor = None  # Cursor único do banco, reutilizado em todas as gravações
         self.stop_event = threading.Event()
-        self.data_queue = queue.Queue()
+        self.data_queue = queue.Queue(maxsize=1024)  # Limitada: se a gravação travar, a memória não cresce sem limite
+        self.dropped_readings = 0  # Leituras descartadas com a fila cheia
         self.signal_queue = queue.Queue()
         self.last_data = {}  # Cache para comparação e detecção de mudanças
         self.threads = []
         self.cell_errors = {}  # Rastreia células com erros para evitar log excessivo
+        self._sheets = {}  # Planilha -> objeto Sheet COM (obtido uma única vez por conexão)
+        self._sheet_ranges = {}  # Planilha -> (Range COM envolvendo todas as células configuradas, linha inicial, coluna inicial)
+        self._cell_positions = {}  # Ativo -> [(nome, referência, chave de erro, planilha, linha, coluna, numérica)] das células configuradas
+        self._insert_sql = {}  # Ativo -> INSERT da tabela do ativo (montado uma única vez em setup_database)
+        self._col_order = {}  # Ativo -> colunas de dados na ordem do INSERT
+        self._reader_thread = None  # Thread STA dona dos objetos COM do Excel
+        self._excel_ready = threading.Event()  # Sinalizado quando a thread de leitura termina a conexão com o Excel
+        
+        # Converte as referências das células para (planilha, linha, coluna) uma única vez (a configuração é estática)
+        self._parse_cell_positions()
         
     def _load_config(self, config_file):
         """
@@ -135,41 +154,39 @@ class ProfitRTDReader:
                 # Se o arquivo não existir, cria com as configurações padrão
                 with open(config_file, 'w', encoding='utf-8') as f:
                     json.dump(default_config, f, indent=4)
-                logger.info(f"Arquivo de configuração {config_file} criado com valores padrão")
+                logger.info("Arquivo de configuração %s criado com valores padrão", config_file)
                 return default_config
         except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Erro ao carregar configurações: %s", e)
             return default_config
     
     def setup_excel_connection(self):
         """
         Estabelece conexão com o Excel e abre o arquivo de dados
+        IMPORTANTE: Deve ser chamada pela thread de leitura, já inicializada com CoInitialize
         
         Returns:
             bool: True se a conexão foi estabelecida com sucesso, False caso contrário
         """
         try:
-            # Inicializa COM para esta thread (thread principal)
-            pythoncom.CoInitialize()
-            
             excel_config = self.config["excel"]
             workbook_path = excel_config["workbook_path"]
             
             # Verifica se o arquivo existe
             if not os.path.exists(workbook_path):
-                logger.error(f"Arquivo Excel não encontrado: {workbook_path}")
+                logger.error("Arquivo Excel não encontrado: %s", workbook_path)
                 return False
             
-            # Tenta obter uma instância do Excel já aberta
+            # Tenta obter uma instância do Excel já aberta (GetActiveObject consulta diretamente a tabela de
+            # objetos em execução, sem o caminho de resolução por moniker do GetObject)
             try:
                 logger.info("Tentando conectar ao Excel já aberto...")
-                self.excel_app = win32com.client.GetObject("Excel.Application")
+                self.excel_app = self._early_bound(win32com.client.GetActiveObject("Excel.Application"))
                 logger.info("Conectado ao Excel já aberto")
-            except:
-                # Se não conseguir, cria uma nova instância
+            except pythoncom.com_error:
+                # Nenhum Excel em execução: cria uma nova instância
                 logger.info("Criando nova instância do Excel...")
-                self.excel_app = win32com.client.Dispatch("Excel.Application")
+                self.excel_app = self._early_bound(win32com.client.Dispatch("Excel.Application"))
                 logger.info("Nova instância do Excel criada")
             
             # Torna o Excel visível (opcional, útil para debug)
@@ -181,21 +198,41 @@ class ProfitRTDReader:
                 if wb.FullName.lower() == workbook_path.lower():
                     self.workbook = wb
                     workbook_found = True
-                    logger.info(f"Arquivo já aberto: {workbook_path}")
+                    logger.info("Arquivo já aberto: %s", workbook_path)
                     break
             
             # Se o arquivo não estiver aberto, abre-o
             if not workbook_found:
-                logger.info(f"Abrindo arquivo: {workbook_path}")
+                logger.info("Abrindo arquivo: %s", workbook_path)
                 self.workbook = self.excel_app.Workbooks.Open(workbook_path)
             
-            logger.info(f"Conectado ao arquivo Excel: {workbook_path}")
+            logger.info("Conectado ao arquivo Excel: %s", workbook_path)
+            
+            # Prepara a leitura em bloco: um único Range por planilha
+            self._build_sheet_ranges()
             return True
         except Exception as e:
-            logger.error(f"Erro ao conectar com Excel: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Erro ao conectar com Excel: %s", e)
             return False
     
+    def _early_bound(self, com_object):
+        """
+        Converte um objeto COM de late binding (IDispatch, com busca do nome a cada acesso)
+        para early binding, usando as classes geradas da typelib do Excel (gencache)
+        
+        Args:
+            com_object: Objeto COM obtido por GetObject/Dispatch
+            
+        Returns:
+            Objeto COM com early binding ou o próprio objeto se a typelib não puder ser gerada
+        """
+        try:
+            return win32com.client.gencache.EnsureDispatch(com_object)
+        except Exception as e:
+            # Ex.: cache gen_py sem permissão de escrita ou corrompido
+            logger.warning("Early binding indisponível para o Excel, usando late binding: %s", e)
+            return com_object
+    
     def setup_database(self):
         """
         Configura o banco de dados SQLite para armazenamento dos dados
@@ -212,17 +249,28 @@ class ProfitRTDReader:
             # Conecta ao banco de dados (cria se não existir)
             self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
             
+            # Modo WAL (persistente no arquivo): leituras do analisador sem bloquear as gravações a cada leitura do Excel,
+            # com sincronização NORMAL (commits sem fsync completo no modo WAL)
+            journal_mode = self.db_conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if journal_mode.lower() != "wal":
+                logger.warning("Não foi possível ativar o modo WAL no banco de dados (modo atual: %s)", journal_mode)
+            self.db_conn.execute("PRAGMA synchronous=NORMAL")
+            self.db_conn.execute("PRAGMA temp_store=MEMORY")
+            self.db_conn.execute("PRAGMA cache_size=-20000")
+            
+            # Cursor criado uma única vez e reutilizado na criação das tabelas e em todos os INSERTs
+            self._cursor = cursor = self.db_conn.cursor()
+            
             # Para cada ativo configurado, cria uma tabela com colunas dinâmicas
             for asset, cell_ranges in self.config["cell_ranges"].items():
                 # Primeiro, remove a tabela se já existir para garantir compatibilidade
-                cursor = self.db_conn.cursor()
                 cursor.execute(f"DROP TABLE IF EXISTS {table_name}_{asset}")
                 
                 # Cria a definição de colunas com base nas chaves do cell_ranges
                 columns = ["timestamp TEXT PRIMARY KEY"]
                 for column_name in cell_ranges.keys():
-                    # Todas as colunas são TEXT para simplificar (podemos converter depois)
-                    columns.append(f"{column_name} TEXT")
+                    # Colunas numéricas como REAL (8 bytes por valor); as demais como TEXT
+                    columns.append(f"{column_name} {'REAL' if column_name in NUMERIC_COLUMNS else 'TEXT'}")
                 
                 # Cria a tabela com as colunas dinâmicas
                 create_table_sql = f"CREATE TABLE {table_name}_{asset} ({', '.join(columns)})"
@@ -231,14 +279,19 @@ class ProfitRTDReader:
                 # Cria índice para timestamp
                 cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{asset}_timestamp ON {table_name}_{asset} (timestamp)")
                 
-                logger.info(f"Tabela {table_name}_{asset} criada com colunas: {', '.join(cell_ranges.keys())}")
+                # Monta o INSERT do ativo uma única vez (as colunas não mudam durante a execução)
+                self._col_order[asset] = tuple(cell_ranges.keys())
+                placeholders = ", ".join(["?"] * (len(self._col_order[asset]) + 1))
+                self._insert_sql[asset] = (f"INSERT OR REPLACE INTO {table_name}_{asset} "
+                                           f"(timestamp, {', '.join(self._col_order[asset])}) VALUES ({placeholders})")
+                
+                logger.info("Tabela %s_%s criada com colunas: %s", table_name, asset, ', '.join(cell_ranges.keys()))
             
             self.db_conn.commit()
-            logger.info(f"Banco de dados configurado: {db_path}")
+            logger.info("Banco de dados configurado: %s", db_path)
             return True
         except Exception as e:
-            logger.error(f"Erro ao configurar banco de dados: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Erro ao configurar banco de dados: %s", e)
             return False
     
     def _parse_cell_reference(self, cell_ref):
@@ -263,8 +316,108 @@ class ProfitRTDReader:
             
             return sheet_name, cell
         except Exception as e:
-            logger.error(f"Erro ao analisar referência de célula '{cell_ref}': {e}")
+            logger.error("Erro ao analisar referência de célula '%s': %s", cell_ref, e)
+            return None, None
+    
+    def _cell_to_row_col(self, cell):
+        """
+        Converte uma referência de célula no formato 'A1' para (linha, coluna), com índices a partir de 1
+        
+        Args:
+            cell (str): Referência da célula (ex.: 'AQ17')
+            
+        Returns:
+            tuple: (linha, coluna) ou (None, None) se a referência for inválida
+        """
+        match = re.fullmatch(r"\$?([A-Za-z]+)\$?(\d+)", cell.strip())
+        if not match:
             return None, None
+        
+        col = 0
+        for letter in match.group(1).upper():
+            col = col * 26 + ord(letter) - ord('A') + 1
+        return int(match.group(2)), col
+    
+    def _col_to_letters(self, col):
+        """
+        Converte o número de uma coluna (a partir de 1) para letras no formato do Excel
+        
+        Args:
+            col (int): Número da coluna
+            
+        Returns:
+            str: Letras da coluna (ex.: 43 -> 'AQ')
+        """
+        letters = ""
+        while col > 0:
+            col, remainder = divmod(col - 1, 26)
+            letters = chr(ord('A') + remainder) + letters
+        return letters
+    
+    def _parse_cell_positions(self):
+        """
+        Converte as referências 'Sheet!A1' de todas as células configuradas para (planilha, linha, coluna)
+        e monta a chave de controle de erros de cada célula, para que as leituras usem apenas índices inteiros
+        (cada célula também indica se a coluna é numérica, gravada sem conversão para texto)
+        """
+        self._cell_positions = {}
+        for asset, cell_ranges in self.config["cell_ranges"].items():
+            positions = []
+            for name, cell_ref in cell_ranges.items():
+                sheet_name, cell = self._parse_cell_reference(cell_ref)
+                row, col = self._cell_to_row_col(cell) if sheet_name and cell else (None, None)
+                if row is None:
+                    # Referência não reconhecida: a célula é lida individualmente (e o erro registrado na leitura)
+                    sheet_name = None
+                positions.append((name, cell_ref, f"{asset}_{name}", sheet_name, row, col, name in NUMERIC_COLUMNS))
+            self._cell_positions[asset] = positions
+    
+    def _build_sheet_ranges(self):
+        """
+        Agrupa as células configuradas por planilha e monta, para cada planilha, um único Range
+        envolvendo todas elas, para que cada leitura faça uma chamada COM por planilha em vez de uma por célula
+        """
+        bounds = {}  # Planilha -> [linha mínima, coluna mínima, linha máxima, coluna máxima]
+        for positions in self._cell_positions.values():
+            for _, _, _, sheet_name, row, col, _ in positions:
+                if sheet_name is None:
+                    continue
+                if sheet_name not in bounds:
+                    bounds[sheet_name] = [row, col, row, col]
+                else:
+                    b = bounds[sheet_name]
+                    b[0], b[1], b[2], b[3] = min(b[0], row), min(b[1], col), max(b[2], row), max(b[3], col)
+        
+        self._sheets = {}
+        self._sheet_ranges = {}
+        for sheet_name, (row0, col0, row1, col1) in bounds.items():
+            address = f"{self._col_to_letters(col0)}{row0}:{self._col_to_letters(col1)}{row1}"
+            try:
+                sheet = self.workbook.Sheets(sheet_name)
+                self._sheets[sheet_name] = sheet
+                self._sheet_ranges[sheet_name] = (sheet.Range(address), row0, col0)
+                logger.info("Leitura em bloco configurada: %s!%s", sheet_name, address)
+            except Exception as e:
+                # Sem o bloco, as células desta planilha são lidas individualmente
+                logger.error("Erro ao preparar leitura em bloco da planilha '%s': %s", sheet_name, e)
+    
+    def _read_sheet_ranges(self):
+        """
+        Lê o bloco de células de cada planilha em uma única chamada COM
+        IMPORTANTE: Esta função deve ser chamada apenas pela thread de leitura (dona dos objetos COM)
+        
+        Returns:
+            dict: Planilha -> tupla 2D de valores (as planilhas com erro de leitura ficam de fora)
+        """
+        sheet_values = {}
+        for sheet_name, (range_obj, _, _) in self._sheet_ranges.items():
+            try:
+                values = range_obj.Value
+                # Um Range de uma única célula retorna o valor em vez de uma tupla 2D
+                sheet_values[sheet_name] = values if isinstance(values, tuple) else ((values,),)
+            except Exception as e:
+                logger.error("Erro ao ler bloco da planilha '%s': %s", sheet_name, e)
+        return sheet_values
     
     def _safe_read_cell(self, cell_ref):
         """
@@ -283,11 +436,14 @@ class ProfitRTDReader:
             if not sheet_name or not cell:
                 return None, f"Referência de célula inválida: {cell_ref}"
             
-            # Obtém a planilha
-            try:
-                sheet = self.workbook.Sheets(sheet_name)
-            except:
-                return None, f"Planilha '{sheet_name}' não encontrada"
+            # Obtém a planilha (do cache; a chamada COM é feita apenas na primeira vez)
+            sheet = self._sheets.get(sheet_name)
+            if sheet is None:
+                try:
+                    sheet = self.workbook.Sheets(sheet_name)
+                except:
+                    return None, f"Planilha '{sheet_name}' não encontrada"
+                self._sheets[sheet_name] = sheet
             
             # Lê o valor da célula
             value = sheet.Range(cell).Value
@@ -296,37 +452,75 @@ class ProfitRTDReader:
         except Exception as e:
             return None, str(e)
     
-    def read_rtd_data(self, asset):
+    def read_rtd_data(self, asset, sheet_values=None):
         """
         Lê dados RTD específicos do Excel para um ativo
-        IMPORTANTE: Esta função deve ser chamada apenas pela thread principal
+        IMPORTANTE: Esta função deve ser chamada apenas pela thread de leitura (dona dos objetos COM)
         
         Args:
             asset (str): Nome do ativo ('winfut' ou 'wdofut')
+            sheet_values (dict, optional): Blocos já lidos por _read_sheet_ranges (lidos aqui se None)
             
         Returns:
             tuple: (dados lidos, timestamp) ou (None, None) em caso de erro
         """
         if asset not in self.config["cell_ranges"]:
-            logger.error(f"Ativo {asset} não encontrado nas configurações")
+            logger.error("Ativo %s não encontrado nas configurações", asset)
             return None, None
         
-        cell_ranges = self.config["cell_ranges"][asset]
-        data = {}
+        values = self._read_asset_values(asset, sheet_values)
+        if values is None:
+            return None, None
+        
+        data = dict(zip(self.config["cell_ranges"][asset].keys(), values))
+        timestamp = datetime.now().isoformat()
+        return data, timestamp
+    
+    def _read_asset_values(self, asset, sheet_values=None, cell_cache=None):
+        """
+        Lê as células configuradas de um ativo como uma tupla na ordem das colunas da configuração
+        (a mesma ordem do INSERT), comparável diretamente com a leitura anterior
+        IMPORTANTE: Esta função deve ser chamada apenas pela thread de leitura (dona dos objetos COM)
+        
+        Args:
+            asset (str): Nome do ativo
+            sheet_values (dict, optional): Blocos já lidos por _read_sheet_ranges (lidos aqui se None)
+            cell_cache (dict, optional): Leituras individuais já feitas neste ciclo (referência -> (valor, erro)),
+                compartilhadas entre ativos que apontam para as mesmas células (ex.: os ativos de replay)
+            
+        Returns:
+            tuple: Valores lidos (None nas células com erro) ou None se todas as células resultaram em erro
+        """
+        positions = self._cell_positions.get(asset, ())
+        values = []
         error_count = 0
+        skipped_count = 0
+        if sheet_values is None:
+            sheet_values = self._read_sheet_ranges()
         
-        # Lê cada célula configurada
-        for name, cell_ref in cell_ranges.items():
+        # Lê cada célula configurada (do bloco da planilha ou, sem ele, individualmente)
+        for name, cell_ref, cell_error_key, sheet_name, row, col, numeric in positions:
             # Verifica se já tivemos erro nesta célula recentemente
-            cell_error_key = f"{asset}_{name}"
             if cell_error_key in self.cell_errors:
-                last_error_time, error_count = self.cell_errors[cell_error_key]
+                last_error_time, cell_error_count = self.cell_errors[cell_error_key]
                 # Se o último erro foi há menos de 5 minutos e já tivemos mais de 3 erros,
                 # pulamos esta célula para evitar log excessivo
-                if (datetime.now() - last_error_time).total_seconds() < 300 and error_count > 3:
+                if (datetime.now() - last_error_time).total_seconds() < 300 and cell_error_count > 3:
+                    values.append(None)
+                    skipped_count += 1
                     continue
             
-            value, error = self._safe_read_cell(cell_ref)
+            block = sheet_values.get(sheet_name)
+            if block is not None:
+                _, row0, col0 = self._sheet_ranges[sheet_name]
+                value, error = block[row - row0][col - col0], None
+            elif cell_cache is None:
+                value, error = self._safe_read_cell(cell_ref)
+            else:
+                # Células lidas individualmente: cada referência é lida uma única vez por ciclo
+                if cell_ref not in cell_cache:
+                    cell_cache[cell_ref] = self._safe_read_cell(cell_ref)
+                value, error = cell_cache[cell_ref]
             
             if error:
                 # Registra o erro e atualiza o contador
@@ -336,25 +530,28 @@ class ProfitRTDReader:
                     _, count = self.cell_errors[cell_error_key]
                     self.cell_errors[cell_error_key] = (datetime.now(), count + 1)
                 
-                logger.error(f"Erro ao ler {asset}.{name} ({cell_ref}): {error}")
+                logger.error("Erro ao ler %s.%s (%s): %s", asset, name, cell_ref, error)
                 error_count += 1
                 # Usa None para esta célula
-                data[name] = None
+                values.append(None)
             else:
                 # Limpa o registro de erro se a leitura foi bem-sucedida
                 if cell_error_key in self.cell_errors:
                     del self.cell_errors[cell_error_key]
                 
-                # Armazena o valor
-                data[name] = str(value) if value is not None else None
+                # Armazena o valor (numérico como retornado pelo Excel; o sqlite3 grava floats diretamente)
+                values.append(value if numeric or value is None else str(value))
         
         # Se tivermos erros em todas as células, retorna None
-        if error_count == len(cell_ranges):
-            logger.error(f"Falha ao ler dados para {asset}: todas as células resultaram em erro")
-            return None, None
+        if error_count == len(positions):
+            logger.error("Falha ao ler dados para %s: todas as células resultaram em erro", asset)
+            return None
         
-        timestamp = datetime.now().isoformat()
-        return data, timestamp
+        # Nenhuma célula lida (todas suspensas após erros repetidos): não há dados
+        if skipped_count == len(positions):
+            return None
+        
+        return tuple(values)
     
     def store_data_in_db(self, asset, data, timestamp):
         """
@@ -371,29 +568,81 @@ class ProfitRTDReader:
         if not data:
             return False
         
-        try:
-            table_name = f"{self.config['database']['table_name']}_{asset}"
-            
-            # Prepara a query de inserção
-            columns = ["timestamp"] + list(data.keys())
-            placeholders = ", ".join(["?"] * len(columns))
-            
-            query = f"INSERT OR REPLACE INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-            
-            # Prepara os valores para inserção
-            values = [timestamp] + [data[key] for key in data.keys()]
-            
-            # Executa a inserção
-            cursor = self.db_conn.cursor()
-            cursor.execute(query, values)
-            self.db_conn.commit()
+        values = tuple(data.get(name) for name in self._col_order[asset])
+        return self.store_batch_in_db([(asset, values, timestamp)])
+    
+    def store_batch_in_db(self, batch):
+        """
+        Armazena um lote de leituras no banco de dados em uma única transação
+        (um executemany por ativo no cursor e com o INSERT já montados em setup_database)
+        
+        Args:
+            batch (list): Tuplas (ativo, valores na ordem das colunas, timestamp) retiradas da fila
             
+        Returns:
+            bool: True se os dados foram armazenados com sucesso, False caso contrário
+        """
+        # Agrupa as linhas por ativo (os valores já estão na ordem de colunas do INSERT)
+        rows_by_asset = {}
+        for asset, values, timestamp in batch:
+            if values:
+                rows_by_asset.setdefault(asset, []).append((timestamp, *values))
+        if not rows_by_asset:
+            return False
+        
+        try:
+            with self.db_conn:
+                for asset, rows in rows_by_asset.items():
+                    self._cursor.executemany(self._insert_sql[asset], rows)
             return True
         except Exception as e:
-            logger.error(f"Erro ao armazenar dados no banco para {asset}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Erro ao armazenar dados no banco (%s): %s", ", ".join(rows_by_asset), e)
             return False
     
+    def _drain_data_queue(self, first_timeout=None, max_batch=64, coalesce_window=0.0):
+        """
+        Retira da fila um lote de até max_batch leituras e o armazena no banco de dados
+        
+        Args:
+            first_timeout (float, optional): Tempo máximo de espera pela primeira leitura. Se None, não espera.
+            max_batch (int): Quantidade máxima de leituras por lote
+            coalesce_window (float): Tempo (segundos) durante o qual novas leituras são agrupadas no mesmo lote
+            
+        Returns:
+            int: Quantidade de leituras retiradas da fila
+        """
+        items = []
+        try:
+            if first_timeout is not None:
+                items.append(self.data_queue.get(timeout=first_timeout))
+            deadline = time.monotonic() + coalesce_window
+            while len(items) < max_batch:
+                # Dentro da janela aguarda novas leituras (exceto ao parar); depois apenas esvazia a fila
+                remaining = deadline - time.monotonic()
+                if remaining > 0 and not self.stop_event.is_set():
+                    items.append(self.data_queue.get(timeout=remaining))
+                else:
+                    items.append(self.data_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        # Descarta o marcador de parada (None), usado apenas para acordar a thread
+        batch = [item for item in items if item is not None]
+        if batch:
+            if self.store_batch_in_db(batch):
+                logger.debug("%d leituras armazenadas com sucesso", len(batch))
+            
+            # Aqui seria implementada a lógica de análise e geração de sinais
+            # Por enquanto, apenas registramos os dados recebidos
+            if logger.isEnabledFor(logging.DEBUG):
+                for asset, values, _ in batch:
+                    logger.debug("Dados processados para %s: %s", asset, dict(zip(self._col_order[asset], values)))
+        
+        # Marca as tarefas como concluídas
+        for _ in items:
+            self.data_queue.task_done()
+        return len(items)
+    
     def data_processor_thread(self):
         """
         Thread dedicada para processamento dos dados lidos e armazenamento no banco
@@ -401,30 +650,16 @@ class ProfitRTDReader:
         """
         logger.info("Thread de processamento de dados iniciada")
         
+        # Janela de agrupamento das gravações: as mudanças de até 1 segundo vão para uma única transação
+        batch_window = self.config["database"].get("batch_window", 1.0)
+        
         while not self.stop_event.is_set():
             try:
-                if not self.data_queue.empty():
-                    # Obtém os próximos dados da fila
-                    asset, data, timestamp = self.data_queue.get()
-                    
-                    # Armazena no banco de dados
-                    success = self.store_data_in_db(asset, data, timestamp)
-                    
-                    if success:
-                        logger.debug(f"Dados de {asset} armazenados com sucesso")
-                    
-                    # Aqui seria implementada a lógica de análise e geração de sinais
-                    # Por enquanto, apenas registramos os dados recebidos
-                    logger.debug(f"Dados processados para {asset}: {data}")
-                    
-                    # Marca a tarefa como concluída
-                    self.data_queue.task_done()
-                else:
-                    # Se não há dados para processar, aguarda um pouco
-                    time.sleep(0.01)
+                # Bloqueia na fila até chegar uma leitura (sem polling) e armazena em lotes de até 64 leituras;
+                # o timeout apenas garante a verificação periódica do evento de parada
+                self._drain_data_queue(first_timeout=0.5, coalesce_window=batch_window)
             except Exception as e:
-                logger.error(f"Erro na thread de processamento: {e}")
-                logger.error(traceback.format_exc())
+                logger.exception("Erro na thread de processamento: %s", e)
                 time.sleep(0.1)
     
     def start(self):
@@ -436,21 +671,29 @@ class ProfitRTDReader:
         """
         logger.info("Iniciando Profit RTD Reader (Win32COM Version)...")
         
-        # Conecta ao Excel
-        if not self.setup_excel_connection():
-            logger.error("Falha ao conectar com Excel. Abortando.")
-            return False
-        
-        # Configura o banco de dados
+        # Configura o banco de dados (antes da leitura, que depende da ordem das colunas de cada ativo)
         if not self.setup_database():
             logger.error("Falha ao configurar banco de dados. Abortando.")
             return False
         
         # Reseta o evento de parada
         self.stop_event.clear()
+        self._excel_ready.clear()
+        
+        # Inicia a thread de leitura, que cria e usa os objetos COM do Excel no seu próprio apartamento STA,
+        # e aguarda o resultado da conexão
+        self._reader_thread = threading.Thread(target=self._reader_loop, name="ExcelReader")
+        self._reader_thread.daemon = True
+        self._reader_thread.start()
+        self._excel_ready.wait()
+        if self.workbook is None:
+            logger.error("Falha ao conectar com Excel. Abortando.")
+            self.stop_event.set()
+            self._reader_thread.join(timeout=5.0)
+            return False
+        self.threads.append(self._reader_thread)
         
-        # Inicia apenas a thread de processamento
-        # A leitura do Excel será feita na thread principal
+        # Inicia a thread de processamento
         processor_thread = threading.Thread(target=self.data_processor_thread)
         processor_thread.daemon = True
         processor_thread.start()
@@ -465,25 +708,28 @@ class ProfitRTDReader:
         """
         logger.info("Parando Profit RTD Reader...")
         
-        # Sinaliza para as threads pararem
+        # Sinaliza para as threads pararem (o marcador None acorda a thread de processamento bloqueada na fila)
         self.stop_event.set()
+        try:
+            self.data_queue.put_nowait(None)
+        except queue.Full:
+            pass  # Fila cheia: a thread de processamento não está bloqueada esperando leituras
         
         # Aguarda as threads terminarem
         for thread in self.threads:
             thread.join(timeout=5.0)
         
+        # Armazena as leituras que ainda estiverem na fila
+        if self.db_conn:
+            while self._drain_data_queue():
+                pass
+        
         # Fecha a conexão com o banco de dados
         if self.db_conn:
             self.db_conn.close()
             logger.info("Conexão com banco de dados fechada")
         
-        # Não fecha o Excel, pois pode estar sendo usado pelo usuário
-        # Apenas libera as referências
-        self.workbook = None
-        self.excel_app = None
-        
-        # Finaliza COM
-        pythoncom.CoUninitialize()
+        # As referências ao Excel e o COM são liberados pela própria thread de leitura ao sair
         
         logger.info("Profit RTD Reader parado com sucesso")
     
@@ -498,78 +744,163 @@ class ProfitRTDReader:
             "excel_connected": self.excel_app is not None and self.workbook is not None,
             "db_connected": self.db_conn is not None,
             "data_queue_size": self.data_queue.qsize(),
+            "dropped_readings": self.dropped_readings,
             "signal_queue_size": self.signal_queue.qsize(),
             "running": not self.stop_event.is_set() and all(t.is_alive() for t in self.threads),
             "last_update": datetime.now().isoformat(),
             "error_cells": len(self.cell_errors)
         }
     
-    def run_main_loop(self):
+    def _excel_calculating(self):
         """
-        Loop principal para leitura do Excel na thread principal
-        Esta função deve ser chamada pela thread principal após iniciar o leitor
+        Verifica se o Excel está recalculando a pasta de trabalho
+        (xlPending não é considerado: no cálculo manual o estado pode ficar pendente indefinidamente)
+        
+        Returns:
+            bool: True se o Excel está no meio de um recálculo, False caso contrário ou se o estado não puder ser lido
         """
-        polling_interval = self.config["excel"]["polling_interval"]
+        try:
+            return self.excel_app.CalculationState == XL_CALCULATING
+        except Exception:
+            return False
+    
+    def _poll_excel(self):
+        """
+        Lê o bloco de cada planilha (e cada célula fora dos blocos) uma única vez, extrai os dados
+        de cada ativo configurado e enfileira os que mudaram desde a última leitura
+        IMPORTANTE: Esta função deve ser chamada apenas pela thread de leitura (dona dos objetos COM)
+        """
+        sheet_values = self._read_sheet_ranges()
+        cell_cache = {}
+        for asset in self.config["cell_ranges"].keys():
+            try:
+                values = self._read_asset_values(asset, sheet_values, cell_cache)
+                # Verifica se os dados mudaram desde a última leitura (comparação direta de tuplas, sem cópia)
+                if values and values != self.last_data.get(asset):
+                    self._enqueue_reading((asset, values, datetime.now().isoformat()))
+                    self.last_data[asset] = values
+                    logger.info("Novos dados detectados para %s", asset)
+            except Exception as e:
+                logger.exception("Erro ao processar dados para %s: %s", asset, e)
+    
+    def _enqueue_reading(self, item):
+        """
+        Enfileira uma leitura sem bloquear a thread de leitura; com a fila cheia (gravação no banco
+        travada ou lenta), descarta a leitura mais antiga para manter as mais recentes
+        
+        Args:
+            item (tuple): (ativo, valores na ordem das colunas, timestamp)
+        """
+        while True:
+            try:
+                self.data_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.data_queue.get_nowait()
+                    self.data_queue.task_done()
+                except queue.Empty:
+                    continue
+                self.dropped_readings += 1
+                if self.dropped_readings % 100 == 1:
+                    logger.warning("Fila de dados cheia (%d itens): %d leituras antigas descartadas até agora",
+                                   self.data_queue.maxsize, self.dropped_readings)
+    
+    def _pump_messages(self, duration, step=0.02):
+        """
+        Aguarda o tempo indicado processando as mensagens COM pendentes a cada step segundos,
+        para que os callbacks do Excel/RTD nesta thread STA não fiquem acumulados durante a espera
         
+        Args:
+            duration (float): Tempo total de espera em segundos
+            step (float): Intervalo entre os processamentos de mensagens em segundos
+        """
+        deadline = time.monotonic() + duration
+        while True:
+            pythoncom.PumpWaitingMessages()
+            remaining = deadline - time.monotonic()
+            # Retorna ao fim do intervalo ou imediatamente se o leitor for parado
+            if remaining <= 0 or self.stop_event.wait(min(step, remaining)):
+                return
+    
+    def _reader_loop(self):
+        """
+        Thread de leitura do Excel em apartamento STA próprio: inicializa o COM, cria os objetos
+        do Excel (que só podem ser usados pela thread que os criou) e faz o polling das planilhas
+        """
+        pythoncom.CoInitialize()
         try:
+            if not self.setup_excel_connection():
+                return
+            self._excel_ready.set()
+            logger.info("Thread de leitura do Excel iniciada")
+            
+            polling_interval = self.config["excel"]["polling_interval"]
             while not self.stop_event.is_set():
                 try:
-                    # Lê dados para cada ativo configurado
-                    for asset in self.config["cell_ranges"].keys():
-                        try:
-                            asset_data, asset_timestamp = self.read_rtd_data(asset)
-                            if asset_data:
-                                # Verifica se os dados mudaram desde a última leitura
-                                if asset not in self.last_data or asset_data != self.last_data[asset]:
-                                    self.data_queue.put((asset, asset_data, asset_timestamp))
-                                    self.last_data[asset] = asset_data.copy()
-                                    logger.info(f"Novos dados detectados para {asset}")
-                        except Exception as e:
-                            logger.error(f"Erro ao processar dados para {asset}: {e}")
-                            logger.error(traceback.format_exc())
+                    # Enquanto o Excel recalcula, as células do RTD podem estar parcialmente atualizadas: adia a leitura
+                    if self._excel_calculating():
+                        logger.debug("Excel recalculando, leitura adiada para o próximo intervalo")
+                    else:
+                        self._poll_excel()
                     
-                    # A cada 60 segundos, exibe o status
-                    current_time = time.time()
-                    if not hasattr(self, "_last_status_time") or current_time - self._last_status_time >= 60:
-                        status = self.get_status()
-                        logger.info(f"Status: {status}")
-                        self._last_status_time = current_time
-                    
-                    # Aguarda o intervalo de polling
-                    time.sleep(polling_interval)
+                    # Aguarda o intervalo de polling processando as mensagens COM desta thread STA
+                    self._pump_messages(polling_interval)
                 except Exception as e:
-                    logger.error(f"Erro no loop principal: {e}")
-                    logger.error(traceback.format_exc())
-                    time.sleep(1)  # Pausa maior em caso de erro
+                    logger.exception("Erro na thread de leitura: %s", e)
+                    self.stop_event.wait(1)  # Pausa maior em caso de erro
+        finally:
+            # Não fecha o Excel, pois pode estar sendo usado pelo usuário
+            # Apenas libera as referências antes de finalizar o COM desta thread
+            self._sheet_ranges = {}
+            self._sheets = {}
+            self.workbook = None
+            self.excel_app = None
+            self._excel_ready.set()
+            pythoncom.CoUninitialize()
+            logger.info("Thread de leitura do Excel finalizada")
+    
+    def run_main_loop(self):
+        """
+        Loop de controle na thread principal: a leitura do Excel é feita pela thread de leitura,
+        o que mantém a thread principal livre para exibir o status e tratar Ctrl+C imediatamente
+        Esta função deve ser chamada pela thread principal após iniciar o leitor
+        """
+        try:
+            while not self.stop_event.is_set():
+                # A cada 60 segundos, exibe o status
+                current_time = time.time()
+                if not hasattr(self, "_last_status_time") or current_time - self._last_status_time >= 60:
+                    status = self.get_status()
+                    logger.info("Status: %s", status)
+                    self._last_status_time = current_time
+                
+                # Encerra se a thread de leitura parou (ex.: erro fatal no COM)
+                if not self._reader_thread.is_alive():
+                    logger.error("Thread de leitura do Excel finalizada inesperadamente")
+                    break
+                
+                self.stop_event.wait(1.0)
         except KeyboardInterrupt:
             logger.info("Interrupção pelo usuário detectada")
         finally:
             self.stop()
 
-
 def main():
     """
     Função principal para execução do script
     """
-    # Inicializa COM para a thread principal
-    pythoncom.CoInitialize()
-    
     try:
         reader = ProfitRTDReader()
         
         if not reader.start():
             logger.error("Falha ao iniciar o Profit RTD Reader")
-            pythoncom.CoUninitialize()
             return
         
-        # Executa o loop principal na thread principal
+        # Executa o loop de controle na thread principal (a leitura do Excel roda na thread de leitura)
         reader.run_main_loop()
     except Exception as e:
-        logger.error(f"Erro na função principal: {e}")
-        logger.error(traceback.format_exc())
-    finally:
-        # Finaliza COM para a thread principal
-        pythoncom.CoUninitialize()
+        logger.exception("Erro na função principal: %s", e)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from market_analyzer_robust import MarketAnalyzer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class WyckoffWithoutVolumeTest(unittest.TestCase):
+    """
+    Análise de Wyckoff sobre uma tabela com o esquema do leitor RTD (sem a coluna volume)
+    """
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        previous_dir = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.addCleanup(os.chdir, previous_dir)
+        
+        # Configuração do repositório (sem a seção data_validation), apontando para um banco temporário
+        with open(os.path.join(REPO_DIR, "analyzer_config.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        config["database"]["db_path"] = os.path.join(self.tmp_dir, "market_data.db")
+        self.config_file = os.path.join(self.tmp_dir, "analyzer_config.json")
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        
+        # Mesmas colunas criadas por profit_rtd_reader_win32com.setup_database
+        conn = sqlite3.connect(config["database"]["db_path"])
+        conn.execute("CREATE TABLE rtd_data_winfut (timestamp TEXT PRIMARY KEY, data TEXT, hora TEXT, ultimo REAL, "
+                     "abertura REAL, maximo REAL, minimo REAL, variacao REAL, agressao_compra REAL, "
+                     "agressao_venda REAL, agressao_saldo REAL)")
+        start = datetime(2026, 10, 15, 10, 0, 0)
+        rows = []
+        for i in range(30):
+            price = 5000.0 + (i % 7) * 3 - i
+            rows.append(((start + timedelta(seconds=i)).isoformat(), "15/10/2026", "10:00", price, 5000.0,
+                         price + 5, price - 5, 0.1, 100.0 + i, 80.0, 20.0 + i))
+        conn.executemany(f"INSERT INTO rtd_data_winfut VALUES ({', '.join('?' * 11)})", rows)
+        conn.commit()
+        conn.close()
+    
+    def test_analyze_wyckoff_without_volume_column(self):
+        analyzer = MarketAnalyzer(self.config_file)
+        self.addCleanup(analyzer._chart_pool.shutdown)
+        self.assertTrue(analyzer.setup_database_connection())
+        
+        df = analyzer.get_latest_data("winfut")
+        self.assertNotIn("volume", df.columns)
+        
+        result = analyzer.analyze_wyckoff(df, "winfut", analyzer._get_profile_config("moderado"))
+        
+        # Suporte e resistência calculados; sem volume, a análise de volume fica vazia
+        self.assertTrue(result.valid, result.message)
+        self.assertIsNotNone(result.support_level)
+        self.assertIsNotNone(result.resistance_level)
+        self.assertLessEqual(result.support_level, result.resistance_level)
+        self.assertEqual(result.volume_analysis, {})
+
+
+if __name__ == "__main__":
+    unittest.main()